@@ -7,7 +7,7 @@ from alembic import context
 
 # Import Base and all models
 from app.core.database import Base
-from app.models import Project, User  # Import all models
+from app.models import Project, User, ProjectJob, ProjectWorkflowStep, IdempotencyKey, ProjectEvent, PooledRepository  # Import all models
 from app.core.config import settings
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,43 @@
+"""Add project_jobs table for the durable workflow queue
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create project_jobs table claimed by idp-worker processes."""
+    op.create_table(
+        'project_jobs',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('project_id', sa.String(length=36), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('locked_by', sa.String(length=255), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_jobs_status_created', 'project_jobs', ['status', 'created_at'])
+    op.create_index('idx_jobs_project', 'project_jobs', ['project_id'])
+
+
+def downgrade() -> None:
+    """Drop project_jobs table."""
+    op.drop_index('idx_jobs_project', table_name='project_jobs')
+    op.drop_index('idx_jobs_status_created', table_name='project_jobs')
+    op.drop_table('project_jobs')
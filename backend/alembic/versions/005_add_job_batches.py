@@ -0,0 +1,27 @@
+"""Add batch columns to project_jobs
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add batch_id and batch_limit used to cap concurrency of batch-created jobs."""
+    op.add_column('project_jobs', sa.Column('batch_id', sa.String(length=36), nullable=True))
+    op.add_column('project_jobs', sa.Column('batch_limit', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_project_jobs_batch_id'), 'project_jobs', ['batch_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Remove batch columns from project_jobs."""
+    op.drop_index(op.f('ix_project_jobs_batch_id'), table_name='project_jobs')
+    op.drop_column('project_jobs', 'batch_limit')
+    op.drop_column('project_jobs', 'batch_id')
@@ -0,0 +1,25 @@
+"""Add user_id to project_jobs for per-user fairness
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add user_id column and index used by per-user admission limits."""
+    op.add_column('project_jobs', sa.Column('user_id', sa.String(length=36), nullable=True))
+    op.create_index('idx_jobs_user_status', 'project_jobs', ['user_id', 'status'])
+
+
+def downgrade() -> None:
+    """Remove user_id column from project_jobs."""
+    op.drop_index('idx_jobs_user_status', table_name='project_jobs')
+    op.drop_column('project_jobs', 'user_id')
@@ -0,0 +1,36 @@
+"""Add project_workflow_steps table for resumable workflows
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create project_workflow_steps table holding per-step checkpoints."""
+    op.create_table(
+        'project_workflow_steps',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('project_id', sa.String(length=36), nullable=False),
+        sa.Column('step', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('output', sa.Text(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('project_id', 'step', name='uq_project_step')
+    )
+    op.create_index(op.f('ix_project_workflow_steps_project_id'), 'project_workflow_steps', ['project_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop project_workflow_steps table."""
+    op.drop_index(op.f('ix_project_workflow_steps_project_id'), table_name='project_workflow_steps')
+    op.drop_table('project_workflow_steps')
@@ -0,0 +1,39 @@
+"""Add idempotency_keys table for Idempotency-Key support
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create idempotency_keys table holding replayable create responses."""
+    op.create_table(
+        'idempotency_keys',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('endpoint', sa.String(length=100), nullable=False),
+        sa.Column('request_hash', sa.String(length=64), nullable=False),
+        sa.Column('response_status', sa.Integer(), nullable=False),
+        sa.Column('response_body', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'key', name='uq_idempotency_user_key')
+    )
+    op.create_index('idx_idempotency_expires', 'idempotency_keys', ['expires_at'])
+
+
+def downgrade() -> None:
+    """Drop idempotency_keys table."""
+    op.drop_index('idx_idempotency_expires', table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
@@ -0,0 +1,37 @@
+"""Add project_events table for status streaming
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create project_events table holding project status transitions."""
+    op.create_table(
+        'project_events',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('project_id', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_events_user_id', 'project_events', ['user_id', 'id'])
+    op.create_index('idx_events_project_id', 'project_events', ['project_id', 'id'])
+
+
+def downgrade() -> None:
+    """Drop project_events table."""
+    op.drop_index('idx_events_project_id', table_name='project_events')
+    op.drop_index('idx_events_user_id', table_name='project_events')
+    op.drop_table('project_events')
@@ -0,0 +1,23 @@
+"""Add started_at to project_workflow_steps for step timelines
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add started_at column recording when each workflow step began."""
+    op.add_column('project_workflow_steps', sa.Column('started_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove started_at column from project_workflow_steps."""
+    op.drop_column('project_workflow_steps', 'started_at')
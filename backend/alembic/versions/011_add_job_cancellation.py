@@ -0,0 +1,23 @@
+"""Add cancel_requested_at to project_jobs for workflow cancellation
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add cancel_requested_at column checked by workers running the job."""
+    op.add_column('project_jobs', sa.Column('cancel_requested_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove cancel_requested_at column from project_jobs."""
+    op.drop_column('project_jobs', 'cancel_requested_at')
@@ -0,0 +1,28 @@
+"""Add priority to project_jobs for interactive and bulk lanes
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add priority column and the index used to claim interactive jobs first."""
+    op.add_column(
+        'project_jobs',
+        sa.Column('priority', sa.String(20), nullable=False, server_default='interactive')
+    )
+    op.create_index('idx_jobs_status_priority', 'project_jobs', ['status', 'priority', 'created_at'])
+
+
+def downgrade() -> None:
+    """Remove priority column from project_jobs."""
+    op.drop_index('idx_jobs_status_priority', table_name='project_jobs')
+    op.drop_column('project_jobs', 'priority')
@@ -0,0 +1,33 @@
+"""Add repo_pool table for pre-provisioned GitHub repositories
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create repo_pool table tracking placeholder repositories."""
+    op.create_table(
+        'repo_pool',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('repo_name', sa.String(length=255), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='provisioning'),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('repo_name')
+    )
+    op.create_index('idx_repo_pool_status_created', 'repo_pool', ['status', 'created_at'])
+
+
+def downgrade() -> None:
+    """Drop repo_pool table."""
+    op.drop_index('idx_repo_pool_status_created', table_name='repo_pool')
+    op.drop_table('repo_pool')
@@ -0,0 +1,23 @@
+"""Add claimed_at to repo_pool for claims that are renamed before removal
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add claimed_at column recording when a placeholder was claimed."""
+    op.add_column('repo_pool', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove claimed_at column from repo_pool."""
+    op.drop_column('repo_pool', 'claimed_at')
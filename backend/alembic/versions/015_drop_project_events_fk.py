@@ -0,0 +1,26 @@
+"""Drop the project foreign key of project_events to keep deleted events
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Drop the project_id foreign key, so a project's final deleted event outlives it."""
+    op.drop_constraint('project_events_project_id_fkey', 'project_events', type_='foreignkey')
+
+
+def downgrade() -> None:
+    """Remove events of deleted projects and restore the project_id foreign key."""
+    op.execute("DELETE FROM project_events WHERE project_id NOT IN (SELECT id FROM projects)")
+    op.create_foreign_key(
+        'project_events_project_id_fkey', 'project_events', 'projects',
+        ['project_id'], ['id'], ondelete='CASCADE'
+    )
@@ -4,9 +4,10 @@ Authentication endpoints for user login, registration, and token management.
 import logging
 import secrets
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import (
     verify_password,
@@ -32,6 +33,23 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _session_kind(request: Request) -> str:
+    """
+    Classify a login as a web UI session or an API client.
+
+    Browsers send the UI's origin with the login request, scripts and other
+    clients do not. The kind is kept in the tokens and decides whether the
+    session may use the interactive priority lane.
+
+    Args:
+        request: The login request.
+
+    Returns:
+        ``ui`` for logins from one of ``cors_origins``, otherwise ``api``.
+    """
+    return "ui" if request.headers.get("origin") in settings.cors_origins else "api"
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """
@@ -82,11 +100,12 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-async def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(request: Request, credentials: UserLogin, db: Session = Depends(get_db)):
     """
     Authenticate user and return access/refresh tokens.
 
     Args:
+        request: Login request, classified by ``_session_kind``
         credentials: User login credentials
         db: Database session
 
@@ -122,14 +141,16 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
         )
 
     # Create tokens
+    session = _session_kind(request)
     token_data = {
         "sub": user.id,
         "email": user.email,
-        "role": user.role
+        "role": user.role,
+        "session": session
     }
 
     access_token = create_access_token(token_data)
-    refresh_token = create_refresh_token({"sub": user.id})
+    refresh_token = create_refresh_token({"sub": user.id, "session": session})
 
     logger.info(f"User logged in: {user.email}")
 
@@ -174,15 +195,17 @@ async def refresh_token(token_data: TokenRefresh, db: Session = Depends(get_db))
             detail="User not found or inactive"
         )
 
-    # Create new tokens
+    # Create new tokens, of the same session kind as the login
+    session = payload.get("session", "api")
     token_data = {
         "sub": user.id,
         "email": user.email,
-        "role": user.role
+        "role": user.role,
+        "session": session
     }
 
     access_token = create_access_token(token_data)
-    new_refresh_token = create_refresh_token({"sub": user.id})
+    new_refresh_token = create_refresh_token({"sub": user.id, "session": session})
 
     return {
         "access_token": access_token,
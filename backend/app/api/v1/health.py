@@ -15,6 +15,7 @@ from sqlalchemy import text
 
 from app.core.config import settings
 from app.core.database import engine
+from app.services.staging import staging_area
 
 logger = logging.getLogger(__name__)
 
@@ -66,14 +67,22 @@ async def health_check():
         logger.warning("Health check: argocd unreachable", extra={"error": str(e)})
         argocd = {"status": "unhealthy", "error": str(e)}
 
-    # --- Disk space ---
+    # --- Disk space (staging usage as last measured by the janitor) ---
     try:
         usage = shutil.disk_usage(settings.temp_dir)
         free_pct = round((usage.free / usage.total) * 100, 1)
+        staged_bytes, staged_files = staging_area.last_usage
+        over_budget = (
+            staged_bytes > settings.staging_max_mb * 1024 * 1024
+            or usage.free < settings.staging_min_free_mb * 1024 * 1024
+        )
         disk = {
-            "status": "healthy" if free_pct > 5 else "warning",
+            "status": "healthy" if free_pct > 5 and not over_budget else "warning",
             "free_percent": free_pct,
             "free_gb": round(usage.free / (1024**3), 2),
+            "staging_mb": round(staged_bytes / (1024**2), 1),
+            "staging_files": staged_files,
+            "staging_budget_mb": settings.staging_max_mb,
         }
     except Exception as e:
         logger.warning("Health check: disk check failed", extra={"error": str(e)})
@@ -1,378 +1,137 @@
 """
 API endpoints for project management.
 """
+import asyncio
 import logging
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, UploadFile, File, Form
+import uuid
+from typing import List, Optional, Set
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Header, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.executors import run_blocking, run_cpu_bound
 from app.models.project import Project
+from app.models.job import ProjectJob
+from app.models.workflow_step import ProjectWorkflowStep
 from app.models.user import User
-from app.schemas.project import ProjectCreate, ProjectResponse, ProjectUpdate, ProjectListResponse
+from app.schemas.project import (
+    ProjectCreate,
+    ProjectResponse,
+    ProjectUpdate,
+    ProjectListResponse,
+    ProjectBatchCreate,
+    ProjectBatchItemResult,
+    ProjectBatchResponse,
+    ProjectBatchDelete,
+    ProjectBatchDeleteItemResult,
+    ProjectBatchDeleteResponse,
+    ProjectTimelineStep,
+    ProjectTimelineResponse,
+)
 from app.services.template_engine import template_engine
 from app.services.github_service import github_service
-from app.services.argocd_service import argocd_service
-from app.middleware.auth import get_current_user
-from app.core.metrics import project_creation_total, background_tasks_active
+from app.services.job_queue import PRIORITIES, job_queue
+from app.services.admission import AdmissionRejected, admission_controller
+from app.services.idempotency import IdempotencyKeyReused, idempotency_store, request_fingerprint
+from app.services.project_events import format_sse, project_events, record_event
+from app.middleware.auth import get_current_user, is_ui_session
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
-async def create_project_workflow(
-    project_id: str,
-    project_name: str,
-    template_type: str,
-    description: str,
-    variables: dict,
-    db: Session
-):
+def _priority(requested: Optional[str], ui_session: bool) -> str:
     """
-    Background task for project creation workflow.
+    Resolve the ``X-IDP-Priority`` header of a request to a priority class.
 
-    Args:
-        project_id: Database project ID.
-        project_name: Name of the project.
-        template_type: Template to use.
-        description: Project description.
-        variables: Template variables.
-        db: Database session.
+    Only web UI sessions get the interactive lane; other callers asking for it
+    are downgraded to bulk, so scripts cannot jump the queue with a header.
     """
-    background_tasks_active.inc()
-    project = db.query(Project).filter(Project.id == project_id).first()
-
-    try:
-        # Update status: creating repository
-        project.status = "creating_repo"
-        db.commit()
-
-        logger.info(f"Starting project creation workflow for: {project_name}")
-
-        # Step 1: Render template
-        logger.info(f"Rendering template: {template_type}")
-        rendered_path = template_engine.render_template(
-            template_name=template_type,
-            project_name=project_name,
-            variables=variables
-        )
-
-        # Step 2: Create GitHub repository
-        logger.info(f"Creating GitHub repository: {project_name}")
-        repo_url, clone_url = github_service.create_repository(
-            repo_name=project_name,
-            description=description,
-            private=False
-        )
-
-        project.github_repo_url = repo_url
-        project.github_repo_name = project_name
-        db.commit()
-
-        # Step 3: Push files to GitHub
-        logger.info(f"Pushing files to GitHub repository: {project_name}")
-        github_service.push_files(
-            repo_name=project_name,
-            project_path=rendered_path
+    priority = requested or settings.workflow_default_priority
+    if priority not in PRIORITIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"X-IDP-Priority must be one of {list(PRIORITIES)}"
         )
+    if priority == "interactive" and not ui_session:
+        return "bulk"
+    return priority
 
-        # Cleanup rendered template
-        template_engine.cleanup_rendered_template(rendered_path)
-
-        # Update status: building (GitHub Actions will build)
-        project.status = "building"
-        db.commit()
-
-        # Step 4: Create ArgoCD application
-        logger.info(f"Creating ArgoCD application: {project_name}")
-        try:
-            await argocd_service.create_application(
-                app_name=project_name,
-                repo_url=clone_url,
-                path="helm",
-                auto_sync=True
-            )
-
-            project.argocd_app_name = project_name
-            project.status = "deploying"
-            db.commit()
-
-            logger.info(f"ArgoCD application created: {project_name}")
-
-            # In a real scenario, we would poll ArgoCD for deployment status
-            # For now, mark as active
-            project.status = "active"
-            db.commit()
-
-        except Exception as e:
-            logger.warning(f"ArgoCD creation failed (may not be running): {e}")
-            # Continue even if ArgoCD fails - project is still created
-            project.status = "active"
-            project.error_message = f"ArgoCD integration failed: {str(e)}"
-            db.commit()
-
-        project_creation_total.labels(status="success", template_type=template_type).inc()
-        logger.info(f"Project creation completed: {project_name}")
-
-    except Exception as e:
-        logger.error(f"Project creation failed: {e}")
-        project.status = "failed"
-        project.error_message = str(e)
-        db.commit()
-        project_creation_total.labels(status="failed", template_type=template_type).inc()
-
-    finally:
-        background_tasks_active.dec()
-
-
-async def create_openapi_project_workflow(
-    project_id: str,
-    project_name: str,
-    description: str,
-    spec_content: str,
-    file_format: str,
-    port: str,
-    db: Session
-):
-    """
-    Background task for OpenAPI-based project creation workflow.
-
-    Args:
-        project_id: Database project ID.
-        project_name: Name of the project.
-        description: Project description.
-        spec_content: OpenAPI specification content.
-        file_format: "yaml" or "json".
-        port: Application port.
-        db: Database session.
-    """
-    background_tasks_active.inc()
-    project = db.query(Project).filter(Project.id == project_id).first()
 
+def _admit(db: Session, user: User, count: int = 1, priority: str = "interactive"):
+    """Apply admission control, translating a rejection into 429 with Retry-After."""
     try:
-        project.status = "creating_repo"
-        db.commit()
-
-        logger.info(f"Starting OpenAPI project creation: {project_name}")
-
-        # Step 1: Generate code from OpenAPI spec
-        from app.services.openapi_generator_service import openapi_generator
-        logger.info(f"Parsing OpenAPI spec and generating code")
-
-        parsed_spec, models_code, main_code, tests_code = openapi_generator.generate_project(
-            spec_content=spec_content,
-            file_format=file_format,
-            project_name=project_name,
-            description=description,
-            port=port,
-        )
-
-        # Step 2: Render Cookiecutter template (infrastructure files)
-        logger.info(f"Rendering openapi-microservice template")
-        rendered_path = template_engine.render_template(
-            template_name="openapi-microservice",
-            project_name=project_name,
-            variables={
-                "description": description,
-                "port": port
-            }
-        )
-
-        # Step 3: Inject generated code into rendered template
-        logger.info(f"Injecting generated Python code")
-        openapi_generator.inject_generated_code(
-            project_path=rendered_path,
-            models_code=models_code,
-            main_code=main_code,
-            tests_code=tests_code,
-            spec_content=spec_content,
-            file_format=file_format,
-        )
-
-        # Step 4: Create GitHub repository
-        logger.info(f"Creating GitHub repository: {project_name}")
-        repo_url, clone_url = github_service.create_repository(
-            repo_name=project_name,
-            description=description,
-            private=False
-        )
-
-        project.github_repo_url = repo_url
-        project.github_repo_name = project_name
-        db.commit()
-
-        # Step 5: Push files to GitHub
-        logger.info(f"Pushing files to GitHub repository: {project_name}")
-        github_service.push_files(
-            repo_name=project_name,
-            project_path=rendered_path
+        admission_controller.check(db, user.id, count, priority)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=429,
+            detail=e.detail,
+            headers={"Retry-After": str(e.retry_after)}
         )
 
-        # Cleanup rendered template
-        template_engine.cleanup_rendered_template(rendered_path)
-
-        # Update status: building
-        project.status = "building"
-        db.commit()
-
-        # Step 6: Create ArgoCD application
-        logger.info(f"Creating ArgoCD application: {project_name}")
-        try:
-            await argocd_service.create_application(
-                app_name=project_name,
-                repo_url=clone_url,
-                path="helm",
-                auto_sync=True
-            )
-
-            project.argocd_app_name = project_name
-            project.status = "deploying"
-            db.commit()
-
-            logger.info(f"ArgoCD application created: {project_name}")
-
-            # Mark as active
-            project.status = "active"
-            db.commit()
-
-        except Exception as e:
-            logger.warning(f"ArgoCD creation failed (may not be running): {e}")
-            project.status = "active"
-            project.error_message = f"ArgoCD integration failed: {str(e)}"
-            db.commit()
-
-        project_creation_total.labels(status="success", template_type="openapi-microservice").inc()
-        logger.info(f"OpenAPI project creation completed: {project_name}")
 
-    except Exception as e:
-        logger.error(f"OpenAPI project creation failed: {e}")
-        project.status = "failed"
-        project.error_message = str(e)
-        db.commit()
-        project_creation_total.labels(status="failed", template_type="openapi-microservice").inc()
-
-    finally:
-        background_tasks_active.dec()
+def _replay(
+    db: Session,
+    user: User,
+    idempotency_key: Optional[str],
+    endpoint: str,
+    request_hash: str
+) -> Optional[JSONResponse]:
+    """Return the stored response of a repeated create request, if there is one."""
+    if not idempotency_key:
+        return None
+    try:
+        record = idempotency_store.lookup(db, user.id, idempotency_key, endpoint, request_hash)
+    except IdempotencyKeyReused as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if record is None:
+        return None
+    return JSONResponse(
+        status_code=record.response_status,
+        content=idempotency_store.body(record),
+        headers={"Idempotent-Replayed": "true"}
+    )
 
 
-async def create_camel_yaml_project_workflow(
-    project_id: str,
-    project_name: str,
-    description: str,
-    routes_content: str,
-    port: str,
-    db: Session
-):
+def _commit_created(
+    db: Session,
+    user: User,
+    idempotency_key: Optional[str],
+    endpoint: str,
+    request_hash: str,
+    response
+) -> Optional[JSONResponse]:
     """
-    Background task for Camel YAML-based project creation workflow.
+    Commit a create request, storing its 201 response under the Idempotency-Key.
 
-    Args:
-        project_id: Database project ID.
-        project_name: Name of the project.
-        description: Project description.
-        routes_content: Camel YAML DSL routes content.
-        port: Application port.
-        db: Database session.
+    Returns the stored response instead when a concurrent request with the same
+    key committed first; this request's changes are rolled back in that case.
     """
-    background_tasks_active.inc()
-    project = db.query(Project).filter(Project.id == project_id).first()
-
-    try:
-        project.status = "creating_repo"
-        db.commit()
-
-        logger.info(f"Starting Camel YAML project creation: {project_name}")
-
-        # Step 1: Render Cookiecutter template (infrastructure files)
-        logger.info(f"Rendering camel-yaml-api template")
-        rendered_path = template_engine.render_template(
-            template_name="camel-yaml-api",
-            project_name=project_name,
-            variables={
-                "description": description,
-                "port": port
-            }
-        )
-
-        # Step 2: Inject uploaded routes.yaml into the rendered project
-        import os
-        routes_file = os.path.join(rendered_path, "src", "main", "resources", "camel", "routes.yaml")
-        os.makedirs(os.path.dirname(routes_file), exist_ok=True)
-        with open(routes_file, 'w') as f:
-            f.write(routes_content)
-        logger.info(f"Injected Camel YAML routes into project")
-
-        # Step 3: Create GitHub repository
-        logger.info(f"Creating GitHub repository: {project_name}")
-        repo_url, clone_url = github_service.create_repository(
-            repo_name=project_name,
-            description=description,
-            private=False
+    if idempotency_key:
+        idempotency_store.remember(
+            db, user.id, idempotency_key, endpoint, request_hash, 201, response.model_dump(mode="json")
         )
-
-        project.github_repo_url = repo_url
-        project.github_repo_name = project_name
-        db.commit()
-
-        # Step 4: Push files to GitHub
-        logger.info(f"Pushing files to GitHub repository: {project_name}")
-        github_service.push_files(
-            repo_name=project_name,
-            project_path=rendered_path
-        )
-
-        # Cleanup rendered template
-        template_engine.cleanup_rendered_template(rendered_path)
-
-        # Update status: building
-        project.status = "building"
-        db.commit()
-
-        # Step 5: Create ArgoCD application
-        logger.info(f"Creating ArgoCD application: {project_name}")
-        try:
-            await argocd_service.create_application(
-                app_name=project_name,
-                repo_url=clone_url,
-                path="helm",
-                auto_sync=True
-            )
-
-            project.argocd_app_name = project_name
-            project.status = "deploying"
-            db.commit()
-
-            logger.info(f"ArgoCD application created: {project_name}")
-
-            # Mark as active
-            project.status = "active"
-            db.commit()
-
-        except Exception as e:
-            logger.warning(f"ArgoCD creation failed (may not be running): {e}")
-            project.status = "active"
-            project.error_message = f"ArgoCD integration failed: {str(e)}"
-            db.commit()
-
-        project_creation_total.labels(status="success", template_type="camel-yaml-api").inc()
-        logger.info(f"Camel YAML project creation completed: {project_name}")
-
-    except Exception as e:
-        logger.error(f"Camel YAML project creation failed: {e}")
-        project.status = "failed"
-        project.error_message = str(e)
+    try:
         db.commit()
-        project_creation_total.labels(status="failed", template_type="camel-yaml-api").inc()
-
-    finally:
-        background_tasks_active.dec()
+    except IntegrityError:
+        db.rollback()
+        replay = _replay(db, user, idempotency_key, endpoint, request_hash)
+        if replay is None:
+            raise
+        return replay
+    return None
 
 
 @router.post("", response_model=ProjectResponse, status_code=201)
 async def create_project(
     project_data: ProjectCreate,
-    background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
+    requested_priority: Optional[str] = Header(default=None, alias="X-IDP-Priority"),
+    ui_session: bool = Depends(is_ui_session),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -386,26 +145,42 @@ async def create_project(
     4. Creating ArgoCD application
     5. Deploying to Kubernetes
 
-    The workflow runs in the background, and the project status is updated accordingly.
+    The workflow is queued and executed by a worker, and the project status is updated accordingly.
+    Returns 429 with Retry-After when the creation backlog is full.
+
+    Requests repeated with the same ``Idempotency-Key`` header get the original
+    response back instead of creating the project again.
+
+    Requests without an ``X-IDP-Priority`` header run in the
+    ``workflow_default_priority`` lane (``bulk``), behind interactive ones; the
+    UI sends ``X-IDP-Priority: interactive``, which is only honoured for web UI
+    sessions (see ``_priority``).
 
     Requires authentication.
     """
+    request_hash = request_fingerprint(project_data.model_dump())
+    replay = _replay(db, current_user, idempotency_key, "create_project", request_hash)
+    if replay:
+        return replay
+
+    priority = _priority(requested_priority, ui_session)
+    _admit(db, current_user, priority=priority)
+
     # Check if project name already exists
     existing = db.query(Project).filter(Project.name == project_data.name).first()
     if existing:
         raise HTTPException(status_code=400, detail=f"Project '{project_data.name}' already exists")
 
     # Check if template exists
-    templates = template_engine.list_templates()
-    template_names = [t["name"] for t in templates]
-    if project_data.template_type not in template_names:
+    catalog = template_engine.catalog()
+    if catalog.get(project_data.template_type) is None:
         raise HTTPException(
             status_code=400,
-            detail=f"Template '{project_data.template_type}' not found. Available: {template_names}"
+            detail=f"Template '{project_data.template_type}' not found. Available: {list(catalog.templates)}"
         )
 
     # Check if GitHub repository already exists
-    if github_service.repository_exists(project_data.name):
+    if await run_blocking("github", github_service.repository_exists, project_data.name):
         raise HTTPException(
             status_code=400,
             detail=f"GitHub repository '{project_data.name}' already exists"
@@ -421,30 +196,168 @@ async def create_project(
     )
 
     db.add(project)
-    db.commit()
+    db.flush()
+
+    # Queue the workflow in the same transaction so it survives API restarts
+    job_queue.enqueue(db, project.id, "create_project", user_id=current_user.id, payload={
+        "project_name": project_data.name,
+        "template_type": project_data.template_type,
+        "description": project_data.description or "",
+        "variables": project_data.variables or {},
+    }, priority=priority)
+    record_event(db, project.id, current_user.id, "pending")
+    db.flush()
+    replay = _commit_created(
+        db, current_user, idempotency_key, "create_project", request_hash,
+        ProjectResponse.model_validate(project)
+    )
+    if replay:
+        return replay
     db.refresh(project)
 
-    # Start background workflow
-    background_tasks.add_task(
-        create_project_workflow,
-        project.id,
-        project_data.name,
-        project_data.template_type,
-        project_data.description or "",
-        project_data.variables or {},
-        db
+    return project
+
+
+async def _taken_on_github(names: List[str]) -> Set[str]:
+    """
+    Names that already exist as GitHub repositories, checked with whichever
+    takes fewer calls: one lookup per name, or listing the owner's repositories.
+    """
+    unique = list(dict.fromkeys(names))
+    pages = await run_blocking("github", github_service.repository_listing_pages)
+    if len(unique) > pages:
+        return await run_blocking("github", github_service.existing_repositories, unique)
+
+    current_names = await asyncio.gather(*(
+        run_blocking("github", github_service.repository_name, name) for name in unique
+    ))
+    # A renamed repository's old name redirects to it but is free to reuse
+    return {
+        name for name, current in zip(unique, current_names)
+        if current is not None and current.lower() == name.lower()
+    }
+
+
+@router.post("/batch", response_model=ProjectBatchResponse, status_code=201)
+async def create_projects_batch(
+    batch: ProjectBatchCreate,
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create many projects in one request.
+
+    The whole batch is validated in one pass (one name query, one template
+    lookup and one GitHub listing), then a workflow is queued for each valid
+    item. Batch workflows run in the bulk priority lane, behind interactive
+    creations, and at most ``max_concurrency`` of them run at once so a large
+    onboarding does not monopolise the workers.
+
+    Returns per-item results; invalid items are rejected without affecting the
+    rest of the batch. Supports ``Idempotency-Key`` like ``POST /projects``.
+
+    Requires authentication.
+    """
+    request_hash = request_fingerprint(batch.model_dump())
+    replay = _replay(db, current_user, idempotency_key, "create_projects_batch", request_hash)
+    if replay:
+        return replay
+
+    if len(batch.projects) > settings.batch_max_size:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch size must not exceed {settings.batch_max_size} projects"
+        )
+
+    _admit(db, current_user, len(batch.projects), priority="bulk")
+
+    concurrency = min(
+        batch.max_concurrency or settings.batch_default_concurrency,
+        settings.batch_max_concurrency
+    )
+    names = [item.name for item in batch.projects]
+
+    template_names = template_engine.catalog().templates
+    taken_in_db = {
+        row.name for row in db.query(Project.name).filter(Project.name.in_(names)).all()
+    }
+    taken_on_github = await _taken_on_github(names)
+
+    batch_id = str(uuid.uuid4())
+    seen = set()
+    results = []
+    accepted = []
+
+    for item in batch.projects:
+        error = None
+        if item.name in seen:
+            error = f"Project '{item.name}' appears more than once in the batch"
+        elif item.name in taken_in_db:
+            error = f"Project '{item.name}' already exists"
+        elif item.template_type not in template_names:
+            error = f"Template '{item.template_type}' not found. Available: {sorted(template_names)}"
+        elif item.name in taken_on_github:
+            error = f"GitHub repository '{item.name}' already exists"
+        seen.add(item.name)
+
+        if error:
+            results.append(ProjectBatchItemResult(name=item.name, status="rejected", error=error))
+            continue
+
+        project = Project(
+            name=item.name,
+            description=item.description,
+            template_type=item.template_type,
+            status="pending",
+            user_id=current_user.id
+        )
+        db.add(project)
+        accepted.append((item, project))
+        results.append(ProjectBatchItemResult(name=item.name, status="accepted"))
+
+    if accepted:
+        db.flush()
+        for item, project in accepted:
+            job_queue.enqueue(db, project.id, "create_project", user_id=current_user.id, payload={
+                "project_name": item.name,
+                "template_type": item.template_type,
+                "description": item.description or "",
+                "variables": item.variables or {},
+            }, batch_id=batch_id, batch_limit=concurrency, priority="bulk")
+            record_event(db, project.id, current_user.id, "pending")
+        db.flush()
+
+    created = {project.name: project for _, project in accepted}
+    for result in results:
+        if result.status == "accepted":
+            result.project = ProjectResponse.model_validate(created[result.name])
+
+    response = ProjectBatchResponse(
+        batch_id=batch_id,
+        accepted=len(accepted),
+        rejected=len(results) - len(accepted),
+        results=results
+    )
+    replay = _commit_created(
+        db, current_user, idempotency_key, "create_projects_batch", request_hash, response
     )
+    if replay:
+        return replay
 
-    return project
+    logger.info(f"Batch {batch_id}: queued {len(accepted)} of {len(batch.projects)} projects")
+    return response
 
 
 @router.post("/from-openapi", response_model=ProjectResponse, status_code=201)
 async def create_project_from_openapi(
-    background_tasks: BackgroundTasks,
     openapi_file: UploadFile = File(..., description="OpenAPI spec file (.yaml or .json)"),
     name: str = Form(..., min_length=1, max_length=255),
     description: str = Form(default=""),
     port: str = Form(default="8000"),
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
+    requested_priority: Optional[str] = Header(default=None, alias="X-IDP-Priority"),
+    ui_session: bool = Depends(is_ui_session),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -453,9 +366,19 @@ async def create_project_from_openapi(
 
     Accepts multipart/form-data with the OAS file and project metadata.
     Generates FastAPI code with typed routes and Pydantic models.
+    Supports ``Idempotency-Key`` and ``X-IDP-Priority`` like ``POST /projects``.
 
     Requires authentication.
     """
+    content = await openapi_file.read()
+    request_hash = request_fingerprint(name, description, port, openapi_file.filename, content)
+    replay = _replay(db, current_user, idempotency_key, "create_project_from_openapi", request_hash)
+    if replay:
+        return replay
+
+    priority = _priority(requested_priority, ui_session)
+    _admit(db, current_user, priority=priority)
+
     # Validate file extension
     filename = openapi_file.filename or ""
     if not filename.lower().endswith(('.yaml', '.yml', '.json')):
@@ -464,8 +387,7 @@ async def create_project_from_openapi(
             detail="File must be .yaml, .yml, or .json"
         )
 
-    # Read and validate file size
-    content = await openapi_file.read()
+    # Validate file size
     if len(content) > 1_048_576:  # 1MB limit
         raise HTTPException(
             status_code=400,
@@ -478,7 +400,7 @@ async def create_project_from_openapi(
     # Validate OpenAPI spec
     from app.services.openapi_generator_service import openapi_generator
     try:
-        openapi_generator.validate_spec(spec_content, file_format)
+        await run_cpu_bound(openapi_generator.validate_spec, spec_content, file_format)
     except ValueError as e:
         raise HTTPException(
             status_code=422,
@@ -502,7 +424,7 @@ async def create_project_from_openapi(
         )
 
     # Check if GitHub repository exists
-    if github_service.repository_exists(name_lower):
+    if await run_blocking("github", github_service.repository_exists, name_lower):
         raise HTTPException(
             status_code=400,
             detail=f"GitHub repository '{name_lower}' already exists"
@@ -519,20 +441,25 @@ async def create_project_from_openapi(
     )
 
     db.add(project)
-    db.commit()
-    db.refresh(project)
-
-    # Start background workflow
-    background_tasks.add_task(
-        create_openapi_project_workflow,
-        project.id,
-        name_lower,
-        description or "",
-        spec_content,
-        file_format,
-        port,
-        db
+    db.flush()
+
+    # Queue the workflow in the same transaction so it survives API restarts
+    job_queue.enqueue(db, project.id, "create_openapi_project", user_id=current_user.id, payload={
+        "project_name": name_lower,
+        "description": description or "",
+        "spec_content": spec_content,
+        "file_format": file_format,
+        "port": port,
+    }, priority=priority)
+    record_event(db, project.id, current_user.id, "pending")
+    db.flush()
+    replay = _commit_created(
+        db, current_user, idempotency_key, "create_project_from_openapi", request_hash,
+        ProjectResponse.model_validate(project)
     )
+    if replay:
+        return replay
+    db.refresh(project)
 
     logger.info(f"Started OpenAPI project creation: {name_lower}")
     return project
@@ -540,11 +467,13 @@ async def create_project_from_openapi(
 
 @router.post("/from-camel-yaml", response_model=ProjectResponse, status_code=201)
 async def create_project_from_camel_yaml(
-    background_tasks: BackgroundTasks,
     camel_yaml_file: UploadFile = File(..., description="Camel YAML DSL routes file (.yaml or .yml)"),
     name: str = Form(..., min_length=1, max_length=255),
     description: str = Form(default=""),
     port: str = Form(default="8080"),
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
+    requested_priority: Optional[str] = Header(default=None, alias="X-IDP-Priority"),
+    ui_session: bool = Depends(is_ui_session),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -553,9 +482,19 @@ async def create_project_from_camel_yaml(
 
     Accepts multipart/form-data with the Camel routes YAML file and project metadata.
     Generates a full Quarkus + Camel project with the uploaded routes injected.
+    Supports ``Idempotency-Key`` and ``X-IDP-Priority`` like ``POST /projects``.
 
     Requires authentication.
     """
+    content = await camel_yaml_file.read()
+    request_hash = request_fingerprint(name, description, port, camel_yaml_file.filename, content)
+    replay = _replay(db, current_user, idempotency_key, "create_project_from_camel_yaml", request_hash)
+    if replay:
+        return replay
+
+    priority = _priority(requested_priority, ui_session)
+    _admit(db, current_user, priority=priority)
+
     # Validate file extension
     filename = camel_yaml_file.filename or ""
     if not filename.lower().endswith(('.yaml', '.yml')):
@@ -564,8 +503,7 @@ async def create_project_from_camel_yaml(
             detail="File must be .yaml or .yml"
         )
 
-    # Read and validate file size
-    content = await camel_yaml_file.read()
+    # Validate file size
     if len(content) > 1_048_576:  # 1MB limit
         raise HTTPException(
             status_code=400,
@@ -617,7 +555,7 @@ async def create_project_from_camel_yaml(
         )
 
     # Check if GitHub repository exists
-    if github_service.repository_exists(name_lower):
+    if await run_blocking("github", github_service.repository_exists, name_lower):
         raise HTTPException(
             status_code=400,
             detail=f"GitHub repository '{name_lower}' already exists"
@@ -633,19 +571,24 @@ async def create_project_from_camel_yaml(
     )
 
     db.add(project)
-    db.commit()
-    db.refresh(project)
-
-    # Start background workflow
-    background_tasks.add_task(
-        create_camel_yaml_project_workflow,
-        project.id,
-        name_lower,
-        description or "",
-        routes_content,
-        port,
-        db
+    db.flush()
+
+    # Queue the workflow in the same transaction so it survives API restarts
+    job_queue.enqueue(db, project.id, "create_camel_yaml_project", user_id=current_user.id, payload={
+        "project_name": name_lower,
+        "description": description or "",
+        "routes_content": routes_content,
+        "port": port,
+    }, priority=priority)
+    record_event(db, project.id, current_user.id, "pending")
+    db.flush()
+    replay = _commit_created(
+        db, current_user, idempotency_key, "create_project_from_camel_yaml", request_hash,
+        ProjectResponse.model_validate(project)
     )
+    if replay:
+        return replay
+    db.refresh(project)
 
     logger.info(f"Started Camel YAML project creation: {name_lower}")
     return project
@@ -747,6 +690,91 @@ def list_projects(
     )
 
 
+def _parse_last_event_id(last_event_id: Optional[str]) -> Optional[int]:
+    """Parse the Last-Event-ID header sent by reconnecting SSE clients."""
+    if last_event_id is None:
+        return None
+    try:
+        return int(last_event_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Last-Event-ID must be an integer")
+
+
+def _event_stream(
+    request: Request,
+    user_id: str,
+    project_id: Optional[str],
+    last_event_id: Optional[int]
+) -> StreamingResponse:
+    """Stream project status events as Server-Sent Events, with heartbeat comments."""
+
+    async def stream():
+        async with project_events.subscribe(user_id, project_id, last_event_id) as subscription:
+            while not await request.is_disconnected():
+                event = await subscription.next(timeout=settings.events_heartbeat_seconds)
+                if subscription.overflowed:
+                    # Client fell behind; it reconnects with Last-Event-ID and catches up
+                    break
+                if event is None:
+                    yield ": heartbeat\n\n"
+                else:
+                    yield format_sse(event)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/events")
+async def stream_project_events(
+    request: Request,
+    last_event_id: Optional[str] = Header(default=None),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream status transitions of all of the current user's projects (Server-Sent Events).
+
+    Each event carries the project id, the new status and any error message.
+    Clients reconnecting with ``Last-Event-ID`` first receive the events they
+    missed. A heartbeat comment is sent when nothing happened for
+    ``events_heartbeat_seconds``.
+
+    Requires authentication. ``EventSource`` cannot send the ``Authorization``
+    header, so the frontend reads the stream with ``fetch`` instead.
+    """
+    return _event_stream(request, current_user.id, None, _parse_last_event_id(last_event_id))
+
+
+@router.get("/{project_id}/events")
+async def stream_project_status(
+    project_id: str,
+    request: Request,
+    last_event_id: Optional[str] = Header(default=None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream status transitions of one project (Server-Sent Events).
+
+    Without ``Last-Event-ID`` the stream starts with the project's past
+    transitions, so the latest event is always its current status.
+
+    Requires authentication. Users can only stream their own projects.
+    """
+    project = db.query(Project.id).filter(
+        Project.id == project_id,
+        Project.user_id == current_user.id
+    ).first()
+
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    resume_after = _parse_last_event_id(last_event_id)
+    return _event_stream(request, current_user.id, project_id, 0 if resume_after is None else resume_after)
+
+
 @router.get("/{project_id}", response_model=ProjectResponse)
 def get_project(
     project_id: str,
@@ -776,6 +804,62 @@ def get_project(
     return project
 
 
+@router.get("/{project_id}/timeline", response_model=ProjectTimelineResponse)
+def get_project_timeline(
+    project_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get start and end times of the project's workflow steps.
+
+    Steps are listed in the order they started; a retried project shows the
+    latest run of each step. Use it to see which stage (render, codegen,
+    create_repo, push, argocd) made a creation slow.
+
+    Args:
+        project_id: Project ID.
+        current_user: Current authenticated user.
+
+    Returns:
+        Project timeline.
+
+    Requires authentication. Users can only access their own projects.
+    """
+    project = db.query(Project).filter(
+        Project.id == project_id,
+        Project.user_id == current_user.id
+    ).first()
+
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    rows = db.query(ProjectWorkflowStep).filter(
+        ProjectWorkflowStep.project_id == project.id
+    ).all()
+    rows.sort(key=lambda row: row.started_at or row.completed_at or project.created_at)
+
+    steps = [
+        ProjectTimelineStep(
+            step=row.step,
+            status=row.status,
+            started_at=row.started_at,
+            finished_at=row.completed_at,
+            duration_seconds=(
+                (row.completed_at - row.started_at).total_seconds()
+                if row.started_at and row.completed_at else None
+            ),
+        )
+        for row in rows
+    ]
+    return ProjectTimelineResponse(
+        project_id=project.id,
+        status=project.status,
+        created_at=project.created_at,
+        steps=steps
+    )
+
+
 @router.patch("/{project_id}", response_model=ProjectResponse)
 def update_project(
     project_id: str,
@@ -805,18 +889,227 @@ def update_project(
         raise HTTPException(status_code=404, detail="Project not found")
 
     # Update fields
-    for field, value in project_update.model_dump(exclude_unset=True).items():
+    changes = project_update.model_dump(exclude_unset=True)
+    for field, value in changes.items():
         setattr(project, field, value)
+    if "status" in changes:
+        record_event(db, project.id, current_user.id, project.status, project.error_message)
+
+    db.commit()
+    db.refresh(project)
+
+    return project
+
+
+@router.post("/{project_id}/cancel", response_model=ProjectResponse, status_code=202)
+def cancel_project(
+    project_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Cancel a project that is still being created.
+
+    A project whose workflow has not started yet is cancelled immediately.
+    Otherwise the workflow stops at its next step boundary and undoes only the
+    steps that already completed (deleting the ArgoCD application and GitHub
+    repository if they were created); the project then moves to ``cancelled``.
+
+    Args:
+        project_id: Project ID.
+        current_user: Current authenticated user.
+
+    Returns:
+        Project; ``cancelled`` already, or still in progress until the worker stops it.
+
+    Requires authentication. Users can only cancel their own projects.
+    """
+    project = db.query(Project).filter(
+        Project.id == project_id,
+        Project.user_id == current_user.id
+    ).first()
 
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    job = job_queue.latest_for_project(db, project.id)
+    if job is None or job.kind == "delete_project" or job.status not in ("queued", "running"):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Project is not being created (status is '{project.status}')"
+        )
+
+    if job_queue.request_cancel(db, job):
+        project.status = "cancelled"
+        project.error_message = None
+        record_event(db, project.id, current_user.id, "cancelled")
+    db.commit()
+    db.refresh(project)
+
+    logger.info(f"Cancellation requested for project: {project.name}")
+    return project
+
+
+@router.post("/{project_id}/retry", response_model=ProjectResponse, status_code=202)
+def retry_project(
+    project_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Retry a failed project creation.
+
+    The workflow resumes from the first step that did not complete: a repository
+    created by the failed attempt is reused rather than created again, and only
+    the remaining steps (e.g. push and ArgoCD) are run.
+
+    Args:
+        project_id: Project ID.
+        current_user: Current authenticated user.
+
+    Returns:
+        Project, back in ``pending`` status.
+
+    Requires authentication. Users can only retry their own projects.
+    """
+    project = db.query(Project).filter(
+        Project.id == project_id,
+        Project.user_id == current_user.id
+    ).first()
+
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    if project.status != "failed":
+        raise HTTPException(
+            status_code=409,
+            detail=f"Only failed projects can be retried (status is '{project.status}')"
+        )
+
+    job = job_queue.latest_for_project(db, project.id)
+    if job is None:
+        raise HTTPException(status_code=409, detail="Project has no workflow to retry")
+    if job.status in ("queued", "running"):
+        raise HTTPException(status_code=409, detail="Project workflow is already in progress")
+
+    _admit(db, current_user, priority=job.priority)
+
+    job_queue.resubmit(db, job)
+    project.status = "pending"
+    project.error_message = None
+    record_event(db, project.id, current_user.id, "pending")
     db.commit()
     db.refresh(project)
 
+    logger.info(f"Retrying project creation: {project.name}")
     return project
 
 
-@router.delete("/{project_id}", status_code=204)
-async def delete_project(
+def _queue_deletion(
+    db: Session,
+    project: Project,
+    job: Optional[ProjectJob],
+    priority: str,
+    batch_id: Optional[str] = None,
+    batch_limit: Optional[int] = None,
+) -> None:
+    """
+    Queue the deletion workflow of a project and move it to ``deleting``.
+
+    A creation that has not started yet is dropped. One that is running is
+    asked to cancel, and the deletion runs once the worker has undone the
+    creation's completed steps (jobs of a project run in order). Changes are
+    committed by the caller.
+    """
+    if job is not None and job.status in ("queued", "running"):
+        if job.kind == "delete_project":
+            return
+        job_queue.request_cancel(db, job)
+
+    job_queue.enqueue(
+        db, project.id, "delete_project", {"project_name": project.name},
+        user_id=project.user_id, priority=priority, batch_id=batch_id, batch_limit=batch_limit
+    )
+    project.status = "deleting"
+    project.error_message = None
+    record_event(db, project.id, project.user_id, "deleting")
+
+
+@router.delete("", response_model=ProjectBatchDeleteResponse, status_code=202)
+def delete_projects_batch(
+    batch: ProjectBatchDelete,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Delete many projects in one request.
+
+    A deletion workflow is queued for each project in the bulk priority lane,
+    and at most ``max_concurrency`` of them run at once. Returns per-item
+    results; projects that are not found are rejected without affecting the
+    rest of the batch, and projects still being created are cancelled first.
+    Poll the projects (or stream their events) to follow the deletions.
+
+    Requires authentication. Users can only delete their own projects.
+    """
+    if len(batch.project_ids) > settings.batch_max_size:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch size must not exceed {settings.batch_max_size} projects"
+        )
+
+    concurrency = min(
+        batch.max_concurrency or settings.batch_default_concurrency,
+        settings.batch_max_concurrency
+    )
+    projects = {
+        project.id: project
+        for project in db.query(Project).filter(
+            Project.id.in_(batch.project_ids),
+            Project.user_id == current_user.id
+        ).all()
+    }
+    jobs = job_queue.latest_for_projects(db, list(projects))
+
+    batch_id = str(uuid.uuid4())
+    seen = set()
+    results = []
+
+    for project_id in batch.project_ids:
+        if project_id in seen:
+            error = f"Project '{project_id}' appears more than once in the batch"
+        elif project_id not in projects:
+            error = "Project not found"
+        else:
+            error = None
+            _queue_deletion(
+                db, projects[project_id], jobs.get(project_id), "bulk",
+                batch_id=batch_id, batch_limit=concurrency
+            )
+        seen.add(project_id)
+        results.append(ProjectBatchDeleteItemResult(
+            project_id=project_id,
+            status="rejected" if error else "accepted",
+            error=error
+        ))
+
+    db.commit()
+
+    accepted = sum(1 for result in results if result.status == "accepted")
+    logger.info(f"Batch {batch_id}: queued deletion of {accepted} of {len(batch.project_ids)} projects")
+    return ProjectBatchDeleteResponse(
+        batch_id=batch_id,
+        accepted=accepted,
+        rejected=len(results) - accepted,
+        results=results
+    )
+
+
+@router.delete("/{project_id}", response_model=ProjectResponse, status_code=202)
+def delete_project(
     project_id: str,
+    requested_priority: Optional[str] = Header(default=None, alias="X-IDP-Priority"),
+    ui_session: bool = Depends(is_ui_session),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -828,10 +1121,20 @@ async def delete_project(
     - GitHub repository
     - Database record
 
+    Deletion runs in the background: the project moves to ``deleting`` and is
+    removed once a worker has deleted the ArgoCD application and GitHub
+    repository (concurrently). A project that is still being created is
+    cancelled first; its deletion starts once the creation has been undone.
+
     Args:
         project_id: Project ID.
+        requested_priority: ``X-IDP-Priority`` header, as for ``POST /projects``.
+        ui_session: Whether the caller is a web UI session.
         current_user: Current authenticated user.
 
+    Returns:
+        Project, in ``deleting`` status.
+
     Requires authentication. Users can only delete their own projects.
     """
     project = db.query(Project).filter(
@@ -842,31 +1145,11 @@ async def delete_project(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    logger.info(f"Deleting project: {project.name}")
-
-    # Delete ArgoCD application (this will remove k3s resources)
-    if project.argocd_app_name:
-        try:
-            logger.info(f"Deleting ArgoCD application: {project.argocd_app_name}")
-            await argocd_service.delete_application(project.argocd_app_name)
-            logger.info(f"ArgoCD application deleted: {project.argocd_app_name}")
-        except Exception as e:
-            logger.warning(f"Failed to delete ArgoCD application: {e}")
-            # Continue with deletion even if ArgoCD fails
-
-    # Delete GitHub repository
-    if project.github_repo_name:
-        try:
-            logger.info(f"Deleting GitHub repository: {project.github_repo_name}")
-            github_service.delete_repository(project.github_repo_name)
-            logger.info(f"GitHub repository deleted: {project.github_repo_name}")
-        except Exception as e:
-            logger.warning(f"Failed to delete GitHub repository: {e}")
-            # Continue with deletion even if GitHub fails
-
-    # Delete database record
-    db.delete(project)
+    _queue_deletion(
+        db, project, job_queue.latest_for_project(db, project.id), _priority(requested_priority, ui_session)
+    )
     db.commit()
+    db.refresh(project)
 
-    logger.info(f"Project deleted successfully: {project.name}")
-    return None
+    logger.info(f"Deletion queued for project: {project.name}")
+    return project
@@ -1,9 +1,12 @@
 """
 API endpoints for template management.
+
+Responses carry an ``ETag`` derived from the template metadata; clients that
+send it back in ``If-None-Match`` get ``304 Not Modified`` until a template changes.
 """
 import logging
-from typing import List
-from fastapi import APIRouter
+from typing import List, Optional
+from fastapi import APIRouter, Header, HTTPException, Response
 
 from app.schemas.project import TemplateInfo
 from app.services.template_engine import template_engine
@@ -13,20 +16,40 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _not_modified(etag: str, if_none_match: Optional[str]) -> bool:
+    """Whether an ``If-None-Match`` header matches the current ETag."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
 @router.get("", response_model=List[TemplateInfo])
-def list_templates():
+def list_templates(
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None)
+):
     """
     List all available templates.
 
     Returns:
-        List of available templates with their metadata.
+        List of available templates with their metadata, or 304 if the
+        ``If-None-Match`` ETag is still current.
     """
-    templates = template_engine.list_templates()
-    return templates
+    catalog = template_engine.catalog()
+    if _not_modified(catalog.etag, if_none_match):
+        return Response(status_code=304, headers={"ETag": catalog.etag})
+
+    response.headers["ETag"] = catalog.etag
+    return catalog.list()
 
 
 @router.get("/{template_name}", response_model=TemplateInfo)
-def get_template(template_name: str):
+def get_template(
+    template_name: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None)
+):
     """
     Get details for a specific template.
 
@@ -34,13 +57,16 @@ def get_template(template_name: str):
         template_name: Name of the template.
 
     Returns:
-        Template metadata.
+        Template metadata, or 304 if the ``If-None-Match`` ETag is still current.
     """
-    templates = template_engine.list_templates()
+    catalog = template_engine.catalog()
+    template = catalog.get(template_name)
+    if template is None:
+        raise HTTPException(status_code=404, detail=f"Template '{template_name}' not found")
 
-    for template in templates:
-        if template["name"] == template_name:
-            return template
+    etag = catalog.etags[template_name]
+    if _not_modified(etag, if_none_match):
+        return Response(status_code=304, headers={"ETag": etag})
 
-    from fastapi import HTTPException
-    raise HTTPException(status_code=404, detail=f"Template '{template_name}' not found")
+    response.headers["ETag"] = etag
+    return template
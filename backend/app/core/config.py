@@ -57,6 +57,76 @@ class Settings(BaseSettings):
     # Template Configuration
     templates_dir: str = "app/templates"
     temp_dir: str = "/tmp/idp-projects"
+    template_renderer: str = "native"  # native (compiled once, in memory) or cookiecutter
+    render_static_files: str = "link"  # Files without Jinja syntax: link (hardlink), clone (reflink/copy_file_range) or write
+    template_hot_reload: bool = True  # Watch templates_dir (inotify) instead of stat-ing templates on every use
+    render_cache_enabled: bool = True  # Reuse rendered trees for identical template content and context
+    render_cache_dir: str = "/tmp/idp-render-cache"  # Should be on the same filesystem as temp_dir
+    render_cache_max_mb: int = 256  # Least recently used entries are evicted beyond this
+    staging_ttl_minutes: int = 120  # Staging directories older than this are removed by the janitor
+    staging_janitor_interval_seconds: float = 60.0
+    staging_max_mb: int = 2048  # New renders wait while the staging area is larger than this
+    staging_min_free_mb: int = 512  # ... or while the volume has less free space than this
+    staging_budget_wait_seconds: float = 60.0  # Renders fail after waiting this long for space
+
+    # Workflow Job Queue
+    embedded_worker_enabled: bool = True  # Run a worker inside the API process; disable when running idp-worker
+    worker_concurrency: int = 4  # Jobs executed concurrently per worker process
+    worker_poll_interval_seconds: float = 1.0
+    job_lease_seconds: int = 300  # Running jobs without a heartbeat for this long are reclaimed
+    job_max_attempts: int = 3
+    status_flush_interval_seconds: float = 2.0  # Max age of a buffered project status change
+    worker_cancel_poll_seconds: float = 2.0  # How often workers check running jobs for cancellation
+    worker_metrics_port: int = 9100  # Prometheus endpoint of idp-worker processes (0 disables it)
+    worker_metrics_interval_seconds: float = 15.0  # How often workers refresh the queue depth/running gauges
+
+    # Workflow admission control
+    workflow_max_running: int = 20  # Across all workers
+    workflow_max_running_per_user: int = 5
+    workflow_interactive_reserved_slots: int = 4  # Of workflow_max_running, held back from bulk jobs
+    worker_interactive_slots: int = 1  # Of worker_concurrency, held back from bulk jobs
+    workflow_default_priority: str = "bulk"  # For requests without X-IDP-Priority; interactive is honoured for UI sessions only
+    admission_max_queued_jobs: int = 1000  # Create endpoints return 429 beyond this backlog
+    admission_max_queued_per_user: int = 250
+    admission_retry_after_seconds: int = 30
+
+    # Idempotency-Key handling on create endpoints
+    idempotency_key_ttl_hours: int = 24  # How long a create response can be replayed
+
+    # Project status streaming (GET /projects/events, /projects/{id}/events)
+    events_poll_interval_seconds: float = 1.0  # One shared poll per API process, not per client
+    events_heartbeat_seconds: float = 15.0  # Keeps idle streams alive through proxies
+
+    # Batch project creation
+    batch_max_size: int = 200
+    batch_default_concurrency: int = 10  # Workflows of one batch running at once
+    batch_max_concurrency: int = 50
+
+    # Blocking-call executors (thread pools used by workflows)
+    render_executor_workers: int = 4  # Template rendering and code generation
+    github_executor_workers: int = 8  # PyGithub calls and git subprocesses
+    codegen_cache_max_mb: int = 64  # In-memory LRU of generated OpenAPI project code
+    codegen_cache_dir: str = ""  # Optional on-disk tier shared by processes; empty disables it
+    codegen_cache_disk_max_mb: int = 512
+    process_pool_enabled: bool = True  # Run OpenAPI codegen and cookiecutter renders in worker processes
+    process_pool_workers: int = 2
+    process_pool_job_timeout_seconds: float = 120.0  # Wall-clock limit per job
+    process_pool_max_memory_mb: int = 2048  # Address-space limit per worker process (0: unlimited)
+    process_pool_max_tasks_per_child: int = 200  # Workers are replaced after this many jobs (0: never)
+    process_pool_preload: str = "datamodel_code_generator,openapi_spec_validator,cookiecutter.main,app.services.openapi_generator_service"
+
+    # Pool of pre-provisioned GitHub repositories claimed by create_repo
+    repo_pool_enabled: bool = False
+    repo_pool_min_size: int = 2
+    repo_pool_max_size: int = 20
+    repo_pool_window_minutes: int = 15  # Pool targets the repositories requested in this window
+    repo_pool_fill_interval_seconds: float = 30.0
+    repo_pool_prefix: str = "idp-pool-"  # Name prefix of placeholder repositories
+
+    # Retries of transient GitHub/ArgoCD failures (timeouts, 429, 5xx)
+    external_retry_max_attempts: int = 4
+    external_retry_base_delay_seconds: float = 0.5
+    external_retry_max_delay_seconds: float = 8.0
 
     model_config = SettingsConfigDict(
         env_file=".env",
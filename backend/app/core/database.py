@@ -48,6 +48,6 @@ def get_db():
 def init_db():
     """Initialize database by creating all tables."""
     # Import models to register them with Base.metadata
-    from app.models import Project, User  # noqa: F401
+    from app.models import Project, User, ProjectJob, ProjectWorkflowStep, IdempotencyKey, ProjectEvent, PooledRepository  # noqa: F401
 
     Base.metadata.create_all(bind=engine)
@@ -0,0 +1,337 @@
+"""
+Bounded thread pools for blocking work called from async code.
+
+Workflows are coroutines, but template rendering, PyGithub calls and the git
+subprocesses in ``push_files`` are synchronous. Running them on the event loop
+freezes every other request, so they are dispatched to named, size-limited
+pools instead::
+
+    from app.core.executors import run_blocking
+
+    rendered_path = await run_blocking("render", template_engine.render_template, ...)
+
+Each pool exports its queue depth, busy workers and queue wait time (see
+``app.core.metrics``) so saturation is visible before it turns into latency.
+
+CPU-bound stages (OpenAPI validation and code generation, cookiecutter renders)
+hold the GIL and slow down every thread of the process, so they run in the
+``cpu`` process pool instead when ``process_pool_enabled`` is set::
+
+    spec = await run_cpu_bound(openapi_generator.validate_spec, content, "yaml")
+
+Its workers are forked from a server process that has already imported the
+heavy libraries (``process_pool_preload``), and every job runs under a
+wall-clock limit and each worker under an address-space limit. ``fn`` and its
+arguments and result must be picklable.
+"""
+import asyncio
+import functools
+import importlib
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from app.core.config import settings
+from app.core.metrics import (
+    executor_active_workers,
+    executor_max_workers,
+    executor_queue_depth,
+    executor_queue_wait,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BlockingExecutor:
+    """A named ``ThreadPoolExecutor`` that reports queue depth and saturation."""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"idp-{name}")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        executor_max_workers.labels(pool=name).set(max_workers)
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking callable in the pool and await its result.
+
+        Args:
+            fn: Synchronous callable.
+            *args: Positional arguments for ``fn``.
+            **kwargs: Keyword arguments for ``fn``.
+
+        Returns:
+            Whatever ``fn`` returns; exceptions propagate to the caller.
+        """
+        submitted = time.monotonic()
+        self._update(queued=1)
+
+        def task():
+            executor_queue_wait.labels(pool=self.name).observe(time.monotonic() - submitted)
+            self._update(queued=-1, active=1)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._update(active=-1)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, task)
+
+    def _update(self, queued: int = 0, active: int = 0):
+        with self._lock:
+            self._queued += queued
+            self._active += active
+            executor_queue_depth.labels(pool=self.name).set(self._queued)
+            executor_active_workers.labels(pool=self.name).set(self._active)
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the underlying thread pool."""
+        self._pool.shutdown(wait=wait)
+
+
+class ProcessJobTimeout(Exception):
+    """Raised when a job in the ``cpu`` process pool exceeds its wall-clock limit."""
+
+
+def _process_start_time(pid: int) -> Optional[str]:
+    """Start time of a process (clock ticks since boot), None where ``/proc`` is unavailable."""
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            # The command name may contain spaces; fields after it are fixed
+            return stat.read().rsplit(")", 1)[1].split()[19]
+    except (OSError, IndexError):
+        return None
+
+
+def _init_process(preload: Tuple[str, ...], max_memory_mb: int, workers):
+    """Initializer of ``cpu`` pool workers: register, import the heavy libraries, then cap memory."""
+    # The parent handles Ctrl+C and shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    workers.put((os.getpid(), _process_start_time(os.getpid())))
+    for module in preload:
+        importlib.import_module(module)
+    if resource is not None and max_memory_mb > 0:
+        limit = max_memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _on_alarm(signum, frame):
+    raise ProcessJobTimeout("Job exceeded its time limit")
+
+
+def _run_job(fn: Callable, args: tuple, kwargs: dict, timeout: float) -> Tuple[float, Any]:
+    """Run a job in a pool worker under an interval timer; returns (start time, result)."""
+    started = time.time()
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return started, fn(*args, **kwargs)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class ProcessExecutor(BlockingExecutor):
+    """
+    A ``ProcessPoolExecutor`` for CPU-bound jobs, reporting the same metrics as
+    the thread pools.
+
+    Jobs that ignore the in-worker timer (stuck in C code) are caught by a
+    deadline in the parent, which replaces the pool; jobs running in the
+    killed workers fail with ``BrokenProcessPool``.
+    """
+
+    # Margin for the in-worker timer to fire before the parent gives up on a job
+    TIMEOUT_GRACE_SECONDS = 5.0
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._in_flight = 0
+        self._pool, self._workers = self._create_pool()
+        self._pids: Dict[int, Optional[str]] = {}  # Worker pid -> start time, of the current pool
+        executor_max_workers.labels(pool=name).set(max_workers)
+
+    def _create_pool(self) -> Tuple[ProcessPoolExecutor, Any]:
+        """Create a pool and the queue its workers register their (pid, start time) on."""
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        preload = tuple(module.strip() for module in settings.process_pool_preload.split(",") if module.strip())
+        if context.get_start_method() == "forkserver":
+            # Imported once in the fork server, so new workers start with them loaded
+            context.set_forkserver_preload(list(preload))
+        workers = context.SimpleQueue()
+        pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=context,
+            initializer=_init_process,
+            initargs=(preload, settings.process_pool_max_memory_mb, workers),
+            max_tasks_per_child=settings.process_pool_max_tasks_per_child or None,
+        )
+        return pool, workers
+
+    def call(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run a job in the pool and wait for its result (from a thread).
+
+        Args:
+            fn: Picklable callable, such as a module-level function or a method
+                of a stateless service.
+            *args: Positional arguments for ``fn``.
+            timeout: Wall-clock limit in seconds; defaults to ``process_pool_job_timeout_seconds``.
+            **kwargs: Keyword arguments for ``fn``.
+
+        Returns:
+            Whatever ``fn`` returns; exceptions propagate to the caller.
+
+        Raises:
+            ProcessJobTimeout: If the job exceeded its time limit.
+            MemoryError: If the job exceeded ``process_pool_max_memory_mb``.
+        """
+        timeout = timeout or settings.process_pool_job_timeout_seconds
+        submitted = time.time()
+        self._track(1)
+        self._collect_workers()
+        try:
+            future = self._pool.submit(_run_job, fn, args, kwargs, timeout)
+            try:
+                started, result = future.result(timeout=timeout + self.TIMEOUT_GRACE_SECONDS)
+            except FutureTimeoutError:
+                self._recycle()
+                raise ProcessJobTimeout(f"Job {getattr(fn, '__qualname__', fn)} did not finish in {timeout}s")
+        finally:
+            self._track(-1)
+        executor_queue_wait.labels(pool=self.name).observe(max(started - submitted, 0.0))
+        return result
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a job in the pool and await its result; see ``call``."""
+        # The waiting happens on a thread, so a stuck job cannot block the event loop
+        return await asyncio.to_thread(self.call, fn, *args, **kwargs)
+
+    def _track(self, delta: int):
+        """Derive queued and busy workers from the number of jobs in flight."""
+        with self._lock:
+            self._in_flight += delta
+            self._active = min(self._in_flight, self.max_workers)
+            self._queued = self._in_flight - self._active
+            executor_queue_depth.labels(pool=self.name).set(self._queued)
+            executor_active_workers.labels(pool=self.name).set(self._active)
+
+    def _collect_workers(self) -> Dict[int, Optional[str]]:
+        """
+        Read the registrations of new workers and forget workers that exited.
+
+        Called for every job, so the registration pipe never fills up as
+        workers are replaced after ``max_tasks_per_child`` jobs.
+        """
+        with self._lock:
+            if self._workers.empty():
+                return dict(self._pids)
+            while not self._workers.empty():
+                pid, started = self._workers.get()
+                self._pids[pid] = started
+            # A pid whose start time changed is gone (and possibly reused)
+            self._pids = {
+                pid: started for pid, started in self._pids.items()
+                if _process_start_time(pid) == started
+            }
+            return dict(self._pids)
+
+    def _recycle(self):
+        """Replace the pool, killing its workers (one of them is stuck)."""
+        pids = self._collect_workers()
+        with self._lock:
+            pool, workers = self._pool, self._workers
+            self._pool, self._workers = self._create_pool()
+            self._pids = {}
+        logger.error(f"Replacing the '{self.name}' process pool after a job overran its time limit")
+        for pid, started in pids.items():
+            # Only kill processes that are still the worker that registered
+            if _process_start_time(pid) != started:
+                continue
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        pool.shutdown(wait=False, cancel_futures=True)
+        workers.close()
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the worker processes."""
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+
+
+# Pool name -> size; GitHub calls are I/O bound and tolerate more threads than rendering
+_POOL_SIZES = {
+    "render": lambda: settings.render_executor_workers,
+    "github": lambda: settings.github_executor_workers,
+    "cpu": lambda: settings.process_pool_workers,
+}
+
+_executors: Dict[str, BlockingExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name: str) -> BlockingExecutor:
+    """
+    Get (creating on first use) the named blocking executor.
+
+    Args:
+        name: Pool name, one of ``render``, ``github`` or ``cpu`` (processes).
+
+    Returns:
+        The shared executor for that pool.
+    """
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                if name not in _POOL_SIZES:
+                    raise ValueError(f"Unknown executor pool '{name}'")
+                executor_class = ProcessExecutor if name == "cpu" else BlockingExecutor
+                executor = executor_class(name, _POOL_SIZES[name]())
+                _executors[name] = executor
+                logger.info(f"Started '{name}' executor with {executor.max_workers} workers")
+    return executor
+
+
+async def run_blocking(pool: str, fn: Callable, *args, **kwargs) -> Any:
+    """Run ``fn(*args, **kwargs)`` in the named pool without blocking the event loop."""
+    return await get_executor(pool).run(functools.partial(fn, *args, **kwargs))
+
+
+async def run_cpu_bound(fn: Callable, *args, **kwargs) -> Any:
+    """
+    Run a CPU-bound ``fn(*args, **kwargs)`` in the ``cpu`` process pool, or in
+    the ``render`` thread pool when ``process_pool_enabled`` is off.
+    """
+    if settings.process_pool_enabled:
+        return await get_executor("cpu").run(fn, *args, **kwargs)
+    return await run_blocking("render", fn, *args, **kwargs)
+
+
+def shutdown_executors(wait: bool = True):
+    """Shut down all executors (called on process shutdown)."""
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=wait)
+        _executors.clear()
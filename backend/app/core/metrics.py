@@ -7,8 +7,26 @@ Metrics exposed at ``/metrics``:
 - ``http_requests_total`` – Counter of total HTTP requests.
 - ``project_creation_total`` – Counter of project creation attempts by outcome.
 - ``external_api_call_duration_seconds`` – Histogram of outbound API call durations.
-- ``external_api_calls_total`` – Counter of outbound API calls by outcome.
+- ``external_api_calls_total`` – Counter of outbound API calls by outcome and attempt number (``attempt > 1`` are retries).
 - ``background_tasks_active`` – Gauge of currently running background tasks.
+- ``workflow_queue_depth`` – Gauge of queued workflow jobs (set by workers; aggregate with ``max``).
+- ``workflow_jobs_running`` – Gauge of workflow jobs running across all workers (set by workers; aggregate with ``max``).
+- ``workflow_queue_wait_seconds`` – Histogram of time jobs wait in the queue before a worker claims them, by priority class.
+- ``workflow_step_duration_seconds`` – Histogram of workflow step durations by step, template and outcome.
+- ``workflow_admission_rejected_total`` – Counter of create requests rejected with 429, by reason.
+- ``repo_pool_claims_total`` – Counter of repository pool claims by outcome (``hit``, ``miss``).
+- ``repo_pool_ready`` – Gauge of pre-provisioned repositories ready to be claimed.
+- ``repo_pool_target_size`` – Gauge of the pool size the filler aims for.
+- ``render_cache_requests_total`` – Counter of render cache lookups by outcome (``hit``, ``miss``).
+- ``render_cache_bytes`` – Gauge of the size of the on-disk render cache.
+- ``codegen_cache_requests_total`` – Counter of OpenAPI codegen cache lookups by outcome (``memory``, ``disk``, ``miss``).
+- ``staging_bytes`` – Gauge of the size of the render staging area (``temp_dir``).
+- ``staging_files`` – Gauge of the number of files in the render staging area.
+- ``staging_directories_removed_total`` – Counter of staging directories removed by the janitor, by reason.
+- ``executor_queue_depth`` – Gauge of blocking calls waiting for a pool thread.
+- ``executor_active_workers`` – Gauge of busy threads per pool.
+- ``executor_max_workers`` – Gauge of configured threads per pool (saturation = active / max).
+- ``executor_queue_wait_seconds`` – Histogram of time blocking calls spend queued.
 """
 import time
 from contextlib import contextmanager
@@ -47,6 +65,114 @@ background_tasks_active = Gauge(
     documentation="Number of currently active background tasks",
 )
 
+workflow_queue_depth = Gauge(
+    name="workflow_queue_depth",
+    documentation="Number of workflow jobs waiting to be claimed by a worker",
+)
+
+workflow_jobs_running = Gauge(
+    name="workflow_jobs_running",
+    documentation="Number of workflow jobs running across all workers",
+)
+
+workflow_queue_wait = Histogram(
+    name="workflow_queue_wait_seconds",
+    documentation="Time workflow jobs spend queued before a worker claims them",
+    labelnames=["priority"],
+    buckets=[0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0],
+)
+
+workflow_step_duration = Histogram(
+    name="workflow_step_duration_seconds",
+    documentation="Duration of project workflow steps (render, codegen, create_repo, push, argocd)",
+    labelnames=["step", "template_type", "outcome"],
+    buckets=[0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0],
+)
+
+workflow_admission_rejected_total = Counter(
+    name="workflow_admission_rejected_total",
+    documentation="Project creation requests rejected by admission control",
+    labelnames=["reason"],
+)
+
+repo_pool_claims_total = Counter(
+    name="repo_pool_claims_total",
+    documentation="Repository pool claims by workflows, by outcome (hit: placeholder renamed, miss: repository created)",
+    labelnames=["outcome"],
+)
+
+repo_pool_ready = Gauge(
+    name="repo_pool_ready",
+    documentation="Pre-provisioned GitHub repositories ready to be claimed",
+)
+
+repo_pool_target_size = Gauge(
+    name="repo_pool_target_size",
+    documentation="Number of pre-provisioned repositories the pool filler aims for",
+)
+
+render_cache_requests_total = Counter(
+    name="render_cache_requests_total",
+    documentation="Render cache lookups, by outcome (hit: rendered tree reused, miss: template rendered)",
+    labelnames=["outcome"],
+)
+
+render_cache_bytes = Gauge(
+    name="render_cache_bytes",
+    documentation="Size of the rendered trees in the on-disk render cache",
+)
+
+codegen_cache_requests_total = Counter(
+    name="codegen_cache_requests_total",
+    documentation="OpenAPI code generation cache lookups, by outcome (memory or disk hit, miss: code generated)",
+    labelnames=["outcome"],
+)
+
+staging_bytes = Gauge(
+    name="staging_bytes",
+    documentation="Size of the files in the render staging area",
+)
+
+staging_files = Gauge(
+    name="staging_files",
+    documentation="Number of files in the render staging area",
+)
+
+staging_directories_removed_total = Counter(
+    name="staging_directories_removed_total",
+    documentation="Staging directories removed by the janitor, by reason (expired: older than the TTL, orphaned: owner process gone)",
+    labelnames=["reason"],
+)
+
+# ---------------------------------------------------------------------------
+# Blocking-call executors (see app.core.executors)
+# ---------------------------------------------------------------------------
+
+executor_queue_depth = Gauge(
+    name="executor_queue_depth",
+    documentation="Number of blocking calls waiting for a free executor thread",
+    labelnames=["pool"],
+)
+
+executor_active_workers = Gauge(
+    name="executor_active_workers",
+    documentation="Number of executor threads currently running a blocking call",
+    labelnames=["pool"],
+)
+
+executor_max_workers = Gauge(
+    name="executor_max_workers",
+    documentation="Configured number of threads per executor pool",
+    labelnames=["pool"],
+)
+
+executor_queue_wait = Histogram(
+    name="executor_queue_wait_seconds",
+    documentation="Time blocking calls spend queued before an executor thread picks them up",
+    labelnames=["pool"],
+    buckets=[0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+)
+
 # ---------------------------------------------------------------------------
 # External API calls (GitHub, ArgoCD)
 # ---------------------------------------------------------------------------
@@ -61,15 +187,17 @@ external_api_call_duration = Histogram(
 external_api_calls_total = Counter(
     name="external_api_calls_total",
     documentation="Total number of calls to external APIs",
-    labelnames=["service", "operation", "status"],
+    labelnames=["service", "operation", "status", "attempt"],
 )
 
 
 @contextmanager
-def track_external_call(service: str, operation: str):
+def track_external_call(service: str, operation: str, attempt: int = 1):
     """
     Context manager that records duration and success/error for an external API call.
 
+    ``attempt`` numbers retries of the same call (see ``app.core.retry``).
+
     Works in both sync and async contexts — always use ``with``, never ``async with``.
 
     Usage::
@@ -90,5 +218,5 @@ def track_external_call(service: str, operation: str):
             duration
         )
         external_api_calls_total.labels(
-            service=service, operation=operation, status=status
+            service=service, operation=operation, status=status, attempt=str(attempt)
         ).inc()
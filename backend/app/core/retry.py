@@ -0,0 +1,208 @@
+"""
+Retry policy for calls to external APIs (GitHub, ArgoCD).
+
+GitHub answers with the odd 502 and ArgoCD times out while it is busy syncing;
+neither should fail a whole project workflow. Service methods wrap their raw API
+calls in ``call_with_retry`` / ``async_call_with_retry``, which retry transient
+failures with capped exponential backoff and full jitter::
+
+    repo = call_with_retry("github", "create_repository", self.org.create_repo, name=repo_name)
+
+Every attempt is recorded through ``track_external_call`` with its attempt
+number, so ``external_api_calls_total{attempt!="1"}`` shows how often retries
+were needed. Only errors classified by ``is_retryable`` are retried; anything
+else (bad credentials, validation errors, 404s) is raised on the first attempt.
+"""
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+import httpx
+import requests
+from github import GithubException
+
+from app.core.config import settings
+from app.core.metrics import track_external_call
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class TransientError(Exception):
+    """Raised by service code to mark a failure as safe to retry (e.g. a dropped git push)."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Backoff parameters for retrying transient failures."""
+
+    max_attempts: int
+    base_delay: float
+    max_delay: float
+
+    @classmethod
+    def from_settings(cls) -> "RetryPolicy":
+        """Build the default policy from application settings."""
+        return cls(
+            max_attempts=settings.external_retry_max_attempts,
+            base_delay=settings.external_retry_base_delay_seconds,
+            max_delay=settings.external_retry_max_delay_seconds,
+        )
+
+    def delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """
+        Seconds to wait after a failed attempt.
+
+        Uses full jitter (a random delay up to the exponential backoff), so
+        workflows hit by the same outage do not retry in lockstep. A server
+        supplied ``Retry-After`` is honoured as a lower bound, capped at
+        ``max_delay``.
+
+        Args:
+            attempt: Number of the attempt that just failed (1-based).
+            error: The error that failed it.
+
+        Returns:
+            Delay in seconds.
+        """
+        backoff = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        delay = random.uniform(0, backoff)
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    if isinstance(error, GithubException):
+        return error.status
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code
+    return None
+
+
+def _retry_after(error: Optional[BaseException]) -> Optional[float]:
+    headers = None
+    if isinstance(error, GithubException):
+        headers = error.headers
+    elif isinstance(error, httpx.HTTPStatusError):
+        headers = error.response.headers
+    if not headers:
+        return None
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Classify an error as transient.
+
+    Transient errors are timeouts and connection failures, HTTP 408/429/5xx
+    responses from GitHub or ArgoCD, GitHub's rate-limit 403s, and
+    ``TransientError``.
+
+    Args:
+        error: The error raised by an external call.
+
+    Returns:
+        True if the call may succeed when repeated.
+    """
+    if isinstance(error, TransientError):
+        return True
+    if isinstance(error, (httpx.TimeoutException, httpx.TransportError)):
+        return True
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    status = _status_code(error)
+    if status == 403 and isinstance(error, GithubException):
+        # Secondary (Retry-After) and primary (remaining quota 0) rate limits
+        headers = error.headers or {}
+        return "retry-after" in {key.lower() for key in headers} or headers.get("x-ratelimit-remaining") == "0"
+    return status is not None and status in RETRYABLE_STATUS_CODES
+
+
+def call_with_retry(
+    service: str,
+    operation: str,
+    fn: Callable[..., T],
+    *args: Any,
+    policy: Optional[RetryPolicy] = None,
+    **kwargs: Any,
+) -> T:
+    """
+    Call a blocking external API function, retrying transient failures.
+
+    Sleeps between attempts, so only call it from worker threads (see
+    ``app.core.executors``), never from the event loop.
+
+    Args:
+        service: Service name for metrics (``github``, ``argocd``).
+        operation: Operation name for metrics.
+        fn: Function performing the call.
+        *args: Positional arguments for ``fn``.
+        policy: Retry policy, defaults to the configured one.
+        **kwargs: Keyword arguments for ``fn``.
+
+    Returns:
+        The result of ``fn``.
+
+    Raises:
+        Exception: The last error, once it is not retryable or attempts ran out.
+    """
+    policy = policy or RetryPolicy.from_settings()
+    attempt = 1
+    while True:
+        try:
+            with track_external_call(service, operation, attempt=attempt):
+                return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt >= policy.max_attempts or not is_retryable(e):
+                raise
+            delay = policy.delay(attempt, e)
+            logger.warning(
+                f"{service} {operation} failed (attempt {attempt}/{policy.max_attempts}), "
+                f"retrying in {delay:.2f}s: {e}"
+            )
+            time.sleep(delay)
+            attempt += 1
+
+
+async def async_call_with_retry(
+    service: str,
+    operation: str,
+    fn: Callable[..., Awaitable[T]],
+    *args: Any,
+    policy: Optional[RetryPolicy] = None,
+    **kwargs: Any,
+) -> T:
+    """
+    Await an external API coroutine function, retrying transient failures.
+
+    Same as ``call_with_retry``, but ``fn`` is called anew for every attempt and
+    the backoff uses ``asyncio.sleep``.
+    """
+    policy = policy or RetryPolicy.from_settings()
+    attempt = 1
+    while True:
+        try:
+            with track_external_call(service, operation, attempt=attempt):
+                return await fn(*args, **kwargs)
+        except Exception as e:
+            if attempt >= policy.max_attempts or not is_retryable(e):
+                raise
+            delay = policy.delay(attempt, e)
+            logger.warning(
+                f"{service} {operation} failed (attempt {attempt}/{policy.max_attempts}), "
+                f"retrying in {delay:.2f}s: {e}"
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
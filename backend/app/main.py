@@ -1,6 +1,7 @@
 """
 Main FastAPI application entry point.
 """
+import asyncio
 import logging
 import time
 import uuid
@@ -13,9 +14,12 @@ from starlette.middleware.sessions import SessionMiddleware
 
 from app.core.config import settings
 from app.core.database import init_db
+from app.core.executors import shutdown_executors
 from app.core.logging import setup_logging
 from app.core.metrics import http_request_duration, http_requests_total
 from app.middleware.request_id import request_id_var
+from app.services.template_engine import template_engine
+from app.services.template_watcher import template_watcher
 from app.api.v1 import projects, templates, auth, analytics, health
 
 # Configure structured JSON logging
@@ -106,13 +110,39 @@ app.add_middleware(
 )
 
 
+embedded_worker = None
+
+
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup."""
+    """Initialize database and the embedded workflow worker on startup."""
+    global embedded_worker
+
     logger.info("Initializing database...")
     init_db()
     logger.info("Database initialized successfully")
 
+    # Build the template catalog now rather than on the first request
+    template_engine.catalog()
+    if settings.template_hot_reload:
+        template_watcher.start()
+
+    if settings.embedded_worker_enabled:
+        from app.worker import Worker
+
+        embedded_worker = Worker()
+        app.state.embedded_worker_task = asyncio.create_task(embedded_worker.run())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the embedded worker, letting in-flight workflows finish."""
+    if embedded_worker is not None:
+        embedded_worker.stop()
+        await app.state.embedded_worker_task
+    template_watcher.stop()
+    shutdown_executors(wait=False)
+
 
 # --- Observability endpoint ---
 
@@ -61,6 +61,22 @@ async def get_current_user(
     return user
 
 
+def is_ui_session(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> bool:
+    """
+    Dependency telling whether the request comes from a web UI session.
+
+    Args:
+        credentials: Bearer token from Authorization header
+
+    Returns:
+        True if the access token was issued to a login from the web UI
+    """
+    payload = verify_token(credentials.credentials, expected_type="access")
+    return payload.get("session") == "ui"
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -3,5 +3,10 @@ SQLAlchemy models for the application.
 """
 from app.models.project import Project
 from app.models.user import User
+from app.models.job import ProjectJob
+from app.models.workflow_step import ProjectWorkflowStep
+from app.models.idempotency import IdempotencyKey
+from app.models.project_event import ProjectEvent
+from app.models.repo_pool import PooledRepository
 
-__all__ = ["Project", "User"]
+__all__ = ["Project", "User", "ProjectJob", "ProjectWorkflowStep", "IdempotencyKey", "ProjectEvent", "PooledRepository"]
@@ -0,0 +1,33 @@
+"""
+SQLAlchemy models for idempotent request handling.
+"""
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Text, Integer, ForeignKey, Index, UniqueConstraint
+
+from app.core.database import Base
+
+
+class IdempotencyKey(Base):
+    """Stored response of a create request, replayed when the client repeats its Idempotency-Key."""
+
+    __tablename__ = "idempotency_keys"
+
+    __table_args__ = (
+        UniqueConstraint('user_id', 'key', name='uq_idempotency_user_key'),
+        Index('idx_idempotency_expires', 'expires_at'),
+    )
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    key = Column(String(255), nullable=False)
+    endpoint = Column(String(100), nullable=False)
+    request_hash = Column(String(64), nullable=False)  # SHA-256 of the request, to detect reused keys
+    response_status = Column(Integer, nullable=False)
+    response_body = Column(Text, nullable=False)  # JSON-encoded response
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<IdempotencyKey(user_id={self.user_id}, key={self.key}, endpoint={self.endpoint})>"
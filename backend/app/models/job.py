@@ -0,0 +1,46 @@
+"""
+SQLAlchemy models for background jobs.
+"""
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Text, Integer, ForeignKey, Index
+
+from app.core.database import Base
+
+
+class ProjectJob(Base):
+    """Durable unit of background work for a project, claimed by idp-worker processes."""
+
+    __tablename__ = "project_jobs"
+
+    __table_args__ = (
+        Index('idx_jobs_status_created', 'status', 'created_at'),
+        Index('idx_jobs_project', 'project_id'),
+        Index('idx_jobs_user_status', 'user_id', 'status'),
+        Index('idx_jobs_status_priority', 'status', 'priority', 'created_at'),
+    )
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    project_id = Column(String(36), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(String(36), nullable=True)  # Owner of the project, for per-user fairness
+    kind = Column(String(50), nullable=False)
+    # Kind values: create_project, create_openapi_project, create_camel_yaml_project, delete_project
+    payload = Column(Text, nullable=False, default="{}")  # JSON-encoded workflow arguments
+    status = Column(String(20), nullable=False, default="queued")
+    # Status values: queued, running, succeeded, failed, cancelled
+    priority = Column(String(20), nullable=False, default="interactive")
+    # Priority values: interactive (UI requests), bulk (batches and automation)
+    attempts = Column(Integer, nullable=False, default=0)
+    locked_by = Column(String(255), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    error_message = Column(Text, nullable=True)
+    batch_id = Column(String(36), nullable=True, index=True)  # Set for jobs created by POST /projects/batch
+    batch_limit = Column(Integer, nullable=True)  # Max running jobs of the same batch
+    cancel_requested_at = Column(DateTime, nullable=True)  # Set by POST /projects/{id}/cancel
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<ProjectJob(id={self.id}, kind={self.kind}, status={self.status})>"
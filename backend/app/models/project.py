@@ -31,7 +31,7 @@ class Project(Base):
     github_repo_name = Column(String(255), nullable=True)
     argocd_app_name = Column(String(255), nullable=True)
     status = Column(String(50), nullable=False, default="pending")
-    # Status values: pending, creating_repo, building, deploying, active, failed
+    # Status values: pending, creating_repo, building, deploying, active, failed, cancelled, deleting
     error_message = Column(Text, nullable=True)
     openapi_spec_stored = Column(Text, nullable=True)
 
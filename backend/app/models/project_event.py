@@ -0,0 +1,30 @@
+"""
+SQLAlchemy models for project status events.
+"""
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Text, Integer, Index
+
+from app.core.database import Base
+
+
+class ProjectEvent(Base):
+    """A project status transition, streamed to clients by the events endpoints."""
+
+    __tablename__ = "project_events"
+
+    __table_args__ = (
+        Index('idx_events_user_id', 'user_id', 'id'),
+        Index('idx_events_project_id', 'project_id', 'id'),
+    )
+
+    # Monotonic id, used as the SSE event id for resuming with Last-Event-ID
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # No foreign key: the final ``deleted`` event outlives its project
+    project_id = Column(String(36), nullable=False)
+    user_id = Column(String(36), nullable=False)  # Owner of the project, for per-user streams
+    status = Column(String(50), nullable=False)
+    error_message = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ProjectEvent(id={self.id}, project_id={self.project_id}, status={self.status})>"
@@ -0,0 +1,28 @@
+"""
+SQLAlchemy models for the pre-provisioned GitHub repository pool.
+"""
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Index
+
+from app.core.database import Base
+
+
+class PooledRepository(Base):
+    """Empty placeholder repository kept ready to be renamed into a new project's repository."""
+
+    __tablename__ = "repo_pool"
+
+    __table_args__ = (
+        Index('idx_repo_pool_status_created', 'status', 'created_at'),
+    )
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    repo_name = Column(String(255), unique=True, nullable=False)
+    status = Column(String(20), nullable=False, default="provisioning")
+    # Status values: provisioning (being created on GitHub), ready, claimed (being renamed for a project)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    claimed_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<PooledRepository(repo_name={self.repo_name}, status={self.status})>"
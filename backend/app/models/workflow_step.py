@@ -0,0 +1,30 @@
+"""
+SQLAlchemy models for workflow step checkpoints.
+"""
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, UniqueConstraint
+
+from app.core.database import Base
+
+
+class ProjectWorkflowStep(Base):
+    """Latest run of one workflow step for a project, used to resume failed workflows and for timelines."""
+
+    __tablename__ = "project_workflow_steps"
+
+    __table_args__ = (
+        UniqueConstraint('project_id', 'step', name='uq_project_step'),
+    )
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    project_id = Column(String(36), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    step = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, default="completed")
+    # Status values: completed, failed, compensated
+    output = Column(Text, nullable=True)  # JSON-encoded step output needed by later steps
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, default=datetime.utcnow, nullable=True)  # When the step finished
+
+    def __repr__(self):
+        return f"<ProjectWorkflowStep(project_id={self.project_id}, step={self.step}, status={self.status})>"
@@ -2,7 +2,7 @@
 Pydantic schemas for project API requests and responses.
 """
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Literal
 from pydantic import BaseModel, Field, validator
 
 
@@ -86,3 +86,67 @@ class ProjectListResponse(BaseModel):
     page_size: int
     total_pages: int
     projects: list[ProjectResponse]
+
+
+class ProjectBatchCreate(BaseModel):
+    """Schema for creating many projects in one request."""
+    projects: list[ProjectCreate] = Field(..., min_length=1, description="Projects to create")
+    max_concurrency: Optional[int] = Field(
+        None, ge=1, description="Maximum number of this batch's workflows running at once"
+    )
+
+
+class ProjectBatchItemResult(BaseModel):
+    """Per-item outcome of a batch create request."""
+    name: str
+    status: Literal["accepted", "rejected"]
+    project: Optional[ProjectResponse] = None
+    error: Optional[str] = None
+
+
+class ProjectBatchResponse(BaseModel):
+    """Schema for batch create response."""
+    batch_id: str
+    accepted: int
+    rejected: int
+    results: list[ProjectBatchItemResult]
+
+
+class ProjectBatchDelete(BaseModel):
+    """Schema for deleting many projects in one request."""
+    project_ids: list[str] = Field(..., min_length=1, description="Projects to delete")
+    max_concurrency: Optional[int] = Field(
+        None, ge=1, description="Maximum number of this batch's deletions running at once"
+    )
+
+
+class ProjectBatchDeleteItemResult(BaseModel):
+    """Per-item outcome of a batch delete request."""
+    project_id: str
+    status: Literal["accepted", "rejected"]
+    error: Optional[str] = None
+
+
+class ProjectBatchDeleteResponse(BaseModel):
+    """Schema for batch delete response."""
+    batch_id: str
+    accepted: int
+    rejected: int
+    results: list[ProjectBatchDeleteItemResult]
+
+
+class ProjectTimelineStep(BaseModel):
+    """Timing of one workflow step."""
+    step: str
+    status: str
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+
+
+class ProjectTimelineResponse(BaseModel):
+    """Schema for a project's workflow timeline."""
+    project_id: str
+    status: str
+    created_at: datetime
+    steps: list[ProjectTimelineStep]
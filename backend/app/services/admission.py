@@ -0,0 +1,72 @@
+"""
+Admission control for project creation.
+
+Workers already bound how many workflows run at once (see ``JobQueue.claim``);
+this module bounds how much work may wait. When the queue backlog, overall or
+for the requesting user, would exceed its threshold, the create endpoints turn
+the request away with 429 instead of queueing work that would only finish long
+after the client gave up, and which would burn the shared GitHub rate limit.
+
+Interactive requests are held against the interactive backlog only, so a large
+bulk migration filling the queue does not turn away developers using the UI.
+"""
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import workflow_admission_rejected_total
+from app.services.job_queue import job_queue
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a creation request would overload the workflow queue."""
+
+    def __init__(self, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Decides whether new workflows may be queued."""
+
+    def check(self, db: Session, user_id: str, count: int = 1, priority: str = "interactive"):
+        """
+        Admit ``count`` new workflows for a user.
+
+        Args:
+            db: Database session.
+            user_id: User requesting the workflows.
+            count: Number of workflows the request would queue.
+            priority: Priority class of the workflows.
+
+        Raises:
+            AdmissionRejected: If the overall or per-user backlog is over its limit.
+        """
+        # Bulk requests count the whole queue, interactive ones only the interactive lane
+        lane = "interactive" if priority == "interactive" else None
+        queued, queued_for_user = job_queue.backlog(db, user_id, priority=lane)
+
+        if queued_for_user + count > settings.admission_max_queued_per_user:
+            workflow_admission_rejected_total.labels(reason="user_backlog").inc()
+            logger.warning(f"Admission rejected for user {user_id}: {queued_for_user} jobs queued")
+            raise AdmissionRejected(
+                f"You have {queued_for_user} projects waiting to be created. "
+                "Please retry once some of them have started.",
+                settings.admission_retry_after_seconds,
+            )
+
+        if queued + count > settings.admission_max_queued_jobs:
+            workflow_admission_rejected_total.labels(reason="global_backlog").inc()
+            logger.warning(f"Admission rejected: {queued} jobs queued ({priority} request)")
+            raise AdmissionRejected(
+                "The platform is busy creating other projects. Please retry shortly.",
+                settings.admission_retry_after_seconds,
+            )
+
+
+# Global instance
+admission_controller = AdmissionController()
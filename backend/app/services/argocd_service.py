@@ -6,7 +6,7 @@ import httpx
 from typing import Optional, Dict
 
 from app.core.config import settings
-from app.core.metrics import track_external_call
+from app.core.retry import async_call_with_retry
 
 logger = logging.getLogger(__name__)
 
@@ -51,20 +51,22 @@ class ArgoCDService:
         if self.token and not force_refresh:
             return self.token
 
-        with track_external_call("argocd", "authenticate"):
+        async def authenticate() -> str:
             async with httpx.AsyncClient(verify=self.verify_ssl) as client:
-                try:
-                    response = await client.post(
-                        f"{self.base_url}/api/v1/session",
-                        json={"username": self.username, "password": self.password}
-                    )
-                    response.raise_for_status()
-                    self.token = response.json()["token"]
-                    logger.info("Successfully authenticated with ArgoCD")
-                    return self.token
-                except Exception as e:
-                    logger.error(f"Failed to authenticate with ArgoCD: {e}")
-                    raise Exception(f"ArgoCD authentication failed: {e}")
+                response = await client.post(
+                    f"{self.base_url}/api/v1/session",
+                    json={"username": self.username, "password": self.password}
+                )
+                response.raise_for_status()
+                return response.json()["token"]
+
+        try:
+            self.token = await async_call_with_retry("argocd", "authenticate", authenticate)
+            logger.info("Successfully authenticated with ArgoCD")
+            return self.token
+        except Exception as e:
+            logger.error(f"Failed to authenticate with ArgoCD: {e}")
+            raise Exception(f"ArgoCD authentication failed: {e}")
 
     async def create_application(
         self,
@@ -127,44 +129,47 @@ class ArgoCDService:
                 ]
             }
 
-        with track_external_call("argocd", "create_application"):
+        async def create(bearer: str) -> Dict:
             async with httpx.AsyncClient(verify=self.verify_ssl) as client:
-                try:
-                    logger.info(f"Creating ArgoCD application: {app_name}")
-
-                    response = await client.post(
-                        f"{self.base_url}/api/v1/applications",
-                        json=application,
-                        headers={"Authorization": f"Bearer {token}"}
-                    )
-                    response.raise_for_status()
-
-                    logger.info(f"ArgoCD application created: {app_name}")
-                    return response.json()
-
-                except httpx.HTTPStatusError as e:
-                    # Check if error is due to expired token (code 16 = Unauthenticated in gRPC)
-                    error_text = e.response.text
-                    if "token is expired" in error_text or "invalid session" in error_text or e.response.status_code == 401:
-                        logger.warning("ArgoCD token expired, refreshing and retrying...")
-                        self._invalidate_token()
-
-                        # Retry with fresh token
-                        new_token = await self._get_token(force_refresh=True)
-                        retry_response = await client.post(
-                            f"{self.base_url}/api/v1/applications",
-                            json=application,
-                            headers={"Authorization": f"Bearer {new_token}"}
-                        )
-                        retry_response.raise_for_status()
-                        logger.info(f"ArgoCD application created after token refresh: {app_name}")
-                        return retry_response.json()
-
-                    logger.error(f"Failed to create ArgoCD application: {error_text}")
-                    raise Exception(f"ArgoCD application creation failed: {error_text}")
-                except Exception as e:
-                    logger.error(f"Failed to create ArgoCD application: {e}")
-                    raise Exception(f"ArgoCD application creation failed: {e}")
+                # upsert makes a repeated create (after a timed-out attempt) succeed
+                # instead of failing because the application already exists
+                response = await client.post(
+                    f"{self.base_url}/api/v1/applications",
+                    params={"upsert": "true"},
+                    json=application,
+                    headers={"Authorization": f"Bearer {bearer}"}
+                )
+                response.raise_for_status()
+                return response.json()
+
+        try:
+            logger.info(f"Creating ArgoCD application: {app_name}")
+            try:
+                result = await async_call_with_retry("argocd", "create_application", create, token)
+            except httpx.HTTPStatusError as e:
+                # Check if error is due to expired token (code 16 = Unauthenticated in gRPC)
+                error_text = e.response.text
+                if "token is expired" in error_text or "invalid session" in error_text or e.response.status_code == 401:
+                    logger.warning("ArgoCD token expired, refreshing and retrying...")
+                    self._invalidate_token()
+
+                    # Retry with fresh token
+                    new_token = await self._get_token(force_refresh=True)
+                    result = await async_call_with_retry("argocd", "create_application", create, new_token)
+                    logger.info(f"ArgoCD application created after token refresh: {app_name}")
+                    return result
+                raise
+
+            logger.info(f"ArgoCD application created: {app_name}")
+            return result
+
+        except httpx.HTTPStatusError as e:
+            error_text = e.response.text
+            logger.error(f"Failed to create ArgoCD application: {error_text}")
+            raise Exception(f"ArgoCD application creation failed: {error_text}")
+        except Exception as e:
+            logger.error(f"Failed to create ArgoCD application: {e}")
+            raise Exception(f"ArgoCD application creation failed: {e}")
 
     async def get_application(self, app_name: str) -> Optional[Dict]:
         """
@@ -178,29 +183,25 @@ class ArgoCDService:
         """
         token = await self._get_token()
 
-        with track_external_call("argocd", "get_application"):
+        async def fetch() -> Optional[Dict]:
             async with httpx.AsyncClient(verify=self.verify_ssl) as client:
-                try:
-                    response = await client.get(
-                        f"{self.base_url}/api/v1/applications/{app_name}",
-                        headers={"Authorization": f"Bearer {token}"}
-                    )
-
-                    if response.status_code == 404:
-                        return None
-
-                    response.raise_for_status()
-                    return response.json()
-
-                except httpx.HTTPStatusError as e:
-                    if e.response.status_code == 404:
-                        return None
-                    logger.error(f"Failed to get ArgoCD application: {e}")
-                    return None
-                except Exception as e:
-                    logger.error(f"Failed to get ArgoCD application: {e}")
+                response = await client.get(
+                    f"{self.base_url}/api/v1/applications/{app_name}",
+                    headers={"Authorization": f"Bearer {token}"}
+                )
+
+                if response.status_code == 404:
                     return None
 
+                response.raise_for_status()
+                return response.json()
+
+        try:
+            return await async_call_with_retry("argocd", "get_application", fetch)
+        except Exception as e:
+            logger.error(f"Failed to get ArgoCD application: {e}")
+            return None
+
     async def get_application_status(self, app_name: str) -> Optional[str]:
         """
         Get the sync status of an ArgoCD application.
@@ -224,20 +225,27 @@ class ArgoCDService:
             app_name: Name of the application.
         """
         token = await self._get_token()
+        attempts = 0
 
-        with track_external_call("argocd", "delete_application"):
+        async def delete():
+            nonlocal attempts
+            attempts += 1
             async with httpx.AsyncClient(verify=self.verify_ssl) as client:
-                try:
-                    response = await client.delete(
-                        f"{self.base_url}/api/v1/applications/{app_name}",
-                        headers={"Authorization": f"Bearer {token}"}
-                    )
-                    response.raise_for_status()
-                    logger.info(f"Deleted ArgoCD application: {app_name}")
-
-                except Exception as e:
-                    logger.error(f"Failed to delete ArgoCD application: {e}")
-                    raise Exception(f"ArgoCD application deletion failed: {e}")
+                response = await client.delete(
+                    f"{self.base_url}/api/v1/applications/{app_name}",
+                    headers={"Authorization": f"Bearer {token}"}
+                )
+                # An earlier attempt timed out after ArgoCD had already deleted the application
+                if response.status_code == 404 and attempts > 1:
+                    return
+                response.raise_for_status()
+
+        try:
+            await async_call_with_retry("argocd", "delete_application", delete)
+            logger.info(f"Deleted ArgoCD application: {app_name}")
+        except Exception as e:
+            logger.error(f"Failed to delete ArgoCD application: {e}")
+            raise Exception(f"ArgoCD application deletion failed: {e}")
 
     async def sync_application(self, app_name: str):
         """
@@ -248,19 +256,20 @@ class ArgoCDService:
         """
         token = await self._get_token()
 
-        with track_external_call("argocd", "sync_application"):
+        async def sync():
             async with httpx.AsyncClient(verify=self.verify_ssl) as client:
-                try:
-                    response = await client.post(
-                        f"{self.base_url}/api/v1/applications/{app_name}/sync",
-                        headers={"Authorization": f"Bearer {token}"}
-                    )
-                    response.raise_for_status()
-                    logger.info(f"Triggered sync for ArgoCD application: {app_name}")
-
-                except Exception as e:
-                    logger.error(f"Failed to sync ArgoCD application: {e}")
-                    raise Exception(f"ArgoCD application sync failed: {e}")
+                response = await client.post(
+                    f"{self.base_url}/api/v1/applications/{app_name}/sync",
+                    headers={"Authorization": f"Bearer {token}"}
+                )
+                response.raise_for_status()
+
+        try:
+            await async_call_with_retry("argocd", "sync_application", sync)
+            logger.info(f"Triggered sync for ArgoCD application: {app_name}")
+        except Exception as e:
+            logger.error(f"Failed to sync ArgoCD application: {e}")
+            raise Exception(f"ArgoCD application sync failed: {e}")
 
 
 # Global instance
@@ -0,0 +1,186 @@
+"""
+Cache of OpenAPI code generation output.
+
+``OpenAPIGeneratorService.generate_project`` is deterministic: its output
+depends only on the spec, the project name and port, and the generator itself.
+Workflow retries, and teams creating projects from the same contract, would
+otherwise validate the spec and run datamodel-code-generator again. The
+``(models_code, main_code, tests_code)`` tuple is cached under a hash of those
+inputs, including ``generator_version()`` so an upgrade of the generator or its
+templates never serves stale code.
+
+Entries live in an in-memory LRU bounded by ``codegen_cache_max_mb``. With
+``codegen_cache_dir`` set they are also written there as JSON files, shared by
+the API and worker processes and kept across restarts; that tier is evicted least
+recently used first (by file modification time, touched on hits) beyond
+``codegen_cache_disk_max_mb``.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import codegen_cache_requests_total
+
+logger = logging.getLogger(__name__)
+
+GeneratedCode = Tuple[str, str, str]  # (models_code, main_code, tests_code)
+
+
+def _size(code: GeneratedCode) -> int:
+    return sum(len(part) for part in code)
+
+
+class CodegenCache:
+    """Two-tier (memory, optional disk) LRU cache of generated OpenAPI project code."""
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, GeneratedCode]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def key(
+        self,
+        generator_version: str,
+        spec_content: str,
+        file_format: str,
+        project_name: str,
+        port: str
+    ) -> str:
+        """
+        Cache key of a code generation.
+
+        Args:
+            generator_version: ``generator_version()`` of the OpenAPI generator.
+            spec_content: Raw OpenAPI spec.
+            file_format: "yaml" or "json".
+            project_name: Name of the project.
+            port: Application port.
+
+        Returns:
+            Hex digest identifying the generated code.
+        """
+        digest = hashlib.sha256()
+        for part in (generator_version, file_format, project_name, str(port), spec_content):
+            encoded = part.encode("utf-8")
+            digest.update(len(encoded).to_bytes(8, "big") + encoded)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[GeneratedCode]:
+        """
+        Look up generated code, in memory first and then on disk.
+
+        Blocking when the disk tier is enabled; run it in an executor.
+
+        Args:
+            key: Cache key from ``key``.
+
+        Returns:
+            The cached ``(models_code, main_code, tests_code)``, or None.
+        """
+        with self._lock:
+            code = self._entries.get(key)
+            if code is not None:
+                self._entries.move_to_end(key)
+        if code is not None:
+            codegen_cache_requests_total.labels(outcome="memory").inc()
+            return code
+
+        code = self._read(key)
+        if code is None:
+            codegen_cache_requests_total.labels(outcome="miss").inc()
+            return None
+        codegen_cache_requests_total.labels(outcome="disk").inc()
+        self._remember(key, code)
+        return code
+
+    def put(self, key: str, code: GeneratedCode):
+        """
+        Store generated code in memory and, if enabled, on disk.
+
+        Args:
+            key: Cache key from ``key``.
+            code: ``(models_code, main_code, tests_code)``.
+        """
+        self._remember(key, code)
+        if settings.codegen_cache_dir:
+            self._write(key, code)
+
+    def _remember(self, key: str, code: GeneratedCode):
+        budget = settings.codegen_cache_max_mb * 1024 * 1024
+        if _size(code) > budget:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= _size(previous)
+            self._entries[key] = code
+            self._bytes += _size(code)
+            while self._bytes > budget:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= _size(evicted)
+
+    def _read(self, key: str) -> Optional[GeneratedCode]:
+        if not settings.codegen_cache_dir:
+            return None
+        path = Path(settings.codegen_cache_dir) / f"{key}.json"
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)
+            return data["models_code"], data["main_code"], data["tests_code"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable codegen cache entry {path}: {e}")
+            return None
+
+    def _write(self, key: str, code: GeneratedCode):
+        directory = Path(settings.codegen_cache_dir)
+        models_code, main_code, tests_code = code
+        staging = directory / f".tmp-{uuid.uuid4().hex}"
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            staging.write_text(
+                json.dumps({"models_code": models_code, "main_code": main_code, "tests_code": tests_code}),
+                encoding="utf-8",
+            )
+            os.replace(staging, directory / f"{key}.json")
+        except OSError as e:
+            logger.warning(f"Could not write codegen cache entry {key[:12]}: {e}")
+            staging.unlink(missing_ok=True)
+            return
+        self._evict_disk(directory)
+
+    def _evict_disk(self, directory: Path):
+        """Remove least recently used files until the disk tier fits its budget."""
+        entries = []
+        total = 0
+        for entry in os.scandir(directory):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        budget = settings.codegen_cache_disk_max_mb * 1024 * 1024
+        for _, size, path in sorted(entries):
+            if total <= budget:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+# Global instance
+codegen_cache = CodegenCache()
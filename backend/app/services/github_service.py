@@ -3,15 +3,34 @@ GitHub service for repository management.
 """
 import logging
 import base64
+import subprocess
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional, Set
 from github import Github, GithubException, Auth
 
 from app.core.config import settings
-from app.core.metrics import track_external_call
+from app.core.retry import TransientError, call_with_retry
 
 logger = logging.getLogger(__name__)
 
+# git stderr fragments that indicate a network problem or a GitHub outage rather
+# than a rejected push, so the push is worth repeating.
+TRANSIENT_GIT_ERRORS = (
+    "could not resolve host",
+    "failed to connect",
+    "connection timed out",
+    "connection reset",
+    "operation timed out",
+    "rpc failed",
+    "early eof",
+    "the remote end hung up unexpectedly",
+    "the requested url returned error: 5",
+    "the requested url returned error: 429",
+)
+
+# Items per page of paginated GitHub listings
+LISTING_PAGE_SIZE = 100
+
 
 class GitHubService:
     """Service for interacting with GitHub API."""
@@ -26,7 +45,9 @@ class GitHubService:
             return
 
         auth = Auth.Token(settings.github_token)
-        self.client = Github(auth=auth, base_url=settings.github_base_url)
+        # PyGithub's own retries are off: call_with_retry is the only retry layer,
+        # so external_api_calls_total counts every HTTP attempt
+        self.client = Github(auth=auth, base_url=settings.github_base_url, per_page=LISTING_PAGE_SIZE, retry=None)
         self.org_name = settings.github_org
 
         try:
@@ -67,31 +88,77 @@ class GitHubService:
         if not self.client:
             raise Exception("GitHub is not configured. Please set GITHUB_TOKEN and GITHUB_ORG environment variables.")
 
-        with track_external_call("github", "create_repository"):
-            try:
-                logger.info(f"Creating GitHub repository: {repo_name}")
-
-                if self.is_org:
-                    repo = self.org.create_repo(
-                        name=repo_name,
-                        description=description,
-                        private=private,
-                        auto_init=False
-                    )
-                else:
-                    repo = self.client.get_user().create_repo(
-                        name=repo_name,
-                        description=description,
-                        private=private,
-                        auto_init=False
-                    )
-
-                logger.info(f"Repository created: {repo.html_url}")
-                return repo.html_url, repo.clone_url
+        attempts = 0
 
+        def create():
+            nonlocal attempts
+            attempts += 1
+            owner = self.org if self.is_org else self.client.get_user()
+            try:
+                return owner.create_repo(
+                    name=repo_name,
+                    description=description,
+                    private=private,
+                    auto_init=False
+                )
             except GithubException as e:
-                logger.error(f"Failed to create repository: {e}")
-                raise Exception(f"GitHub API error: {e.data.get('message', str(e))}")
+                # An earlier attempt timed out after GitHub had already created the repository
+                if e.status == 422 and attempts > 1:
+                    logger.info(f"Repository {repo_name} was created by a previous attempt")
+                    return self.client.get_repo(f"{self.org_name}/{repo_name}")
+                raise
+
+        try:
+            logger.info(f"Creating GitHub repository: {repo_name}")
+            repo = call_with_retry("github", "create_repository", create)
+            logger.info(f"Repository created: {repo.html_url}")
+            return repo.html_url, repo.clone_url
+
+        except GithubException as e:
+            logger.error(f"Failed to create repository: {e}")
+            raise Exception(f"GitHub API error: {e.data.get('message', str(e))}")
+
+    def rename_repository(
+        self,
+        repo_name: str,
+        new_name: str,
+        description: str = "",
+        private: bool = False
+    ) -> tuple[str, str]:
+        """
+        Rename a repository and set its description and visibility.
+
+        Used to turn a pre-provisioned placeholder into a project's repository.
+
+        Args:
+            repo_name: Current name of the repository.
+            new_name: New name of the repository.
+            description: Repository description.
+            private: Whether the repository should be private.
+
+        Returns:
+            Tuple of (repo_url, clone_url) under the new name.
+
+        Raises:
+            Exception: If the repository cannot be renamed.
+        """
+        if not self.client:
+            raise Exception("GitHub is not configured. Please set GITHUB_TOKEN and GITHUB_ORG environment variables.")
+
+        def rename():
+            # GitHub redirects the old name after a rename, so a repeated attempt edits the same repository
+            repo = self.client.get_repo(f"{self.org_name}/{repo_name}")
+            repo.edit(name=new_name, description=description, private=private)
+            return repo
+
+        try:
+            repo = call_with_retry("github", "rename_repository", rename)
+            logger.info(f"Renamed repository {repo_name} to {repo.html_url}")
+            return repo.html_url, repo.clone_url
+
+        except GithubException as e:
+            logger.error(f"Failed to rename repository {repo_name}: {e}")
+            raise Exception(f"GitHub API error: {e.data.get('message', str(e))}")
 
     def push_files(self, repo_name: str, project_path: Path, branch: str = "main"):
         """
@@ -108,53 +175,67 @@ class GitHubService:
         if not self.client:
             raise Exception("GitHub is not configured. Please set GITHUB_TOKEN and GITHUB_ORG environment variables.")
 
-        with track_external_call("github", "push_files"):
-            try:
-                full_repo_name = f"{self.org_name}/{repo_name}"
-                repo = self.client.get_repo(full_repo_name)
-
-                logger.info(f"Pushing files to {full_repo_name} using git commands")
-
-                # Use git commands to push all files at once
-                import subprocess
-
-                # Build authenticated remote URL
-                auth_url = repo.clone_url.replace("https://", f"https://{settings.github_token}@")
-
-                # Initialize git repo in project directory
-                git_commands = [
-                    ["git", "init"],
-                    ["git", "config", "user.name", "IDP Platform"],
-                    ["git", "config", "user.email", "idp@platform.local"],
-                    ["git", "add", "."],
-                    ["git", "commit", "-m", "Initial commit - Generated by IDP Platform"],
-                    ["git", "branch", "-M", branch],
-                    ["git", "remote", "add", "origin", auth_url],
-                    ["git", "push", "-u", "origin", branch]
-                ]
-
-                for cmd in git_commands:
-                    logger.debug(f"Running: {' '.join(cmd[:3])}...")  # Don't log full command (contains token)
-                    result = subprocess.run(
-                        cmd,
-                        cwd=str(project_path),
-                        capture_output=True,
-                        text=True,
-                        timeout=30
-                    )
-
-                    if result.returncode != 0:
-                        logger.error(f"Git command failed: {result.stderr}")
-                        raise Exception(f"Git command failed: {result.stderr}")
-
-                logger.info(f"Successfully pushed all files to {full_repo_name}")
-
-            except subprocess.TimeoutExpired:
-                logger.error("Git push timed out")
-                raise Exception("Git push timed out after 30 seconds")
-            except Exception as e:
-                logger.error(f"Failed to push files: {e}")
-                raise Exception(f"Failed to push files to GitHub: {str(e)}")
+        try:
+            full_repo_name = f"{self.org_name}/{repo_name}"
+            repo = call_with_retry("github", "get_repository", self.client.get_repo, full_repo_name)
+
+            logger.info(f"Pushing files to {full_repo_name} using git commands")
+
+            # Build authenticated remote URL
+            auth_url = repo.clone_url.replace("https://", f"https://{settings.github_token}@")
+
+            # Initialize git repo in project directory
+            git_commands = [
+                ["git", "init"],
+                ["git", "config", "user.name", "IDP Platform"],
+                ["git", "config", "user.email", "idp@platform.local"],
+                ["git", "add", "."],
+                ["git", "commit", "-m", "Initial commit - Generated by IDP Platform"],
+                ["git", "branch", "-M", branch],
+                ["git", "remote", "add", "origin", auth_url],
+            ]
+
+            for cmd in git_commands:
+                self._run_git(cmd, project_path)
+
+            # Only the push talks to GitHub; repeating it is safe
+            call_with_retry(
+                "github", "push_files", self._run_git, ["git", "push", "-u", "origin", branch], project_path
+            )
+
+            logger.info(f"Successfully pushed all files to {full_repo_name}")
+
+        except Exception as e:
+            logger.error(f"Failed to push files: {e}")
+            raise Exception(f"Failed to push files to GitHub: {str(e)}")
+
+    def _run_git(self, cmd: list[str], project_path: Path):
+        """
+        Run a git command in a project directory.
+
+        Raises:
+            TransientError: If the command timed out or failed on a network error.
+            Exception: If the command failed otherwise.
+        """
+        logger.debug(f"Running: {' '.join(cmd[:3])}...")  # Don't log full command (contains token)
+        try:
+            result = subprocess.run(
+                cmd,
+                cwd=str(project_path),
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+        except subprocess.TimeoutExpired:
+            logger.error(f"Git command timed out: {' '.join(cmd[:2])}")
+            raise TransientError("Git command timed out after 30 seconds")
+
+        if result.returncode != 0:
+            logger.error(f"Git command failed: {result.stderr}")
+            stderr = result.stderr.lower()
+            if any(fragment in stderr for fragment in TRANSIENT_GIT_ERRORS):
+                raise TransientError(f"Git command failed: {result.stderr}")
+            raise Exception(f"Git command failed: {result.stderr}")
 
     def repository_exists(self, repo_name: str) -> bool:
         """
@@ -169,33 +250,123 @@ class GitHubService:
         if not self.client:
             return False
 
-        with track_external_call("github", "repository_exists"):
+        try:
+            full_repo_name = f"{self.org_name}/{repo_name}"
+            call_with_retry("github", "repository_exists", self.client.get_repo, full_repo_name)
+            return True
+        except GithubException:
+            return False
+
+    def repository_name(self, repo_name: str) -> Optional[str]:
+        """
+        Look up the current name of a repository, following renames.
+
+        GitHub redirects a renamed repository's old name to it, so this tells
+        whether ``repo_name`` was renamed since.
+
+        Args:
+            repo_name: Name the repository was known by.
+
+        Returns:
+            The repository's current name, or None if it does not exist.
+        """
+        if not self.client:
+            raise Exception("GitHub is not configured. Please set GITHUB_TOKEN and GITHUB_ORG environment variables.")
+
+        def lookup():
             try:
-                full_repo_name = f"{self.org_name}/{repo_name}"
-                self.client.get_repo(full_repo_name)
-                return True
-            except GithubException:
-                return False
+                return self.client.get_repo(f"{self.org_name}/{repo_name}").name
+            except GithubException as e:
+                if e.status == 404:
+                    return None
+                raise
+
+        return call_with_retry("github", "get_repository", lookup)
+
+    def _owner(self):
+        # Repositories are created under the organisation, or else under the
+        # authenticated user, whose listing (unlike a NamedUser's) includes private ones
+        return self.org if self.is_org else self.client.get_user()
 
-    def delete_repository(self, repo_name: str):
+    def repository_listing_pages(self) -> int:
+        """
+        Number of API pages it takes to list all of the owner's repositories.
+
+        Returns:
+            The page count, 0 if GitHub is not configured.
+        """
+        if not self.client or not self.org:
+            return 0
+
+        def count():
+            owner = self._owner()
+            return owner.public_repos + (owner.owned_private_repos or 0)
+
+        repos = call_with_retry("github", "get_owner", count)
+        return -(-repos // LISTING_PAGE_SIZE)
+
+    def existing_repositories(self, repo_names: Iterable[str]) -> Set[str]:
+        """
+        Check which of many repositories already exist with a single listing.
+
+        Listing the owner's repositories costs one call per page instead of one
+        lookup per name, which pays off when a batch is large compared to the
+        owner (see ``repository_listing_pages``).
+
+        Args:
+            repo_names: Names of the repositories to check.
+
+        Returns:
+            The subset of ``repo_names`` that already exist.
+        """
+        wanted = {name.lower() for name in repo_names}
+        if not self.client or not self.org or not wanted:
+            return set()
+
+        def list_names():
+            owner = self._owner()
+            repos = owner.get_repos() if self.is_org else owner.get_repos(affiliation="owner")
+            return {repo.name.lower() for repo in repos}
+
+        try:
+            existing = call_with_retry("github", "list_repositories", list_names)
+        except GithubException as e:
+            logger.error(f"Failed to list repositories: {e}")
+            raise Exception(f"GitHub API error: {e.data.get('message', str(e))}")
+
+        return {name for name in repo_names if name.lower() in existing}
+
+    def delete_repository(self, repo_name: str, missing_ok: bool = False):
         """
         Delete a repository.
 
         Args:
             repo_name: Name of the repository.
+            missing_ok: Succeed if the repository does not exist.
         """
         if not self.client:
             raise Exception("GitHub is not configured. Please set GITHUB_TOKEN and GITHUB_ORG environment variables.")
 
-        with track_external_call("github", "delete_repository"):
+        full_repo_name = f"{self.org_name}/{repo_name}"
+        attempts = 0
+
+        def delete():
+            nonlocal attempts
+            attempts += 1
             try:
-                full_repo_name = f"{self.org_name}/{repo_name}"
-                repo = self.client.get_repo(full_repo_name)
-                repo.delete()
-                logger.info(f"Deleted repository: {full_repo_name}")
+                self.client.get_repo(full_repo_name).delete()
             except GithubException as e:
-                logger.error(f"Failed to delete repository: {e}")
-                raise Exception(f"Failed to delete repository: {e.data.get('message', str(e))}")
+                # An earlier attempt timed out after GitHub had already deleted the repository
+                if e.status == 404 and (missing_ok or attempts > 1):
+                    return
+                raise
+
+        try:
+            call_with_retry("github", "delete_repository", delete)
+            logger.info(f"Deleted repository: {full_repo_name}")
+        except GithubException as e:
+            logger.error(f"Failed to delete repository: {e}")
+            raise Exception(f"Failed to delete repository: {e.data.get('message', str(e))}")
 
 
 # Global instance
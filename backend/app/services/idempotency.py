@@ -0,0 +1,143 @@
+"""
+Idempotency-Key support for project creation.
+
+Clients that retry ``POST /api/v1/projects`` after a timeout send the same
+``Idempotency-Key`` header with every attempt. The first successful response is
+stored per user and key, in the same transaction that creates the project, and
+repeated requests get that response back without re-running validation, GitHub
+lookups or enqueueing a second workflow. Stored responses expire after
+``idempotency_key_ttl_hours``.
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.idempotency import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyKeyReused(Exception):
+    """Raised when a key is sent again with a different request."""
+
+
+def request_fingerprint(*parts: Any) -> str:
+    """
+    Hash the parts of a request that identify it.
+
+    Args:
+        *parts: JSON-serializable values or bytes (e.g. uploaded file content).
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = json.dumps(part, sort_keys=True, default=str).encode()
+        digest.update(hashlib.sha256(part).digest())
+    return digest.hexdigest()
+
+
+class IdempotencyStore:
+    """Stores and replays create responses keyed by user and Idempotency-Key."""
+
+    def lookup(
+        self,
+        db: Session,
+        user_id: str,
+        key: str,
+        endpoint: str,
+        request_hash: str,
+    ) -> Optional[IdempotencyKey]:
+        """
+        Find the stored response for a repeated request.
+
+        Args:
+            db: Database session.
+            user_id: User sending the request.
+            key: Idempotency-Key header value.
+            endpoint: Endpoint the request was sent to.
+            request_hash: Fingerprint of the request (see ``request_fingerprint``).
+
+        Returns:
+            The stored response, or None if the key is new or expired.
+
+        Raises:
+            IdempotencyKeyReused: If the key was used for a different request.
+        """
+        record = db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+        ).first()
+        if record is None:
+            return None
+
+        if record.expires_at <= datetime.utcnow():
+            db.delete(record)
+            db.commit()
+            return None
+
+        if record.endpoint != endpoint or record.request_hash != request_hash:
+            raise IdempotencyKeyReused(
+                "Idempotency-Key was already used for a different request"
+            )
+
+        logger.info(f"Replaying response for Idempotency-Key {key} of user {user_id}")
+        return record
+
+    def remember(
+        self,
+        db: Session,
+        user_id: str,
+        key: str,
+        endpoint: str,
+        request_hash: str,
+        status_code: int,
+        body: Any,
+    ):
+        """
+        Store a response for later replay.
+
+        The record is only added to the session; the caller commits it together
+        with the created project, so a key is never stored for a rolled back
+        request. Expired keys of the user are removed at the same time.
+
+        Args:
+            db: Database session.
+            user_id: User sending the request.
+            key: Idempotency-Key header value.
+            endpoint: Endpoint the request was sent to.
+            request_hash: Fingerprint of the request.
+            status_code: Response status code.
+            body: JSON-serializable response body.
+        """
+        now = datetime.utcnow()
+        db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.expires_at <= now,
+        ).delete(synchronize_session=False)
+
+        db.add(IdempotencyKey(
+            user_id=user_id,
+            key=key,
+            endpoint=endpoint,
+            request_hash=request_hash,
+            response_status=status_code,
+            response_body=json.dumps(body),
+            created_at=now,
+            expires_at=now + timedelta(hours=settings.idempotency_key_ttl_hours),
+        ))
+
+    def body(self, record: IdempotencyKey) -> Any:
+        """Decode a stored response body."""
+        return json.loads(record.response_body)
+
+
+# Global instance
+idempotency_store = IdempotencyStore()
@@ -0,0 +1,471 @@
+"""
+Durable job queue for project workflows backed by the ``project_jobs`` table.
+
+The API enqueues a job in the same transaction that creates the project record,
+and idp-worker processes claim jobs with ``SELECT ... FOR UPDATE SKIP LOCKED`` so
+that any number of workers can share the queue without handing out the same job
+twice. Workers heartbeat the jobs they hold; a job whose heartbeat is older than
+``job_lease_seconds`` is considered abandoned (worker crashed or was redeployed)
+and becomes claimable again.
+
+Jobs belong to one of two priority classes. ``interactive`` jobs (a developer
+clicking "Create") are claimed ahead of ``bulk`` jobs (batches and automation),
+and ``workflow_interactive_reserved_slots`` of the running slots are never
+given to bulk jobs, so a large migration cannot delay the UI's projects.
+
+A job that fails for good (its worker crashed, shut down or lost the lease on
+the last attempt) also fails its project, so it does not stay in an
+in-progress status and can be retried.
+
+Jobs of one project run in the order they were enqueued: a job is not claimed
+while an earlier job of its project is queued or running. Deleting a project
+that is still being created relies on this: its deletion waits until the
+cancelled creation has undone its steps.
+"""
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.core.metrics import workflow_jobs_running, workflow_queue_depth, workflow_queue_wait
+from app.models.job import ProjectJob
+from app.models.project import Project
+from app.models.workflow_step import ProjectWorkflowStep
+from app.services.project_events import record_event
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = ("interactive", "bulk")
+# Project statuses of a workflow that has not finished
+IN_PROGRESS_STATUSES = ("pending", "creating_repo", "building", "deploying", "deleting")
+
+
+class JobQueue:
+    """Service for enqueuing, claiming and completing project jobs."""
+
+    def enqueue(
+        self,
+        db: Session,
+        project_id: str,
+        kind: str,
+        payload: Dict,
+        user_id: Optional[str] = None,
+        batch_id: Optional[str] = None,
+        batch_limit: Optional[int] = None,
+        priority: str = "interactive",
+    ) -> ProjectJob:
+        """
+        Add a job to the queue.
+
+        The job is only added to the session; the caller commits it together with
+        the project record so a project never exists without its job.
+
+        Args:
+            db: Database session.
+            project_id: Project the job belongs to.
+            kind: Workflow kind (see ``app.services.project_workflows.WORKFLOWS``).
+            payload: JSON-serializable workflow arguments.
+            user_id: Owner of the project, used for per-user limits and fairness.
+            batch_id: Batch the job belongs to, if created by a batch request.
+            batch_limit: Maximum number of the batch's jobs allowed to run at once.
+            priority: Priority class, ``interactive`` or ``bulk``.
+
+        Returns:
+            The pending job.
+        """
+        job = ProjectJob(
+            project_id=project_id,
+            user_id=user_id,
+            kind=kind,
+            payload=json.dumps(payload),
+            status="queued",
+            attempts=0,
+            batch_id=batch_id,
+            batch_limit=batch_limit,
+            priority=priority,
+        )
+        db.add(job)
+        return job
+
+    def claim(self, db: Session, worker_id: str, allow_bulk: bool = True) -> Optional[ProjectJob]:
+        """
+        Claim the next runnable job for a worker.
+
+        Nothing is claimed while ``workflow_max_running`` jobs are running across
+        all workers, and bulk jobs are only claimed while fewer than
+        ``workflow_max_running - workflow_interactive_reserved_slots`` bulk jobs
+        run (at least one may always run). Interactive jobs come before bulk
+        jobs. Jobs of a user with ``workflow_max_running_per_user`` running
+        jobs are skipped, as are jobs of a batch with ``batch_limit`` running jobs
+        and jobs waiting for an earlier unfinished job of their project.
+        Within a priority class, jobs of users with the fewest running jobs come
+        first (oldest first within a user), so one user's backlog cannot starve
+        everyone else. The limits are soft: two workers claiming at the same
+        instant may each see a free slot.
+
+        Args:
+            db: Database session.
+            worker_id: Identifier of the claiming worker.
+            allow_bulk: False when the worker keeps its free slots for interactive jobs.
+
+        Returns:
+            The claimed job, or None if the queue is empty.
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=settings.job_lease_seconds)
+
+        running_by_priority = dict(
+            db.query(ProjectJob.priority, func.count(ProjectJob.id))
+            .filter(ProjectJob.status == "running", ProjectJob.heartbeat_at >= stale_before)
+            .group_by(ProjectJob.priority)
+            .all()
+        )
+        running_total = sum(running_by_priority.values())
+        workflow_jobs_running.set(running_total)
+        if running_total >= settings.workflow_max_running:
+            db.rollback()
+            return None
+
+        bulk_slots = max(
+            settings.workflow_max_running - settings.workflow_interactive_reserved_slots, 1
+        )
+        allow_bulk = allow_bulk and running_by_priority.get("bulk", 0) < bulk_slots
+
+        running = aliased(ProjectJob)
+        running_in_batch = (
+            select(func.count(running.id))
+            .where(running.batch_id == ProjectJob.batch_id, running.status == "running")
+            .scalar_subquery()
+        )
+        running_for_user = (
+            select(func.count(running.id))
+            .where(running.user_id == ProjectJob.user_id, running.status == "running")
+            .scalar_subquery()
+        )
+        earlier_unfinished = (
+            select(running.id)
+            .where(
+                running.project_id == ProjectJob.project_id,
+                running.created_at < ProjectJob.created_at,
+                running.status.in_(("queued", "running")),
+            )
+            .exists()
+        )
+
+        query = db.query(ProjectJob)
+        if not allow_bulk:
+            query = query.filter(ProjectJob.priority == "interactive")
+
+        job = (
+            query
+            .filter(
+                or_(
+                    ProjectJob.status == "queued",
+                    and_(ProjectJob.status == "running", ProjectJob.heartbeat_at < stale_before),
+                ),
+                or_(ProjectJob.batch_id.is_(None), running_in_batch < ProjectJob.batch_limit),
+                or_(
+                    ProjectJob.user_id.is_(None),
+                    running_for_user < settings.workflow_max_running_per_user,
+                ),
+                ~earlier_unfinished,
+            )
+            .order_by(
+                case((ProjectJob.priority == "interactive", 0), else_=1),
+                running_for_user,
+                ProjectJob.created_at,
+            )
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if job is None:
+            db.rollback()
+            return None
+
+        if job.status == "running":
+            logger.warning(f"Reclaiming abandoned job {job.id} from worker {job.locked_by}")
+
+        # Guarded update: a no-op on PostgreSQL (the row is locked), but keeps two
+        # SQLite workers from claiming the same job.
+        claimed = (
+            db.query(ProjectJob)
+            .filter(
+                ProjectJob.id == job.id,
+                ProjectJob.status == job.status,
+                ProjectJob.attempts == job.attempts,
+            )
+            .update(
+                {
+                    ProjectJob.status: "running",
+                    ProjectJob.locked_by: worker_id,
+                    ProjectJob.heartbeat_at: now,
+                    ProjectJob.started_at: now,
+                    ProjectJob.attempts: job.attempts + 1,
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        if not claimed:
+            return None
+
+        db.refresh(job)
+        if job.attempts == 1:
+            workflow_queue_wait.labels(priority=job.priority).observe((now - job.created_at).total_seconds())
+        return job
+
+    def backlog(
+        self,
+        db: Session,
+        user_id: Optional[str] = None,
+        priority: Optional[str] = None,
+    ) -> Tuple[int, int]:
+        """
+        Count queued jobs.
+
+        Args:
+            db: Database session.
+            user_id: User whose queued jobs are counted separately.
+            priority: Only count jobs of this priority class in the overall total.
+
+        Returns:
+            Tuple of (queued jobs overall, queued jobs of ``user_id``).
+        """
+        rows = (
+            db.query(ProjectJob.user_id, ProjectJob.priority, func.count(ProjectJob.id))
+            .filter(ProjectJob.status == "queued")
+            .group_by(ProjectJob.user_id, ProjectJob.priority)
+            .all()
+        )
+        total = sum(count for _, job_priority, count in rows if priority in (None, job_priority))
+        for_user = sum(count for owner, _, count in rows if user_id is not None and owner == user_id)
+        return total, for_user
+
+    def refresh_metrics(self, db: Session):
+        """
+        Set the queue depth and running jobs gauges from the table.
+
+        Workers call this on a timer, so the gauges also fall back to zero once
+        the queue drains.
+
+        Args:
+            db: Database session.
+        """
+        stale_before = datetime.utcnow() - timedelta(seconds=settings.job_lease_seconds)
+        queued = db.query(func.count(ProjectJob.id)).filter(ProjectJob.status == "queued").scalar()
+        running = db.query(func.count(ProjectJob.id)).filter(
+            ProjectJob.status == "running",
+            ProjectJob.heartbeat_at >= stale_before,
+        ).scalar()
+        db.rollback()
+        workflow_queue_depth.set(queued or 0)
+        workflow_jobs_running.set(running or 0)
+
+    def heartbeat(self, db: Session, worker_id: str, job_ids: List[str]):
+        """
+        Extend the lease on jobs held by a worker.
+
+        Args:
+            db: Database session.
+            worker_id: Identifier of the worker holding the jobs.
+            job_ids: Jobs currently being executed.
+        """
+        if not job_ids:
+            return
+        db.query(ProjectJob).filter(
+            ProjectJob.id.in_(job_ids),
+            ProjectJob.locked_by == worker_id,
+            ProjectJob.status == "running",
+        ).update({ProjectJob.heartbeat_at: datetime.utcnow()}, synchronize_session=False)
+        db.commit()
+
+    def complete(self, db: Session, job_id: str):
+        """Mark a job as finished."""
+        db.query(ProjectJob).filter(ProjectJob.id == job_id).update(
+            {
+                ProjectJob.status: "succeeded",
+                ProjectJob.finished_at: datetime.utcnow(),
+                ProjectJob.error_message: None,
+            },
+            synchronize_session=False,
+        )
+        db.commit()
+
+    def fail(self, db: Session, job: ProjectJob, error: str):
+        """
+        Record a job failure, re-queuing it while attempts remain.
+
+        Once no attempts remain, a project still in progress is marked failed
+        (with a status event) in the same transaction.
+
+        Args:
+            db: Database session.
+            job: The failed job.
+            error: Error description.
+        """
+        retry = job.attempts < settings.job_max_attempts
+        db.query(ProjectJob).filter(ProjectJob.id == job.id).update(
+            {
+                ProjectJob.status: "queued" if retry else "failed",
+                ProjectJob.locked_by: None,
+                ProjectJob.finished_at: None if retry else datetime.utcnow(),
+                ProjectJob.error_message: error,
+            },
+            synchronize_session=False,
+        )
+        if not retry:
+            self._fail_project(db, job.project_id, error)
+        db.commit()
+
+    def _fail_project(self, db: Session, project_id: str, error: str):
+        """Mark a project whose workflow will not run again as failed, unless it already finished."""
+        user_id = db.query(Project.user_id).filter(Project.id == project_id).scalar()
+        if user_id is None:
+            return
+        failed = db.query(Project).filter(
+            Project.id == project_id,
+            Project.status.in_(IN_PROGRESS_STATUSES),
+        ).update(
+            {Project.status: "failed", Project.error_message: error},
+            synchronize_session=False,
+        )
+        if failed:
+            record_event(db, project_id, user_id, "failed", error_message=error)
+
+    def request_cancel(self, db: Session, job: ProjectJob) -> bool:
+        """
+        Ask for a job to be cancelled.
+
+        A job that is still queued is cancelled on the spot, unless an earlier
+        attempt left completed steps that must be undone; such a job, and a
+        running job, is flagged for its worker, which cancels the workflow at
+        its next step boundary. Changes are committed by the caller.
+
+        Args:
+            db: Database session.
+            job: The job to cancel.
+
+        Returns:
+            True if the job was cancelled on the spot, False if a worker will cancel it.
+        """
+        has_completed_steps = db.query(ProjectWorkflowStep.id).filter(
+            ProjectWorkflowStep.project_id == job.project_id,
+            ProjectWorkflowStep.status == "completed",
+        ).first() is not None
+
+        if not has_completed_steps and self.cancel_queued(db, job):
+            return True
+
+        db.query(ProjectJob).filter(ProjectJob.id == job.id).update(
+            {ProjectJob.cancel_requested_at: datetime.utcnow()}, synchronize_session=False
+        )
+        return False
+
+    def cancel_queued(self, db: Session, job: ProjectJob) -> bool:
+        """
+        Cancel a job that no worker has claimed yet.
+
+        Guarded against a worker claiming the job at the same moment. Changes
+        are committed by the caller.
+
+        Args:
+            db: Database session.
+            job: The job to cancel.
+
+        Returns:
+            True if the job was still queued and is now cancelled.
+        """
+        now = datetime.utcnow()
+        cancelled = db.query(ProjectJob).filter(
+            ProjectJob.id == job.id,
+            ProjectJob.status == "queued",
+        ).update(
+            {
+                ProjectJob.status: "cancelled",
+                ProjectJob.cancel_requested_at: now,
+                ProjectJob.finished_at: now,
+            },
+            synchronize_session=False,
+        )
+        return bool(cancelled)
+
+    def cancel_requested(self, db: Session, job_ids: List[str]) -> Set[str]:
+        """
+        Find which of a worker's jobs have been asked to cancel.
+
+        Args:
+            db: Database session.
+            job_ids: Jobs currently being executed.
+
+        Returns:
+            Ids of the jobs with a pending cancellation request.
+        """
+        if not job_ids:
+            return set()
+        rows = db.query(ProjectJob.id).filter(
+            ProjectJob.id.in_(job_ids),
+            ProjectJob.cancel_requested_at.isnot(None),
+        ).all()
+        return {row.id for row in rows}
+
+    def latest_for_project(self, db: Session, project_id: str) -> Optional[ProjectJob]:
+        """Get the most recently created job of a project."""
+        return (
+            db.query(ProjectJob)
+            .filter(ProjectJob.project_id == project_id)
+            .order_by(ProjectJob.created_at.desc())
+            .first()
+        )
+
+    def latest_for_projects(self, db: Session, project_ids: List[str]) -> Dict[str, ProjectJob]:
+        """Get the most recently created job of each of several projects in one query."""
+        if not project_ids:
+            return {}
+        latest = (
+            db.query(ProjectJob.project_id, func.max(ProjectJob.created_at).label("created_at"))
+            .filter(ProjectJob.project_id.in_(project_ids))
+            .group_by(ProjectJob.project_id)
+            .subquery()
+        )
+        jobs = db.query(ProjectJob).join(
+            latest,
+            and_(
+                ProjectJob.project_id == latest.c.project_id,
+                ProjectJob.created_at == latest.c.created_at,
+            ),
+        ).all()
+        return {job.project_id: job for job in jobs}
+
+    def resubmit(self, db: Session, job: ProjectJob) -> ProjectJob:
+        """
+        Queue a new run of a finished job with the same workflow arguments.
+
+        The new job is only added to the session; the caller commits it.
+
+        Args:
+            db: Database session.
+            job: The job to run again.
+
+        Returns:
+            The pending job.
+        """
+        return self.enqueue(
+            db,
+            job.project_id,
+            job.kind,
+            self.payload(job),
+            user_id=job.user_id,
+            priority=job.priority,
+        )
+
+    def payload(self, job: ProjectJob) -> Dict:
+        """Decode a job's workflow arguments."""
+        return json.loads(job.payload or "{}")
+
+
+# Global instance
+job_queue = JobQueue()
@@ -3,7 +3,10 @@ Service for generating FastAPI code from OpenAPI specifications.
 """
 import json
 import yaml
+import hashlib
 import logging
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
 from typing import Dict, Tuple
 from openapi_spec_validator import validate_spec
@@ -12,6 +15,8 @@ from datamodel_code_generator import InputFileType, generate
 from jinja2 import Template
 import io
 
+from app.services.render_cache import write_rendered_file
+
 logger = logging.getLogger(__name__)
 
 # Jinja2 template for main.py
@@ -424,29 +429,29 @@ class OpenAPIGeneratorService:
         # Write main.py
         main_file = project_path / "src" / "main.py"
         main_file.parent.mkdir(parents=True, exist_ok=True)
-        main_file.write_text(main_code)
+        write_rendered_file(main_file, main_code)
         logger.info(f"Injected main.py at {main_file}")
 
         # Write models.py (if generated)
         if models_code.strip():
             models_file = project_path / "src" / "models.py"
-            models_file.write_text(models_code)
+            write_rendered_file(models_file, models_code)
             logger.info(f"Injected models.py at {models_file}")
         else:
             # Create empty models.py
             models_file = project_path / "src" / "models.py"
-            models_file.write_text("# No models generated from OpenAPI spec\n")
+            write_rendered_file(models_file, "# No models generated from OpenAPI spec\n")
 
         # Write test_main.py
         test_file = project_path / "tests" / "test_main.py"
         test_file.parent.mkdir(parents=True, exist_ok=True)
-        test_file.write_text(tests_code)
+        write_rendered_file(test_file, tests_code)
         logger.info(f"Injected test_main.py at {test_file}")
 
         # Write original OAS spec
         spec_filename = f"openapi.{file_format if file_format == 'json' else 'yaml'}"
         spec_file = project_path / spec_filename
-        spec_file.write_text(spec_content)
+        write_rendered_file(spec_file, spec_content)
         logger.info(f"Copied original spec to {spec_file}")
 
     def _map_type(self, oas_type: str) -> str:
@@ -467,5 +472,23 @@ class OpenAPIGeneratorService:
         return ref.split("/")[-1]
 
 
+@lru_cache(maxsize=1)
+def generator_version() -> str:
+    """
+    Identify the code this service generates for a given input.
+
+    Returns:
+        Hash of this module's source (routes/tests templates and generation code)
+        and the versions of the libraries that shape the output.
+    """
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    for package in ("datamodel-code-generator", "pydantic", "openapi-spec-validator", "jinja2"):
+        try:
+            digest.update(f"{package}={version(package)};".encode())
+        except PackageNotFoundError:
+            digest.update(f"{package}=;".encode())
+    return digest.hexdigest()
+
+
 # Global instance
 openapi_generator = OpenAPIGeneratorService()
@@ -0,0 +1,279 @@
+"""
+Project status events and their fan-out to Server-Sent Events streams.
+
+Every status transition of a project is appended to the ``project_events``
+table, by the API when it creates or retries a project and by
+``ProjectStateWriter`` when a workflow flushes. Workflows may run in separate
+idp-worker processes, so streams cannot be fed in memory. Instead each API
+process runs one ``ProjectEventBroadcaster`` poller that reads new rows every
+``events_poll_interval_seconds`` and hands them to all subscribed streams. The
+database cost is one indexed query per interval, however many clients listen,
+and the poller only runs while somebody is subscribed.
+
+Event ids are the table's autoincrement ids, so a client that reconnects with
+``Last-Event-ID`` is sent the events it missed before the live ones.
+"""
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.project_event import ProjectEvent
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per stream before a slow client is disconnected (it resumes
+# with Last-Event-ID on reconnect, so nothing is lost)
+SUBSCRIBER_QUEUE_SIZE = 1000
+POLL_BATCH_SIZE = 500
+# Ids are allocated at insert but become visible at commit, so a concurrent
+# workflow's event can appear below the highest id already seen. Each poll
+# re-reads this many ids below it, and delivered ids are remembered to skip them.
+POLL_OVERLAP = 100
+
+
+def record_event(
+    db: Session,
+    project_id: str,
+    user_id: str,
+    status: str,
+    error_message: Optional[str] = None,
+    created_at: Optional[datetime] = None,
+):
+    """
+    Append a status event.
+
+    The event is only added to the session; the caller commits it together with
+    the status change itself.
+
+    Args:
+        db: Database session.
+        project_id: Project whose status changed.
+        user_id: Owner of the project.
+        status: New status.
+        error_message: Error recorded with the status, if any.
+        created_at: When the transition happened, defaults to now.
+    """
+    db.add(ProjectEvent(
+        project_id=project_id,
+        user_id=user_id,
+        status=status,
+        error_message=error_message,
+        created_at=created_at or datetime.utcnow(),
+    ))
+
+
+def _to_dict(event: ProjectEvent) -> Dict:
+    return {
+        "id": event.id,
+        "project_id": event.project_id,
+        "user_id": event.user_id,
+        "status": event.status,
+        "error_message": event.error_message,
+        "created_at": event.created_at.isoformat(),
+    }
+
+
+def format_sse(event: Dict) -> str:
+    """Encode an event as a Server-Sent Events message."""
+    data = {key: value for key, value in event.items() if key != "user_id"}
+    return f"id: {event['id']}\nevent: status\ndata: {json.dumps(data)}\n\n"
+
+
+class EventSubscription:
+    """Events of one stream: a user's projects, or a single project."""
+
+    def __init__(self, user_id: str, project_id: Optional[str] = None):
+        self.user_id = user_id
+        self.project_id = project_id
+        self.overflowed = False
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._seen: Set[int] = set()
+        self._held: Optional[List[Dict]] = None  # Live events arriving while missed ones load
+        self._replay_task: Optional[asyncio.Task] = None
+
+    def matches(self, event: Dict) -> bool:
+        """Whether an event belongs to this stream."""
+        if event["user_id"] != self.user_id:
+            return False
+        return self.project_id is None or event["project_id"] == self.project_id
+
+    def hold(self):
+        """Hold back live events until ``release``, so missed ones are queued before them."""
+        self._held = []
+
+    async def replay(self, missed: List[Dict]):
+        """Queue missed events, waiting for the client to drain the queue instead of overflowing it."""
+        for event in missed:
+            await self._queue.put(event)
+
+    def release(self):
+        """Queue the live events held since ``hold`` and deliver new ones directly."""
+        held, self._held = self._held or [], None
+        for event in held:
+            self.put(event)
+
+    def put(self, event: Dict):
+        """Queue an event for the stream, flagging the stream if the client is too slow."""
+        if self._held is not None:
+            self._held.append(event)
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def next(self, timeout: float) -> Optional[Dict]:
+        """
+        Wait for the next event.
+
+        Args:
+            timeout: Seconds to wait.
+
+        Returns:
+            The event, or None if none arrived in time.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            try:
+                event = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return None
+            # Replayed and polled events can overlap right after subscribing
+            if event["id"] not in self._seen:
+                self._seen.add(event["id"])
+                if len(self._seen) > 2 * POLL_OVERLAP:
+                    floor = max(self._seen) - POLL_OVERLAP
+                    self._seen = {seen for seen in self._seen if seen > floor}
+                return event
+
+
+class ProjectEventBroadcaster:
+    """Polls ``project_events`` once per process and fans new events out to streams."""
+
+    def __init__(self):
+        self._subscriptions: Set[EventSubscription] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        user_id: str,
+        project_id: Optional[str] = None,
+        last_event_id: Optional[int] = None,
+    ) -> AsyncIterator[EventSubscription]:
+        """
+        Subscribe to status events.
+
+        Args:
+            user_id: Stream events of this user's projects.
+            project_id: Restrict the stream to one project.
+            last_event_id: Replay stored events after this id before live ones.
+
+        Yields:
+            The subscription.
+        """
+        subscription = EventSubscription(user_id, project_id)
+        if last_event_id is not None:
+            subscription.hold()
+        self._subscriptions.add(subscription)
+        try:
+            if self._task is None or self._task.done():
+                self._task = asyncio.create_task(self._poll())
+            if last_event_id is not None:
+                # Missed events are paged in the background, a queue at a time,
+                # so a long backlog neither delays the stream nor overflows it
+                subscription._replay_task = asyncio.create_task(
+                    self._replay(subscription, last_event_id)
+                )
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+            if subscription._replay_task is not None:
+                subscription._replay_task.cancel()
+
+    @property
+    def subscribers(self) -> int:
+        """Number of open streams in this process."""
+        return len(self._subscriptions)
+
+    async def _poll(self):
+        last_id = await asyncio.to_thread(self._max_id)
+        # Events already in the table when streaming starts are not news
+        delivered = {
+            event["id"] for event in await asyncio.to_thread(self._load, last_id - POLL_OVERLAP)
+        }
+        while self._subscriptions:
+            try:
+                events = await asyncio.to_thread(self._load, last_id - POLL_OVERLAP)
+            except Exception as e:
+                logger.error(f"Failed to poll project events: {e}")
+                events = []
+
+            new_events = [event for event in events if event["id"] not in delivered]
+            for event in new_events:
+                delivered.add(event["id"])
+                last_id = max(last_id, event["id"])
+                for subscription in list(self._subscriptions):
+                    if subscription.matches(event):
+                        subscription.put(event)
+            delivered = {event_id for event_id in delivered if event_id > last_id - POLL_OVERLAP}
+
+            if len(new_events) < POLL_BATCH_SIZE - POLL_OVERLAP:
+                await asyncio.sleep(settings.events_poll_interval_seconds)
+
+    async def _replay(self, subscription: EventSubscription, after_id: int):
+        try:
+            # A short page is the end of the backlog; only then go live
+            while True:
+                missed = await asyncio.to_thread(
+                    self._load, after_id, subscription.user_id, subscription.project_id
+                )
+                await subscription.replay(missed)
+                if len(missed) < POLL_BATCH_SIZE:
+                    break
+                after_id = missed[-1]["id"]
+        except Exception as e:
+            logger.error(f"Failed to replay project events after {after_id}: {e}")
+            # End the stream; the client reconnects with the last id it received
+            subscription.overflowed = True
+        subscription.release()
+
+    def _max_id(self) -> int:
+        db = SessionLocal()
+        try:
+            return db.query(func.max(ProjectEvent.id)).scalar() or 0
+        finally:
+            db.close()
+
+    def _load(
+        self,
+        after_id: int,
+        user_id: Optional[str] = None,
+        project_id: Optional[str] = None,
+    ) -> List[Dict]:
+        db = SessionLocal()
+        try:
+            query = db.query(ProjectEvent).filter(ProjectEvent.id > after_id)
+            if user_id is not None:
+                query = query.filter(ProjectEvent.user_id == user_id)
+            if project_id is not None:
+                query = query.filter(ProjectEvent.project_id == project_id)
+            return [_to_dict(event) for event in query.order_by(ProjectEvent.id).limit(POLL_BATCH_SIZE)]
+        finally:
+            db.close()
+
+
+# Global instance
+project_events = ProjectEventBroadcaster()
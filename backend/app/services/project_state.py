@@ -0,0 +1,131 @@
+"""
+Buffered, short-lived-session writer for project state changes made by workflows.
+
+Workflows run for minutes, so they must not hold a pooled connection (or the
+request-scoped session, which is closed by then) for their whole lifetime.
+Instead each workflow records field changes on a ``ProjectStateWriter``; changes
+are merged in memory and written with a single ``UPDATE`` in its own session
+only when the workflow reaches a point worth persisting. Transitions that follow
+each other closely (e.g. ``deploying`` → ``active``) collapse into one write;
+each of them is still appended to ``project_events`` in that transaction, so
+status streams see every step.
+
+``set()`` only buffers; writes happen in ``flush()``, which runs the transaction
+in a thread so workflows never block the event loop (the API's, with the
+embedded worker) on the database.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.project import Project
+from app.services.project_events import record_event
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectStateWriter:
+    """Coalesces project field updates and flushes them in as few transactions as possible."""
+
+    def __init__(self, project_id: str, max_staleness: Optional[float] = None):
+        """
+        Args:
+            project_id: Project whose row is updated.
+            max_staleness: Seconds a buffered change may wait before ``set()``
+                schedules a flush on its own. Defaults to ``status_flush_interval_seconds``.
+        """
+        self.project_id = project_id
+        self.max_staleness = (
+            settings.status_flush_interval_seconds if max_staleness is None else max_staleness
+        )
+        self._pending: Dict[str, Any] = {}
+        self._transitions: List[Dict[str, Any]] = []
+        self._user_id: Optional[str] = None
+        self._dirty_since: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._background: Optional[asyncio.Task] = None
+        self.flush_count = 0
+
+    def set(self, **fields):
+        """
+        Buffer field changes; later values for the same field replace earlier ones.
+
+        Never writes. Once the oldest unwritten change exceeds ``max_staleness``,
+        a flush is scheduled on the running event loop.
+        """
+        self._pending.update(fields)
+        if "status" in fields:
+            self._transitions.append({
+                "status": fields["status"],
+                "error_message": fields.get("error_message"),
+                "created_at": datetime.utcnow(),
+            })
+        if self._dirty_since is None:
+            self._dirty_since = time.monotonic()
+        elif (
+            time.monotonic() - self._dirty_since >= self.max_staleness
+            and (self._background is None or self._background.done())
+        ):
+            self._background = asyncio.get_running_loop().create_task(self.flush())
+            self._background.add_done_callback(self._log_background_failure)
+
+    @property
+    def dirty(self) -> bool:
+        """Whether there are buffered changes not yet written."""
+        return bool(self._pending)
+
+    async def flush(self):
+        """
+        Write all buffered changes in one short transaction.
+
+        Changes are put back into the buffer if the write fails, so a later
+        flush retries them.
+        """
+        async with self._lock:
+            if not self._pending:
+                return
+
+            fields, transitions = self._pending, self._transitions
+            self._pending, self._transitions, self._dirty_since = {}, [], None
+            try:
+                await asyncio.to_thread(self._write, fields, transitions)
+            except BaseException:
+                # Newer changes buffered meanwhile take precedence
+                self._pending = {**fields, **self._pending}
+                self._transitions = transitions + self._transitions
+                self._dirty_since = self._dirty_since or time.monotonic()
+                raise
+
+            self.flush_count += 1
+            logger.debug(f"Flushed project {self.project_id} state: {sorted(fields)}")
+
+    def _write(self, fields: Dict[str, Any], transitions: List[Dict[str, Any]]):
+        db = SessionLocal()
+        try:
+            db.query(Project).filter(Project.id == self.project_id).update(
+                {getattr(Project, name): value for name, value in fields.items()},
+                synchronize_session=False,
+            )
+            if transitions:
+                if self._user_id is None:
+                    self._user_id = db.query(Project.user_id).filter(
+                        Project.id == self.project_id
+                    ).scalar()
+                # No owner means the project was deleted while its workflow ran
+                if self._user_id is not None:
+                    for transition in transitions:
+                        record_event(db, self.project_id, self._user_id, **transition)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _log_background_failure(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Flushing project {self.project_id} state failed: {task.exception()}")
@@ -0,0 +1,438 @@
+"""
+Project creation workflows executed by the job worker.
+
+Each workflow is a step graph (see ``app.services.workflow_engine``). Repository
+creation does not depend on the rendered files, so it runs concurrently with
+rendering and code generation; pushing waits for both.
+
+Steps with external side effects are checkpointed, so re-running a failed
+workflow (``POST /projects/{id}/retry``) resumes at the first incomplete step
+instead of colliding with the repository created by the previous attempt.
+
+A workflow cancelled through ``POST /projects/{id}/cancel`` stops at the next
+step boundary and deletes only what it had already created (the ArgoCD
+application, then the repository). Deleting a project that is still being
+created cancels it the same way, then runs the deletion.
+
+Deleting a project (``DELETE /projects/{id}`` and ``DELETE /projects``) is a
+job as well: the ArgoCD application and GitHub repository are deleted
+concurrently, then the project's records are removed and a final ``deleted``
+status event is recorded.
+"""
+import asyncio
+import logging
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.job import ProjectJob
+from app.models.project import Project
+from app.models.project_event import ProjectEvent
+from app.models.workflow_step import ProjectWorkflowStep
+from app.services.codegen_cache import codegen_cache
+from app.services.project_events import record_event
+from app.services.project_state import ProjectStateWriter
+from app.services.render_cache import write_rendered_file
+from app.services.template_engine import template_engine
+from app.services.github_service import github_service
+from app.services.argocd_service import argocd_service
+from app.services.repo_pool import repo_pool
+from app.services.workflow_checkpoints import CheckpointStore
+from app.services.workflow_engine import Step, WorkflowCancelled, WorkflowGraph
+from app.core.executors import run_blocking, run_cpu_bound
+from app.core.metrics import project_creation_total, background_tasks_active
+
+logger = logging.getLogger(__name__)
+
+
+def _write_camel_routes(project_path: Path, routes_content: str):
+    """Write uploaded Camel routes into a rendered camel-yaml-api project."""
+    routes_file = project_path / "src" / "main" / "resources" / "camel" / "routes.yaml"
+    routes_file.parent.mkdir(parents=True, exist_ok=True)
+    write_rendered_file(routes_file, routes_content)
+
+
+def _render_step(template_name: str, project_name: str, variables: dict) -> Step:
+    """Step that renders a template into a staging directory, released once consumed."""
+
+    async def render():
+        logger.info(f"Rendering template: {template_name}")
+        return await run_blocking(
+            "render",
+            template_engine.render_template,
+            template_name=template_name,
+            project_name=project_name,
+            variables=variables
+        )
+
+    async def cleanup(rendered_path: Path):
+        await run_blocking("render", template_engine.cleanup_rendered_template, rendered_path)
+
+    return Step("render", render, cleanup=cleanup)
+
+
+def _repository_steps(
+    state: ProjectStateWriter,
+    project_name: str,
+    description: str,
+    after: Tuple[str, ...] = ()
+) -> List[Step]:
+    """
+    Steps shared by all workflows: create the GitHub repository (or claim one
+    from the repository pool), push the
+    rendered project once the steps in ``after`` have modified it, and
+    register it with ArgoCD. Repository and application are deleted again if
+    the workflow is cancelled.
+    """
+
+    async def create_repo():
+        pooled = None
+        if settings.repo_pool_enabled:
+            pooled = await run_blocking("github", repo_pool.claim, project_name, description, False)
+        if pooled:
+            repo_url, clone_url = pooled
+        else:
+            logger.info(f"Creating GitHub repository: {project_name}")
+            repo_url, clone_url = await run_blocking(
+                "github",
+                github_service.create_repository,
+                repo_name=project_name,
+                description=description,
+                private=False
+            )
+        state.set(github_repo_url=repo_url, github_repo_name=project_name)
+        return repo_url, clone_url
+
+    async def delete_repo(_created):
+        logger.info(f"Deleting GitHub repository of cancelled project: {project_name}")
+        await run_blocking("github", github_service.delete_repository, project_name)
+
+    async def push(render, create_repo, **_after):
+        logger.info(f"Pushing files to GitHub repository: {project_name}")
+        await run_blocking(
+            "github",
+            github_service.push_files,
+            repo_name=project_name,
+            project_path=render
+        )
+        # GitHub Actions builds the image from here
+        state.set(status="building")
+        await state.flush()
+
+    async def argocd(create_repo, push):
+        _, clone_url = create_repo
+        logger.info(f"Creating ArgoCD application: {project_name}")
+        # Failures (after retries) fail the step and the project; a retry of the
+        # project resumes here, with the repository and push checkpointed
+        await argocd_service.create_application(
+            app_name=project_name,
+            repo_url=clone_url,
+            path="helm",
+            auto_sync=True
+        )
+        state.set(argocd_app_name=project_name, status="deploying")
+        logger.info(f"ArgoCD application created: {project_name}")
+
+        # In a real scenario, we would poll ArgoCD for deployment status
+        # For now, mark as active
+        state.set(status="active", error_message=None)
+        return True
+
+    async def delete_argocd_app(created):
+        if created:
+            logger.info(f"Deleting ArgoCD application of cancelled project: {project_name}")
+            await argocd_service.delete_application(project_name)
+
+    return [
+        Step("create_repo", create_repo, checkpoint=True, compensate=delete_repo),
+        Step("push", push, requires=("render", "create_repo", *after), checkpoint=True),
+        Step("argocd", argocd, requires=("create_repo", "push"), checkpoint=True, compensate=delete_argocd_app),
+    ]
+
+
+async def _run_workflow(
+    graph: WorkflowGraph,
+    state: ProjectStateWriter,
+    project_name: str,
+    template_type: str,
+    cancel: Optional[asyncio.Event] = None
+):
+    """Run a workflow graph, recording the project's outcome and metrics."""
+    background_tasks_active.inc()
+    try:
+        if cancel is None or not cancel.is_set():
+            state.set(status="creating_repo")
+            await state.flush()
+
+        logger.info(f"Starting {graph.name} workflow for: {project_name}")
+        await graph.run(
+            checkpoints=CheckpointStore(state.project_id),
+            template_type=template_type,
+            cancel=cancel
+        )
+
+        await state.flush()
+        project_creation_total.labels(status="success", template_type=template_type).inc()
+        logger.info(f"Project creation completed: {project_name}")
+
+    except WorkflowCancelled as e:
+        fields = {"status": "cancelled", "error_message": None}
+        if "create_repo" in e.compensated:
+            fields.update(github_repo_url=None, github_repo_name=None)
+        if "argocd" in e.compensated:
+            fields.update(argocd_app_name=None)
+        if e.failures:
+            fields["error_message"] = "Cancelled, but cleanup failed: " + "; ".join(
+                f"{step}: {error}" for step, error in e.failures.items()
+            )
+        if await asyncio.to_thread(_deletion_queued, state.project_id):
+            # Cancelled by DELETE; the deletion job runs next and removes the project
+            fields["status"] = "deleting"
+        state.set(**fields)
+        await state.flush()
+        project_creation_total.labels(status="cancelled", template_type=template_type).inc()
+        logger.info(f"Project creation cancelled: {project_name} (undid {e.compensated})")
+
+    except Exception as e:
+        logger.error(f"Project creation failed: {e}")
+        state.set(status="failed", error_message=str(e))
+        await state.flush()
+        project_creation_total.labels(status="failed", template_type=template_type).inc()
+
+    finally:
+        background_tasks_active.dec()
+
+
+async def create_project_workflow(
+    project_id: str,
+    project_name: str,
+    template_type: str,
+    description: str,
+    variables: dict,
+    cancel: Optional[asyncio.Event] = None
+):
+    """
+    Workflow for template-based project creation, executed by the job worker.
+
+    Args:
+        project_id: Database project ID.
+        project_name: Name of the project.
+        template_type: Template to use.
+        description: Project description.
+        variables: Template variables.
+        cancel: Set by the worker when the project's cancellation is requested.
+    """
+    state = ProjectStateWriter(project_id)
+    graph = WorkflowGraph("create_project", [
+        _render_step(template_type, project_name, variables),
+        *_repository_steps(state, project_name, description),
+    ])
+    await _run_workflow(graph, state, project_name, template_type, cancel)
+
+
+async def create_openapi_project_workflow(
+    project_id: str,
+    project_name: str,
+    description: str,
+    spec_content: str,
+    file_format: str,
+    port: str,
+    cancel: Optional[asyncio.Event] = None
+):
+    """
+    Workflow for OpenAPI-based project creation, executed by the job worker.
+
+    Args:
+        project_id: Database project ID.
+        project_name: Name of the project.
+        description: Project description.
+        spec_content: OpenAPI specification content.
+        file_format: "yaml" or "json".
+        port: Application port.
+        cancel: Set by the worker when the project's cancellation is requested.
+    """
+    from app.services.openapi_generator_service import generator_version, openapi_generator
+
+    state = ProjectStateWriter(project_id)
+
+    async def codegen():
+        key = codegen_cache.key(generator_version(), spec_content, file_format, project_name, port)
+        cached = await run_blocking("render", codegen_cache.get, key)
+        if cached is not None:
+            logger.info("Reusing generated code for the OpenAPI spec")
+            return cached
+
+        logger.info("Parsing OpenAPI spec and generating code")
+        _, models_code, main_code, tests_code = await run_cpu_bound(
+            openapi_generator.generate_project,
+            spec_content=spec_content,
+            file_format=file_format,
+            project_name=project_name,
+            description=description,
+            port=port,
+        )
+        await run_blocking("render", codegen_cache.put, key, (models_code, main_code, tests_code))
+        return models_code, main_code, tests_code
+
+    async def inject(codegen, render):
+        logger.info("Injecting generated Python code")
+        models_code, main_code, tests_code = codegen
+        await run_blocking(
+            "render",
+            openapi_generator.inject_generated_code,
+            project_path=render,
+            models_code=models_code,
+            main_code=main_code,
+            tests_code=tests_code,
+            spec_content=spec_content,
+            file_format=file_format,
+        )
+
+    graph = WorkflowGraph("create_openapi_project", [
+        Step("codegen", codegen),
+        _render_step("openapi-microservice", project_name, {"description": description, "port": port}),
+        Step("inject", inject, requires=("codegen", "render")),
+        *_repository_steps(state, project_name, description, after=("inject",)),
+    ])
+    await _run_workflow(graph, state, project_name, "openapi-microservice", cancel)
+
+
+async def create_camel_yaml_project_workflow(
+    project_id: str,
+    project_name: str,
+    description: str,
+    routes_content: str,
+    port: str,
+    cancel: Optional[asyncio.Event] = None
+):
+    """
+    Workflow for Camel YAML-based project creation, executed by the job worker.
+
+    Args:
+        project_id: Database project ID.
+        project_name: Name of the project.
+        description: Project description.
+        routes_content: Camel YAML DSL routes content.
+        port: Application port.
+        cancel: Set by the worker when the project's cancellation is requested.
+    """
+    state = ProjectStateWriter(project_id)
+
+    async def inject(render):
+        await run_blocking("render", _write_camel_routes, render, routes_content)
+        logger.info("Injected Camel YAML routes into project")
+
+    graph = WorkflowGraph("create_camel_yaml_project", [
+        _render_step("camel-yaml-api", project_name, {"description": description, "port": port}),
+        Step("inject", inject, requires=("render",)),
+        *_repository_steps(state, project_name, description, after=("inject",)),
+    ])
+    await _run_workflow(graph, state, project_name, "camel-yaml-api", cancel)
+
+
+def _deletion_queued(project_id: str) -> bool:
+    """Whether a deletion job of the project is waiting to run."""
+    db = SessionLocal()
+    try:
+        return db.query(ProjectJob.id).filter(
+            ProjectJob.project_id == project_id,
+            ProjectJob.kind == "delete_project",
+            ProjectJob.status == "queued",
+        ).first() is not None
+    finally:
+        db.close()
+
+
+def _delete_records(project_id: str):
+    """Remove a project with its jobs, workflow checkpoints and events, leaving a ``deleted`` event."""
+    db = SessionLocal()
+    try:
+        user_id = db.query(Project.user_id).filter(Project.id == project_id).scalar()
+        db.query(ProjectJob).filter(ProjectJob.project_id == project_id).delete(synchronize_session=False)
+        db.query(ProjectWorkflowStep).filter(
+            ProjectWorkflowStep.project_id == project_id
+        ).delete(synchronize_session=False)
+        db.query(ProjectEvent).filter(ProjectEvent.project_id == project_id).delete(synchronize_session=False)
+        db.query(Project).filter(Project.id == project_id).delete(synchronize_session=False)
+        if user_id is not None:
+            # Outlives the project, so open streams can drop it from their lists
+            record_event(db, project_id, user_id, "deleted")
+        db.commit()
+    finally:
+        db.close()
+
+
+def _load_resources(project_id: str) -> Tuple[Optional[str], Optional[str], str]:
+    """Get the ArgoCD application and GitHub repository names and template of a project."""
+    db = SessionLocal()
+    try:
+        row = db.query(Project.argocd_app_name, Project.github_repo_name, Project.template_type).filter(
+            Project.id == project_id
+        ).first()
+        if row is None:
+            return None, None, "unknown"
+        return row.argocd_app_name, row.github_repo_name, row.template_type
+    finally:
+        db.close()
+
+
+async def delete_project_workflow(
+    project_id: str,
+    project_name: str,
+    cancel: Optional[asyncio.Event] = None
+):
+    """
+    Workflow for project deletion, executed by the job worker.
+
+    The ArgoCD application (which removes the Kubernetes resources) and the
+    GitHub repository are deleted concurrently. As before deletion moved to the
+    worker, a failure to delete either is logged and the project record is
+    removed regardless.
+
+    Args:
+        project_id: Database project ID.
+        project_name: Name of the project, for logging.
+        cancel: Unused; deletions cannot be cancelled.
+    """
+    argocd_app_name, github_repo_name, template_type = await asyncio.to_thread(
+        _load_resources, project_id
+    )
+
+    async def delete_argocd():
+        if not argocd_app_name:
+            return
+        try:
+            logger.info(f"Deleting ArgoCD application: {argocd_app_name}")
+            await argocd_service.delete_application(argocd_app_name)
+        except Exception as e:
+            logger.warning(f"Failed to delete ArgoCD application: {e}")
+
+    async def delete_repo():
+        if not github_repo_name:
+            return
+        try:
+            logger.info(f"Deleting GitHub repository: {github_repo_name}")
+            await run_blocking("github", github_service.delete_repository, github_repo_name)
+        except Exception as e:
+            logger.warning(f"Failed to delete GitHub repository: {e}")
+
+    async def delete_record(delete_argocd, delete_repo):
+        await asyncio.to_thread(_delete_records, project_id)
+
+    graph = WorkflowGraph("delete_project", [
+        Step("delete_argocd", delete_argocd),
+        Step("delete_repo", delete_repo),
+        Step("delete_record", delete_record, requires=("delete_argocd", "delete_repo")),
+    ])
+    await graph.run(template_type=template_type)
+    logger.info(f"Project deleted successfully: {project_name}")
+
+
+# Job kind -> workflow coroutine, used by the worker to dispatch claimed jobs
+WORKFLOWS = {
+    "create_project": create_project_workflow,
+    "create_openapi_project": create_openapi_project_workflow,
+    "create_camel_yaml_project": create_camel_yaml_project_workflow,
+    "delete_project": delete_project_workflow,
+}
@@ -0,0 +1,229 @@
+"""
+On-disk cache of rendered projects.
+
+Rendering a template is a pure function of the template's content and the
+context it is rendered with, so rendered trees are stored under
+``render_cache_dir`` keyed by a hash of both (``RenderCache.key``). Retries of
+a workflow, and projects created twice with the same name and settings, reuse
+the stored tree instead of rendering again.
+
+A hit is materialized by hardlinking the cached files into the output directory,
+which costs one ``link`` per file whatever the file sizes (it falls back to
+copying when the output directory is on another filesystem). Cached files and
+their links share an inode, so code that changes a rendered file must replace
+it with ``write_rendered_file`` instead of writing into it.
+
+Entries are evicted least recently used first once the cache outgrows
+``render_cache_max_mb``. Recency is the entry directory's modification time,
+touched on every hit, so API and worker processes sharing the cache directory
+evict consistently.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import render_cache_bytes, render_cache_requests_total
+
+logger = logging.getLogger(__name__)
+
+TMP_PREFIX = ".tmp-"
+# Staging directories older than this were left behind by a crashed process
+STALE_TMP_SECONDS = 3600
+
+
+def write_rendered_file(path: Path, content: str):
+    """
+    Write a text file in a rendered project.
+
+    The existing file is unlinked first, so a file hardlinked to the render
+    cache gets a new inode and the cached copy is left intact.
+
+    Args:
+        path: File to write.
+        content: New file content.
+    """
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+    path.write_text(content)
+
+
+def _tree_size(path: Path) -> int:
+    """Total size of the files below a directory."""
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.lstat(os.path.join(root, name)).st_size
+            except FileNotFoundError:
+                pass
+    return size
+
+
+def _link_tree(source: Path, target: Path):
+    """Recreate a directory tree at ``target``, hardlinking files where possible."""
+    for root, _, files in os.walk(source):
+        destination = target / os.path.relpath(root, source)
+        destination.mkdir(parents=True, exist_ok=True)
+        shutil.copymode(root, destination)
+        for name in files:
+            try:
+                os.link(os.path.join(root, name), destination / name)
+            except OSError as e:
+                if isinstance(e, FileNotFoundError):
+                    raise
+                # Cross-device or unsupported link: fall back to a copy
+                shutil.copy2(os.path.join(root, name), destination / name)
+
+
+class RenderCache:
+    """Content-addressed LRU cache of rendered project trees."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sizes: Dict[str, int] = {}  # Entry sizes, measured once per entry
+
+    @property
+    def directory(self) -> Path:
+        return Path(settings.render_cache_dir)
+
+    def key(self, template_version: str, extra_context: Dict[str, Any]) -> str:
+        """
+        Cache key of a render.
+
+        Args:
+            template_version: Content hash of the template (``TemplateRenderer.version``).
+            extra_context: Full context the template is rendered with.
+
+        Returns:
+            Hex digest identifying the rendered tree.
+        """
+        payload = json.dumps(
+            {"template": template_version, "context": extra_context},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def lookup(self, key: str, output_dir: Path) -> Optional[Path]:
+        """
+        Recreate a cached rendered project in an output directory, if cached.
+
+        Args:
+            key: Cache key from ``key``.
+            output_dir: Empty directory the project is created in.
+
+        Returns:
+            Path to the project directory, or None on a cache miss.
+        """
+        result_path = self.materialize(key, output_dir)
+        outcome = "miss" if result_path is None else "hit"
+        render_cache_requests_total.labels(outcome=outcome).inc()
+        return result_path
+
+    def materialize(self, key: str, output_dir: Path) -> Optional[Path]:
+        """Hardlink a cache entry into ``output_dir``; None if it is not (or no longer) cached."""
+        entry = self.directory / key
+        try:
+            projects = os.listdir(entry)
+        except FileNotFoundError:
+            return None
+
+        try:
+            for name in projects:
+                _link_tree(entry / name, output_dir / name)
+            os.utime(entry)
+        except FileNotFoundError:
+            # Evicted by another process while linking
+            for name in projects:
+                shutil.rmtree(output_dir / name, ignore_errors=True)
+            return None
+        return output_dir / projects[0]
+
+    def store(self, key: str, rendered) -> Optional[Path]:
+        """
+        Add a rendered project to the cache and evict old entries over the budget.
+
+        Args:
+            key: Cache key from ``key``.
+            rendered: ``RenderedProject`` from the native renderer.
+
+        Returns:
+            Path of the cache entry, or None if it could not be written
+            (callers then write the project directly).
+        """
+        entry = self.directory / key
+        staging = self.directory / f"{TMP_PREFIX}{uuid.uuid4().hex}"
+        try:
+            staging.mkdir(parents=True)
+            rendered.write(staging)
+            try:
+                os.rename(staging, entry)
+            except OSError:
+                # Stored concurrently by another worker; keep theirs
+                shutil.rmtree(staging, ignore_errors=True)
+                return entry if entry.is_dir() else None
+        except OSError as e:
+            logger.warning(f"Could not write render cache entry {key[:12]}: {e}")
+            shutil.rmtree(staging, ignore_errors=True)
+            return None
+
+        self.evict()
+        return entry
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits its budget.
+
+        Returns:
+            Number of entries removed.
+        """
+        budget = settings.render_cache_max_mb * 1024 * 1024
+        with self._lock:
+            entries = []
+            try:
+                names = os.listdir(self.directory)
+            except FileNotFoundError:
+                return 0
+            for name in names:
+                path = self.directory / name
+                try:
+                    used = os.stat(path).st_mtime
+                except FileNotFoundError:
+                    continue
+                if name.startswith(TMP_PREFIX):
+                    if used < time.time() - STALE_TMP_SECONDS:
+                        shutil.rmtree(path, ignore_errors=True)
+                    continue
+                if name not in self._sizes:
+                    self._sizes[name] = _tree_size(path)
+                entries.append((used, name))
+            for name in set(self._sizes) - set(names):
+                del self._sizes[name]
+
+            total = sum(self._sizes.values())
+            removed = 0
+            for _, name in sorted(entries):
+                if total <= budget:
+                    break
+                shutil.rmtree(self.directory / name, ignore_errors=True)
+                total -= self._sizes.pop(name)
+                removed += 1
+
+        render_cache_bytes.set(total)
+        if removed:
+            logger.info(f"Evicted {removed} render cache entries")
+        return removed
+
+
+# Global instance
+render_cache = RenderCache()
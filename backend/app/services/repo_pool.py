@@ -0,0 +1,271 @@
+"""
+Pool of pre-provisioned GitHub repositories.
+
+Creating a repository is usually the slowest GitHub call of a workflow. With
+``repo_pool_enabled``, workers keep empty placeholder repositories ready in the
+organisation, and the ``create_repo`` step claims one and renames it to the
+project's name instead of creating a repository. When the pool is empty (or a
+placeholder cannot be renamed), the step creates the repository as before.
+
+The pool follows demand: the filler aims for as many placeholders as
+repositories were requested in the last ``repo_pool_window_minutes``, bounded by
+``repo_pool_min_size`` and ``repo_pool_max_size``. A placeholder row is written
+before its repository is created, so fillers of several workers see each
+other's work in progress and do not overfill the pool. A row stuck in
+``provisioning`` (its filler died) may already have a repository behind it,
+so that repository is deleted before the row is dropped.
+
+Claiming marks a row ``claimed`` and the row is only removed once the rename
+succeeded. A claim that never completes (its worker died mid-rename) is settled
+by the filler: if GitHub still knows the placeholder under its own name it goes
+back to ``ready``, otherwise it was renamed into a project's repository (or is
+gone) and only the row is dropped.
+"""
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import func
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import repo_pool_claims_total, repo_pool_ready, repo_pool_target_size
+from app.models.job import ProjectJob
+from app.models.repo_pool import PooledRepository
+from app.services.github_service import github_service
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_DESCRIPTION = "Reserved by the IDP platform for a new project"
+# Placeholders still provisioning after this long belong to a filler that died
+PROVISIONING_TIMEOUT = timedelta(minutes=10)
+# Claims still open after this long belong to a workflow that died mid-rename
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+class RepoPool:
+    """Claims placeholder repositories for workflows and keeps the pool filled."""
+
+    def claim(
+        self,
+        project_name: str,
+        description: str = "",
+        private: bool = False
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Take a placeholder repository from the pool and rename it for a project.
+
+        Blocking; run it in the ``github`` executor.
+
+        Args:
+            project_name: Name the repository is renamed to.
+            description: Repository description.
+            private: Whether the repository should be private.
+
+        Returns:
+            Tuple of (repo_url, clone_url), or None if no placeholder could be used
+            and the caller has to create the repository itself.
+        """
+        db = SessionLocal()
+        try:
+            entry = (
+                db.query(PooledRepository)
+                .filter(PooledRepository.status == "ready")
+                .order_by(PooledRepository.created_at)
+                .with_for_update(skip_locked=True)
+                .first()
+            )
+            entry_id, placeholder = (entry.id, entry.repo_name) if entry is not None else (None, None)
+            # Guarded for SQLite, which ignores SKIP LOCKED
+            if placeholder is not None and not db.query(PooledRepository).filter(
+                PooledRepository.id == entry_id,
+                PooledRepository.status == "ready",
+            ).update(
+                {PooledRepository.status: "claimed", PooledRepository.claimed_at: datetime.utcnow()},
+                synchronize_session=False,
+            ):
+                placeholder = None
+            db.commit()
+        finally:
+            db.close()
+
+        if placeholder is None:
+            repo_pool_claims_total.labels(outcome="miss").inc()
+            return None
+
+        try:
+            urls = github_service.rename_repository(
+                placeholder, project_name, description=description, private=private
+            )
+        except Exception as e:
+            logger.warning(f"Could not use pooled repository {placeholder}: {e}")
+            repo_pool_claims_total.labels(outcome="miss").inc()
+            # Left claimed if GitHub cannot tell yet; the filler settles it after CLAIM_TIMEOUT
+            self._settle_claim(entry_id, placeholder)
+            return None
+
+        # The placeholder is the project's repository now; a failure here leaves a claim to settle
+        self._update(entry_id, None)
+        repo_pool_claims_total.labels(outcome="hit").inc()
+        logger.info(f"Claimed pooled repository {placeholder} for {project_name}")
+        return urls
+
+    def target_size(self) -> int:
+        """Number of placeholders the pool should hold for the recent creation rate."""
+        since = datetime.utcnow() - timedelta(minutes=settings.repo_pool_window_minutes)
+        db = SessionLocal()
+        try:
+            recent = (
+                db.query(func.count(ProjectJob.id))
+                .filter(ProjectJob.kind.like("create_%"), ProjectJob.created_at >= since)
+                .scalar()
+            )
+        finally:
+            db.close()
+        target = min(max(recent, settings.repo_pool_min_size), settings.repo_pool_max_size)
+        repo_pool_target_size.set(target)
+        return target
+
+    def fill(self) -> int:
+        """
+        Create placeholder repositories until the pool reaches its target size.
+
+        Blocking; run it in the ``github`` executor. Stops at the first GitHub
+        failure and tries again on the next call.
+
+        Returns:
+            Number of placeholders created.
+        """
+        self._expire_stale()
+        target = self.target_size()
+        created = 0
+
+        while True:
+            db = SessionLocal()
+            try:
+                counts = dict(
+                    db.query(PooledRepository.status, func.count(PooledRepository.id))
+                    .group_by(PooledRepository.status)
+                    .all()
+                )
+                repo_pool_ready.set(counts.get("ready", 0))
+                # Claimed placeholders are on their way out of the pool
+                if counts.get("ready", 0) + counts.get("provisioning", 0) >= target:
+                    return created
+
+                entry = PooledRepository(
+                    repo_name=f"{settings.repo_pool_prefix}{uuid.uuid4().hex[:12]}",
+                    status="provisioning",
+                )
+                db.add(entry)
+                db.commit()
+                entry_id, repo_name = entry.id, entry.repo_name
+            finally:
+                db.close()
+
+            try:
+                github_service.create_repository(repo_name, description=PLACEHOLDER_DESCRIPTION, private=True)
+            except Exception as e:
+                logger.warning(f"Failed to provision pooled repository {repo_name}: {e}")
+                # The repository may exist if the failure came after GitHub created it
+                self._discard(repo_name, missing_ok=True)
+                self._update(entry_id, None)
+                return created
+
+            if not self._update(entry_id, "ready"):
+                # Expired as stale by another filler meanwhile
+                self._discard(repo_name, missing_ok=True)
+                return created
+            created += 1
+            logger.info(f"Provisioned pooled repository {repo_name}")
+
+    def _update(self, entry_id: str, status: Optional[str]) -> bool:
+        """Set a placeholder's status, or remove its row if ``status`` is None; False if the row is gone."""
+        db = SessionLocal()
+        try:
+            query = db.query(PooledRepository).filter(PooledRepository.id == entry_id)
+            if status is None:
+                changed = query.delete(synchronize_session=False)
+            else:
+                changed = query.update(
+                    {
+                        PooledRepository.status: status,
+                        PooledRepository.claimed_at: datetime.utcnow() if status == "claimed" else None,
+                    },
+                    synchronize_session=False,
+                )
+            db.commit()
+        finally:
+            db.close()
+        return bool(changed)
+
+    def _expire_stale(self):
+        """
+        Clean up after fillers and claims that died.
+
+        Placeholders stuck provisioning have their repositories deleted, then
+        their rows. Claims stuck mid-rename are settled by ``_settle_claim``.
+        """
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            stale = db.query(PooledRepository.id, PooledRepository.repo_name).filter(
+                PooledRepository.status == "provisioning",
+                PooledRepository.created_at < now - PROVISIONING_TIMEOUT,
+            ).all()
+            stale_claims = db.query(PooledRepository.id, PooledRepository.repo_name).filter(
+                PooledRepository.status == "claimed",
+                PooledRepository.claimed_at < now - CLAIM_TIMEOUT,
+            ).all()
+        finally:
+            db.close()
+
+        settled = sum(self._settle_claim(entry_id, repo_name) for entry_id, repo_name in stale_claims)
+        if settled:
+            logger.warning(f"Settled {settled} pooled repository claims that never completed")
+
+        expired = 0
+        for entry_id, repo_name in stale:
+            # Rows whose repository cannot be deleted yet are kept for the next fill
+            if self._discard(repo_name, missing_ok=True):
+                self._update(entry_id, None)
+                expired += 1
+        if expired:
+            logger.warning(f"Dropped {expired} pooled repositories stuck provisioning")
+
+    def _settle_claim(self, entry_id: str, repo_name: str) -> bool:
+        """
+        Resolve a claim whose rename did not complete.
+
+        A placeholder GitHub still knows under its own name was never renamed
+        and goes back to ``ready``. Otherwise it is gone, or the rename went
+        through and it belongs to a project now; either way only the row is
+        dropped, since deleting by the old name would follow GitHub's redirect.
+
+        Returns:
+            False if GitHub could not be asked, so the claim is kept for later.
+        """
+        try:
+            current_name = github_service.repository_name(repo_name)
+        except Exception as e:
+            logger.warning(f"Failed to look up claimed pooled repository {repo_name}: {e}")
+            return False
+        if current_name is not None and current_name.lower() == repo_name.lower():
+            self._update(entry_id, "ready")
+        else:
+            self._update(entry_id, None)
+        return True
+
+    def _discard(self, repo_name: str, missing_ok: bool = False) -> bool:
+        """Best-effort removal of a placeholder repository; returns whether it is gone."""
+        try:
+            github_service.delete_repository(repo_name, missing_ok=missing_ok)
+        except Exception as e:
+            logger.warning(f"Failed to delete unusable pooled repository {repo_name}: {e}")
+            return False
+        return True
+
+
+# Global instance
+repo_pool = RepoPool()
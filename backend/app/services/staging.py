@@ -0,0 +1,202 @@
+"""
+Staging area for rendered projects (``settings.temp_dir``).
+
+Every render gets its own directory, created by ``StagingArea.create`` with an
+owner marker (host and process id) and removed by ``StagingArea.remove`` once
+the workflow has pushed it. Directories can still be left behind, by a worker
+that was killed mid-workflow for instance, so workers run ``sweep`` periodically
+to remove directories that are older than ``staging_ttl_minutes`` or whose
+owning process is gone.
+
+Renders are gated by a disk budget: ``create`` blocks while the staging area is
+above ``staging_max_mb`` or its filesystem has less than ``staging_min_free_mb``
+free, sweeping orphaned directories meanwhile, and raises ``StagingFull`` after
+``staging_budget_wait_seconds``. Usage is the apparent size of the files, which
+over-counts files hardlinked from the render cache.
+"""
+import logging
+import os
+import shutil
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Set, Tuple
+
+from app.core.config import settings
+from app.core.metrics import staging_bytes, staging_directories_removed_total, staging_files
+
+logger = logging.getLogger(__name__)
+
+OWNER_FILE = ".idp-owner"
+# Directories without an owner marker are only swept after this long (created by
+# an older release, or the marker is about to be written)
+UNOWNED_GRACE_SECONDS = 300
+# Staging usage measured more recently than this is reused by ``create``
+USAGE_MAX_AGE_SECONDS = 1.0
+
+
+class StagingFull(Exception):
+    """Raised when the staging area stays over its disk budget."""
+
+
+def _pid_alive(pid: int) -> bool:
+    """Whether a process with this id exists on this host."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class StagingArea:
+    """Creates, tracks and garbage-collects render staging directories."""
+
+    def __init__(self):
+        self.root = Path(settings.temp_dir).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.owner = f"{socket.gethostname()} {os.getpid()}"
+        self._active: Set[str] = set()  # Directories created by this process and not yet removed
+        self._lock = threading.Lock()
+        self._usage: Tuple[int, int] = (0, 0)
+        self._measured_at = 0.0
+
+    def create(self, project_name: str) -> Path:
+        """
+        Create a staging directory for rendering a project.
+
+        Blocks while the staging area is over its disk budget.
+
+        Args:
+            project_name: Project the directory is for (used in its name).
+
+        Returns:
+            Path to the new, empty directory (apart from its owner marker).
+
+        Raises:
+            StagingFull: If the budget is still exceeded after ``staging_budget_wait_seconds``.
+        """
+        deadline = time.monotonic() + settings.staging_budget_wait_seconds
+        reason = self._over_budget()
+        while reason:
+            if time.monotonic() >= deadline:
+                raise StagingFull(f"Staging area {self.root} is full: {reason}")
+            logger.warning(f"Waiting for staging space: {reason}")
+            time.sleep(1.0)
+            self.sweep()
+            reason = self._over_budget()
+
+        output_dir = self.root / f"{project_name}-{os.urandom(4).hex()}"
+        # Registered first, so a concurrent sweep never sees it unowned
+        with self._lock:
+            self._active.add(str(output_dir))
+        output_dir.mkdir(parents=True, exist_ok=True)
+        (output_dir / OWNER_FILE).write_text(self.owner)
+        return output_dir
+
+    def remove(self, output_dir: Path):
+        """
+        Remove a staging directory created by ``create``.
+
+        Args:
+            output_dir: Directory returned by ``create``.
+        """
+        shutil.rmtree(output_dir, ignore_errors=True)
+        with self._lock:
+            self._active.discard(str(output_dir))
+
+    def usage(self) -> Tuple[int, int]:
+        """
+        Measure the staging area and export it as gauges.
+
+        Returns:
+            Tuple of (total file bytes, file count).
+        """
+        total = files = 0
+        for root, _, names in os.walk(self.root):
+            for name in names:
+                try:
+                    total += os.lstat(os.path.join(root, name)).st_size
+                except FileNotFoundError:
+                    continue
+                files += 1
+        staging_bytes.set(total)
+        staging_files.set(files)
+        self._usage, self._measured_at = (total, files), time.monotonic()
+        return total, files
+
+    @property
+    def last_usage(self) -> Tuple[int, int]:
+        """(bytes, files) as of the last ``usage`` measurement, without walking the tree."""
+        return self._usage
+
+    def sweep(self) -> int:
+        """
+        Remove expired and orphaned staging directories.
+
+        Returns:
+            Number of directories removed.
+        """
+        removed = 0
+        try:
+            entries = list(os.scandir(self.root))
+        except FileNotFoundError:
+            return 0
+
+        expires = time.time() - settings.staging_ttl_minutes * 60
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            try:
+                modified = entry.stat(follow_symlinks=False).st_mtime
+            except FileNotFoundError:
+                continue
+            if modified < expires:
+                reason = "expired"
+            elif self._orphaned(Path(entry.path), modified):
+                reason = "orphaned"
+            else:
+                continue
+
+            logger.info(f"Removing {reason} staging directory {entry.path}")
+            self.remove(Path(entry.path))
+            staging_directories_removed_total.labels(reason=reason).inc()
+            removed += 1
+
+        self.usage()
+        return removed
+
+    def _orphaned(self, path: Path, modified: float) -> bool:
+        """Whether no live process on this host owns a staging directory."""
+        try:
+            host, pid = (path / OWNER_FILE).read_text().rsplit(" ", 1)
+            pid = int(pid)
+        except (OSError, ValueError):
+            return modified < time.time() - UNOWNED_GRACE_SECONDS
+
+        if host != socket.gethostname():
+            # Shared volume: only the TTL applies to other hosts' directories
+            return False
+        if pid == os.getpid():
+            with self._lock:
+                return str(path) not in self._active
+        return not _pid_alive(pid)
+
+    def _over_budget(self) -> str:
+        """Reason the staging area cannot take another render, or an empty string."""
+        if time.monotonic() - self._measured_at > USAGE_MAX_AGE_SECONDS:
+            self.usage()
+        used, _ = self._usage
+        if used > settings.staging_max_mb * 1024 * 1024:
+            return f"{used // (1024 * 1024)} MB used of a {settings.staging_max_mb} MB budget"
+
+        free = shutil.disk_usage(self.root).free
+        if free < settings.staging_min_free_mb * 1024 * 1024:
+            return f"only {free // (1024 * 1024)} MB free on the volume"
+        return ""
+
+
+# Global instance
+staging_area = StagingArea()
@@ -1,26 +1,152 @@
 """
 Template engine service using Cookiecutter.
+
+Template metadata is served from an in-memory ``TemplateCatalog`` indexed by
+template name. The catalog is built on first use (at startup) and rebuilt only
+when the modification time of ``templates_dir``, of a template directory or of
+a ``cookiecutter.json`` changes, so checking it costs a few ``stat`` calls
+instead of walking the tree and parsing every ``cookiecutter.json``. While the
+template watcher (``app.services.template_watcher``) runs, even those checks are
+skipped: it calls ``reload_templates`` for the templates that changed.
+
+Projects are rendered by the native renderer (``app.services.template_renderer``),
+which compiles each template once and needs no process-wide lock. Templates it
+does not support, and deployments with ``TEMPLATE_RENDERER=cookiecutter``, are
+rendered by cookiecutter itself, in the ``cpu`` process pool unless
+``PROCESS_POOL_ENABLED=false``. Natively rendered projects are cached on disk
+(``app.services.render_cache``), so a render with the same template content and
+context is a tree of hardlinks.
 """
 import os
-import shutil
 import json
+import hashlib
 import logging
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from cookiecutter.main import cookiecutter
 
 from app.core.config import settings
+from app.core.executors import get_executor
+from app.services.render_cache import render_cache
+from app.services.staging import staging_area
+from app.services.template_renderer import UnsupportedTemplate, template_renderer
 
 logger = logging.getLogger(__name__)
 
+# cookiecutter chdir()s into the template while rendering. The working directory is
+# process-wide, so renders running on executor threads must not overlap.
+_cookiecutter_lock = threading.Lock()
+
+
+def _mtimes(paths: Tuple[str, ...]) -> Tuple[Optional[int], ...]:
+    """Modification times of paths, None for missing ones."""
+    mtimes = []
+    for path in paths:
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+def _etag(value) -> str:
+    """Strong ETag for a JSON-serializable value."""
+    digest = hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+@dataclass(frozen=True)
+class TemplateCatalog:
+    """Immutable snapshot of the available templates."""
+
+    templates: Dict[str, Dict]  # Template name -> metadata, sorted by name
+    etag: str  # ETag of the whole list
+    etags: Dict[str, str] = field(default_factory=dict)  # Template name -> ETag of its metadata
+    watched: Tuple[str, ...] = ()  # templates_dir, its subdirectories and their cookiecutter.json
+    fingerprint: Tuple = ()  # Modification times of ``watched`` the snapshot was built from
+
+    def list(self) -> List[Dict]:
+        """Metadata of all templates, sorted by name."""
+        return list(self.templates.values())
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Metadata of one template, or None if there is no such template."""
+        return self.templates.get(name)
+
 
 class TemplateEngine:
     """Service for rendering project templates using Cookiecutter."""
 
     def __init__(self):
-        self.templates_dir = Path(settings.templates_dir)
-        self.temp_dir = Path(settings.temp_dir)
+        # Absolute paths: relative ones break while another thread is inside cookiecutter's chdir
+        self.templates_dir = Path(settings.templates_dir).resolve()
+        self.temp_dir = Path(settings.temp_dir).resolve()
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self._catalog: Optional[TemplateCatalog] = None
+        self._catalog_lock = threading.Lock()
+        # Cleared while the template watcher reloads changed templates instead
+        self.check_mtimes = True
+
+    def catalog(self) -> TemplateCatalog:
+        """
+        Get the template catalog, rebuilding it if templates changed on disk.
+
+        Returns:
+            The current catalog snapshot.
+        """
+        catalog = self._catalog
+        if catalog is not None and (not self.check_mtimes or _mtimes(catalog.watched) == catalog.fingerprint):
+            return catalog
+
+        with self._catalog_lock:
+            # Another thread may have rebuilt it while we waited
+            if self._catalog is not catalog and self._catalog is not None:
+                return self._catalog
+            self._catalog = self._build_catalog()
+            return self._catalog
+
+    def reload_templates(self, names: Iterable[str]) -> TemplateCatalog:
+        """
+        Re-read the metadata of some templates, keeping the rest of the catalog.
+
+        Args:
+            names: Template directory names that were added, changed or removed.
+
+        Returns:
+            The new catalog snapshot.
+        """
+        with self._catalog_lock:
+            if self._catalog is None or not self.templates_dir.exists():
+                self._catalog = self._build_catalog()
+                return self._catalog
+
+            templates = dict(self._catalog.templates)
+            etags = dict(self._catalog.etags)
+            for name in names:
+                templates.pop(name, None)
+                etags.pop(name, None)
+                template_dir = self.templates_dir / name
+                if not (template_dir / "cookiecutter.json").is_file():
+                    continue
+                try:
+                    templates[name] = self._get_template_metadata(template_dir)
+                    etags[name] = _etag(templates[name])
+                except Exception as e:
+                    logger.error(f"Error reading template {name}: {e}")
+
+            directories = tuple(sorted(path.name for path in self.templates_dir.iterdir() if path.is_dir()))
+            watched = self._watched(directories)
+            templates = {name: templates[name] for name in sorted(templates)}
+            self._catalog = TemplateCatalog(
+                templates=templates,
+                etag=_etag(list(templates.values())),
+                etags=etags,
+                watched=watched,
+                fingerprint=_mtimes(watched),
+            )
+            return self._catalog
 
     def list_templates(self) -> List[Dict]:
         """
@@ -29,21 +155,56 @@ class TemplateEngine:
         Returns:
             List of template metadata dictionaries.
         """
-        templates = []
+        return self.catalog().list()
+
+    def get_template(self, template_name: str) -> Optional[Dict]:
+        """
+        Get metadata of one template.
+
+        Args:
+            template_name: Name of the template.
+
+        Returns:
+            Template metadata dictionary, or None if the template does not exist.
+        """
+        return self.catalog().get(template_name)
 
+    def _watched(self, directories: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Paths whose modification times change when templates are added, removed or edited."""
+        watched = [str(self.templates_dir)]
+        for name in directories:
+            watched.append(str(self.templates_dir / name))
+            watched.append(str(self.templates_dir / name / "cookiecutter.json"))
+        return tuple(watched)
+
+    def _build_catalog(self) -> TemplateCatalog:
         if not self.templates_dir.exists():
             logger.warning(f"Templates directory not found: {self.templates_dir}")
-            return templates
-
-        for template_dir in self.templates_dir.iterdir():
-            if template_dir.is_dir() and (template_dir / "cookiecutter.json").exists():
+            watched = self._watched(())
+            return TemplateCatalog(templates={}, etag=_etag([]), watched=watched, fingerprint=_mtimes(watched))
+
+        directories = tuple(sorted(path.name for path in self.templates_dir.iterdir() if path.is_dir()))
+        watched = self._watched(directories)
+        # Taken before reading, so a template changed while it is read triggers another rebuild
+        fingerprint = _mtimes(watched)
+
+        templates = {}
+        for name in directories:
+            template_dir = self.templates_dir / name
+            if (template_dir / "cookiecutter.json").exists():
                 try:
-                    metadata = self._get_template_metadata(template_dir)
-                    templates.append(metadata)
+                    templates[name] = self._get_template_metadata(template_dir)
                 except Exception as e:
-                    logger.error(f"Error reading template {template_dir.name}: {e}")
+                    logger.error(f"Error reading template {name}: {e}")
 
-        return templates
+        logger.info(f"Loaded {len(templates)} templates from {self.templates_dir}")
+        return TemplateCatalog(
+            templates=templates,
+            etag=_etag(list(templates.values())),
+            etags={name: _etag(metadata) for name, metadata in templates.items()},
+            watched=watched,
+            fingerprint=fingerprint,
+        )
 
     def _get_template_metadata(self, template_path: Path) -> Dict:
         """
@@ -107,10 +268,12 @@ class TemplateEngine:
             variables: Additional template variables.
 
         Returns:
-            Path to the rendered project directory.
+            Path to the rendered project directory. Its files may be hardlinks
+            into the render cache; change them with ``write_rendered_file``.
 
         Raises:
             ValueError: If template not found.
+            StagingFull: If the staging area stays over its disk budget.
             Exception: If rendering fails.
         """
         template_path = self.templates_dir / template_name
@@ -123,20 +286,36 @@ class TemplateEngine:
         extra_context["project_name"] = project_name
         extra_context["github_org"] = settings.github_org
 
-        # Create unique output directory
-        output_dir = self.temp_dir / f"{project_name}-{os.urandom(4).hex()}"
-        output_dir.mkdir(parents=True, exist_ok=True)
+        # Create unique output directory (waits for space if the staging area is full)
+        output_dir = staging_area.create(project_name)
 
         try:
             logger.info(f"Rendering template '{template_name}' for project '{project_name}'")
 
-            # Render template with cookiecutter
-            result_path = cookiecutter(
-                str(template_path),
-                extra_context=extra_context,
-                output_dir=str(output_dir),
-                no_input=True
-            )
+            result_path = None
+            if settings.template_renderer == "native":
+                try:
+                    result_path = self._render_native(template_path, extra_context, output_dir)
+                except UnsupportedTemplate as e:
+                    logger.info(f"Rendering with cookiecutter instead: {e}")
+
+            if result_path is None and settings.process_pool_enabled:
+                # A process of its own: cookiecutter's chdir does not affect other renders
+                result_path = get_executor("cpu").call(
+                    cookiecutter,
+                    str(template_path),
+                    extra_context=extra_context,
+                    output_dir=str(output_dir),
+                    no_input=True
+                )
+            elif result_path is None:
+                with _cookiecutter_lock:
+                    result_path = cookiecutter(
+                        str(template_path),
+                        extra_context=extra_context,
+                        output_dir=str(output_dir),
+                        no_input=True
+                    )
 
             logger.info(f"Template rendered successfully at: {result_path}")
             return Path(result_path)
@@ -144,10 +323,26 @@ class TemplateEngine:
         except Exception as e:
             logger.error(f"Failed to render template: {e}")
             # Cleanup on failure
-            if output_dir.exists():
-                shutil.rmtree(output_dir)
+            staging_area.remove(output_dir)
             raise
 
+    def _render_native(self, template_path: Path, extra_context: Dict, output_dir: Path) -> Path:
+        """Render with the native renderer, through the render cache when enabled."""
+        version = template_renderer.version(template_path) if settings.render_cache_enabled else None
+        if version is None:
+            rendered = template_renderer.render(template_path, extra_context, output_dir)
+            return rendered.write(output_dir)
+
+        key = render_cache.key(version, extra_context)
+        result_path = render_cache.lookup(key, output_dir)
+        if result_path is not None:
+            return result_path
+
+        rendered = template_renderer.render(template_path, extra_context, output_dir)
+        if render_cache.store(key, rendered) is not None:
+            result_path = render_cache.materialize(key, output_dir)
+        return result_path or rendered.write(output_dir)
+
     def cleanup_rendered_template(self, project_path: Path):
         """
         Clean up a rendered template directory.
@@ -159,7 +354,7 @@ class TemplateEngine:
             if project_path.exists() and project_path.is_relative_to(self.temp_dir):
                 # Get the parent directory (the unique temp directory we created)
                 temp_parent = project_path.parent
-                shutil.rmtree(temp_parent)
+                staging_area.remove(temp_parent)
                 logger.info(f"Cleaned up template directory: {temp_parent}")
         except Exception as e:
             logger.error(f"Failed to cleanup template directory: {e}")
@@ -0,0 +1,525 @@
+"""
+Native renderer for cookiecutter templates.
+
+``cookiecutter()`` re-reads the template tree, builds a new Jinja environment,
+writes a replay file and ``chdir``s into the template for every project, which
+serialises renders behind a process-wide lock. This renderer compiles each
+template once: every file and path name becomes a cached Jinja template (binary
+and ``_copy_without_render`` files are kept as bytes), and a project is
+rendered into an in-memory ``RenderedProject`` that is written to disk in one
+pass. Renders need no lock and read nothing from the template tree.
+
+The output matches cookiecutter's for ``no_input`` renders: the same context
+(``cookiecutter.json`` defaults with ``extra_context`` applied, values rendered
+in order, choices resolved to their first option, private ``_`` keys such as
+``_skip_variables`` passed through), the same default Jinja extensions and
+``_extensions``, ``_jinja2_env_vars``, ``_copy_without_render`` and
+``_new_lines`` handling, newline detection and file modes. Templates with hooks
+or nested templates raise ``UnsupportedTemplate`` so the caller can fall back
+to cookiecutter. The user's ``~/.cookiecutterrc`` defaults are not applied.
+
+Files without Jinja syntax are detected when a template is compiled. They are
+not rendered, and ``RenderedProject.write`` materializes them from the template
+file (``render_static_files``): by hardlink, by reflink or ``copy_file_range``,
+or by writing the bytes like rendered files. Hardlinked files share their inode
+with the template, so they must be replaced rather than modified in place, as
+for the render cache.
+
+A compiled template is reused until the modification time of one of its
+directories or files changes, or, while the template watcher
+(``app.services.template_watcher``) runs, until it invalidates the template. ``version`` identifies a compiled template by
+its content, for caching rendered projects (see ``app.services.render_cache``).
+"""
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from binaryornot.check import is_binary
+from cookiecutter.environment import ExtensionLoaderMixin, StrictEnvironment
+from jinja2 import FileSystemLoader, StrictUndefined, Template
+from jinja2.sandbox import SandboxedEnvironment
+
+from app.core.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+FICLONE = 0x40049409  # ioctl sharing a file's extents (reflink) on Btrfs, XFS and others
+
+
+class UnsupportedTemplate(Exception):
+    """Raised for templates that need cookiecutter itself (hooks, nested templates)."""
+
+
+class _SandboxedStrictEnvironment(ExtensionLoaderMixin, SandboxedEnvironment):
+    """Cookiecutter's strict environment, sandboxed for rendering user-supplied variable values."""
+
+    def __init__(self, **kwargs):
+        super().__init__(undefined=StrictUndefined, **kwargs)
+
+
+def _clone(source: str, path: Path, size: int) -> bool:
+    """Copy a file in the kernel, as a reflink where the filesystem supports it."""
+    with open(source, "rb") as src, open(path, "wb") as dst:
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                return True
+            except OSError:
+                pass
+        if not hasattr(os, "copy_file_range"):
+            return False
+        copied = 0
+        while copied < size:
+            chunk = os.copy_file_range(src.fileno(), dst.fileno(), size - copied)
+            if chunk == 0:
+                return False
+            copied += chunk
+        return True
+
+
+def _materialize(source: str, path: Path, size: int) -> Optional[str]:
+    """
+    Create ``path`` from a static template file without writing its bytes.
+
+    Returns:
+        "link" or "clone" for how the file was created, or None if it was not
+        (strategy ``write``, the template file is gone, or the filesystem
+        supports neither) and has to be written.
+    """
+    strategy = settings.render_static_files
+    if strategy == "link":
+        try:
+            os.link(source, path)
+            return "link"
+        except FileNotFoundError:
+            return None
+        except OSError:
+            pass  # Other filesystem, or links not supported: clone instead
+    if strategy in ("link", "clone"):
+        try:
+            if _clone(source, path, size):
+                return "clone"
+        except OSError:
+            pass
+        path.unlink(missing_ok=True)
+    return None
+
+
+@dataclass
+class RenderedFile:
+    """Content and permission bits of one generated file."""
+
+    content: bytes
+    mode: int
+    source: Optional[str] = None  # Template file with exactly this content, if the file is static
+
+
+@dataclass
+class RenderedProject:
+    """A generated project held in memory."""
+
+    name: str  # Rendered name of the project directory
+    directories: List[str] = field(default_factory=list)  # Relative paths, parents first
+    files: Dict[str, RenderedFile] = field(default_factory=dict)  # Relative path -> file
+
+    def write(self, output_dir: Path) -> Path:
+        """
+        Write the project into a new directory under ``output_dir``.
+
+        Args:
+            output_dir: Existing directory to create the project directory in.
+
+        Returns:
+            Path to the project directory.
+
+        Raises:
+            FileExistsError: If the project directory already exists.
+        """
+        project_dir = Path(output_dir) / self.name
+        project_dir.mkdir()
+        created = {project_dir}
+        for directory in self.directories:
+            (project_dir / directory).mkdir(parents=True, exist_ok=True)
+            created.add(project_dir / directory)
+        for relative_path, rendered in self.files.items():
+            path = project_dir / relative_path
+            if path.parent not in created:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                created.add(path.parent)
+            created_by = None
+            if rendered.source is not None:
+                created_by = _materialize(rendered.source, path, len(rendered.content))
+            if created_by is None:
+                path.write_bytes(rendered.content)
+            if created_by != "link":
+                os.chmod(path, rendered.mode)
+        return project_dir
+
+
+@dataclass
+class _CompiledFile:
+    path: Union[Template, str]  # Template for the relative output path, or the path itself
+    content: Union[Template, bytes]  # Template for text files, raw bytes for copied and static files
+    mode: int
+    newline: str
+    suffix: str = ""  # Unrendered rest of the path, for files inside a copied directory
+    source: Optional[str] = None  # Template file, for files whose output is ``content`` unchanged
+    static_text: bool = False  # Static text file: line endings still follow ``_new_lines``
+
+
+@dataclass
+class _CompiledTemplate:
+    repo_dir: Path
+    config: "OrderedDict[str, Any]"  # Parsed cookiecutter.json
+    root: Template  # Name of the project directory
+    directories: List[Template]
+    files: List[_CompiledFile]
+    variables_env: SandboxedEnvironment
+    watched: Tuple[str, ...]
+    mtimes: Tuple[Optional[int], ...]
+    version: Optional[str]  # Content hash, None if renders depend on the output directory
+
+
+def _mtimes(paths: Tuple[str, ...]) -> Tuple[Optional[int], ...]:
+    mtimes = []
+    for path in paths:
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+def _detect_newline(content: bytes) -> str:
+    """First line ending used in a file, as cookiecutter detects it."""
+    for index, byte in enumerate(content):
+        if byte == 0x0A:
+            return "\n"
+        if byte == 0x0D:
+            return "\r\n" if content[index + 1:index + 2] == b"\n" else "\r"
+    return "\n"
+
+
+def _apply_overwrites(context: Dict[str, Any], overwrites: Dict[str, Any], in_dictionary: bool = False):
+    """Apply ``extra_context`` to cookiecutter.json defaults, as ``cookiecutter.generate`` does."""
+    for variable, overwrite in overwrites.items():
+        if variable not in context:
+            # Variables the template does not declare are ignored
+            continue
+        current = context[variable]
+        if isinstance(current, list):
+            if in_dictionary:
+                context[variable] = overwrite
+            elif isinstance(overwrite, list):
+                if not set(overwrite).issubset(set(current)):
+                    raise ValueError(
+                        f"{overwrite} provided for multi-choice variable {variable}, "
+                        f"but valid choices are {current}"
+                    )
+                context[variable] = overwrite
+            elif overwrite in current:
+                current.remove(overwrite)
+                current.insert(0, overwrite)
+            else:
+                raise ValueError(
+                    f"{overwrite} provided for choice variable {variable}, but the choices are {current}."
+                )
+        elif isinstance(current, dict) and isinstance(overwrite, dict):
+            _apply_overwrites(current, overwrite, in_dictionary=True)
+        else:
+            context[variable] = overwrite
+
+
+class TemplateRenderer:
+    """Compiles cookiecutter templates once and renders projects in memory."""
+
+    def __init__(self):
+        self._compiled: Dict[str, _CompiledTemplate] = {}
+        self._lock = threading.Lock()
+        # Cleared while the template watcher invalidates changed templates instead
+        self.check_mtimes = True
+
+    def render(
+        self,
+        template_path: Path,
+        extra_context: Optional[Dict[str, Any]] = None,
+        output_dir: Optional[Path] = None,
+    ) -> RenderedProject:
+        """
+        Render a project from a template.
+
+        Args:
+            template_path: Template directory (containing ``cookiecutter.json``).
+            extra_context: Values overriding the template's defaults.
+            output_dir: Directory the project will be written to, exposed to
+                templates as ``cookiecutter._output_dir``.
+
+        Returns:
+            The rendered project.
+
+        Raises:
+            UnsupportedTemplate: If the template needs cookiecutter itself.
+            jinja2.TemplateError: If a file or variable fails to render.
+        """
+        compiled = self._get(Path(template_path))
+        context = self._context(compiled, extra_context or {}, output_dir)
+
+        project = RenderedProject(name=compiled.root.render(**context))
+        for directory in compiled.directories:
+            project.directories.append(directory.render(**context))
+
+        configured_newline = context["cookiecutter"].get("_new_lines")
+        for compiled_file in compiled.files:
+            path = compiled_file.path
+            if isinstance(path, Template):
+                path = path.render(**context)
+            path += compiled_file.suffix
+            if not path or path.endswith("/") or path in project.directories:
+                # The file name rendered empty
+                continue
+            source = None
+            if isinstance(compiled_file.content, bytes):
+                content = compiled_file.content
+                source = compiled_file.source
+                if compiled_file.static_text and configured_newline not in (None, compiled_file.newline):
+                    content = content.replace(compiled_file.newline.encode(), configured_newline.encode())
+                    source = None
+            else:
+                newline = configured_newline or compiled_file.newline
+                text = compiled_file.content.render(**context)
+                content = text.replace("\n", newline).encode("utf-8")
+            project.files[path] = RenderedFile(content=content, mode=compiled_file.mode, source=source)
+        return project
+
+    def version(self, template_path: Path) -> Optional[str]:
+        """
+        Content hash of a template.
+
+        Args:
+            template_path: Template directory.
+
+        Returns:
+            Hex digest that changes whenever a file, path name, mode or
+            ``cookiecutter.json`` of the template changes, or None if the
+            template uses ``cookiecutter._output_dir`` and so renders
+            differently for every output directory.
+
+        Raises:
+            UnsupportedTemplate: If the template needs cookiecutter itself.
+        """
+        return self._get(Path(template_path)).version
+
+    def invalidate(self, template_path: Optional[Path] = None):
+        """Drop compiled templates, all of them or the one at ``template_path``."""
+        with self._lock:
+            if template_path is None:
+                self._compiled.clear()
+            else:
+                self._compiled.pop(str(Path(template_path).resolve()), None)
+
+    def _get(self, template_path: Path) -> _CompiledTemplate:
+        key = str(template_path.resolve())
+        compiled = self._compiled.get(key)
+        if compiled is not None and (not self.check_mtimes or _mtimes(compiled.watched) == compiled.mtimes):
+            return compiled
+
+        with self._lock:
+            compiled = self._compiled.get(key)
+            if compiled is None or _mtimes(compiled.watched) != compiled.mtimes:
+                compiled = self._compile(Path(key))
+                self._compiled[key] = compiled
+            return compiled
+
+    def _context(
+        self,
+        compiled: _CompiledTemplate,
+        extra_context: Dict[str, Any],
+        output_dir: Optional[Path],
+    ) -> Dict[str, Any]:
+        """Build the render context like ``cookiecutter(no_input=True)``."""
+        defaults = json.loads(json.dumps(compiled.config), object_pairs_hook=OrderedDict)
+        _apply_overwrites(defaults, extra_context)
+        defaults.pop("__prompts__", None)
+        env = compiled.variables_env
+
+        values: "OrderedDict[str, Any]" = OrderedDict()
+        for key, raw in defaults.items():
+            if key.startswith("_") and not key.startswith("__"):
+                values[key] = raw
+            elif isinstance(raw, list):
+                values[key] = self._render_variable(env, raw[0], values) if raw else None
+            elif not isinstance(raw, dict):
+                values[key] = self._render_variable(env, raw, values)
+        # Dictionaries may refer to the simple values, so they come second
+        for key, raw in defaults.items():
+            if isinstance(raw, dict) and not (key.startswith("_") and not key.startswith("__")):
+                values[key] = self._render_variable(env, raw, values)
+
+        values["_template"] = str(compiled.repo_dir)
+        values["_output_dir"] = os.path.abspath(output_dir or ".")
+        values["_repo_dir"] = str(compiled.repo_dir)
+        values["_checkout"] = None
+        return {
+            "cookiecutter": values,
+            "_cookiecutter": {key: value for key, value in values.items() if not key.startswith("_")},
+        }
+
+    def _render_variable(self, env: SandboxedEnvironment, raw: Any, values: Dict[str, Any]) -> Any:
+        if raw is None or isinstance(raw, bool):
+            return raw
+        if isinstance(raw, dict):
+            return {
+                self._render_variable(env, key, values): self._render_variable(env, value, values)
+                for key, value in raw.items()
+            }
+        if isinstance(raw, list):
+            return [self._render_variable(env, value, values) for value in raw]
+        if not isinstance(raw, str):
+            raw = str(raw)
+        if "{" not in raw and not raw.endswith("\n"):
+            # Nothing to render; skips compiling a template per value
+            return raw
+        return env.from_string(raw).render(cookiecutter=values)
+
+    def _compile(self, repo_dir: Path) -> _CompiledTemplate:
+        logger.info(f"Compiling template {repo_dir.name}")
+        if (repo_dir / "hooks").is_dir():
+            raise UnsupportedTemplate(f"Template '{repo_dir.name}' has hooks")
+
+        config_bytes = (repo_dir / "cookiecutter.json").read_bytes()
+        config = json.loads(config_bytes, object_pairs_hook=OrderedDict)
+        digest = hashlib.sha256(config_bytes)
+        uses_output_dir = b"_output_dir" in config_bytes
+        if {"template", "templates"} & set(config):
+            raise UnsupportedTemplate(f"Template '{repo_dir.name}' contains nested templates")
+
+        project_dirs = [
+            entry for entry in os.listdir(repo_dir)
+            if "cookiecutter" in entry and "{{" in entry and "}}" in entry
+        ]
+        if not project_dirs:
+            raise UnsupportedTemplate(f"Template '{repo_dir.name}' has no templated project directory")
+        template_dir = repo_dir / project_dirs[0]
+
+        env_context = {"cookiecutter": config}
+        env = StrictEnvironment(
+            context=env_context, keep_trailing_newline=True, **config.get("_jinja2_env_vars", {})
+        )
+        env.loader = FileSystemLoader([str(template_dir), str(repo_dir / "templates")])
+        variables_env = _SandboxedStrictEnvironment(context=env_context)
+        copy_patterns = config.get("_copy_without_render", [])
+
+        def copy_only(path: str) -> bool:
+            return any(fnmatch.fnmatch(path, pattern) for pattern in copy_patterns)
+
+        def path_template(path: str) -> Union[Template, str]:
+            return env.from_string(path) if "{" in path else path
+
+        markers = [
+            marker for marker in (
+                env.block_start_string, env.variable_start_string, env.comment_start_string,
+                env.line_statement_prefix, env.line_comment_prefix,
+            ) if marker
+        ]
+
+        def is_static(raw: bytes, newline: str) -> bool:
+            """Whether rendering a file reproduces it byte for byte."""
+            try:
+                text = raw.decode("utf-8")
+            except UnicodeDecodeError:
+                return False
+            if any(marker in text for marker in markers):
+                return False
+            return env.from_string(text).render().replace("\n", newline).encode("utf-8") == raw
+
+        watched = [str(repo_dir), str(repo_dir / "cookiecutter.json"), str(template_dir)]
+        directories: List[Template] = []
+        files: List[_CompiledFile] = []
+
+        for root, dirs, filenames in os.walk(template_dir):
+            relative_root = os.path.relpath(root, template_dir)
+            relative_root = "" if relative_root == "." else relative_root
+            watched.append(root)
+            dirs.sort()
+
+            rendered_dirs = []
+            for name in dirs:
+                relative = os.path.normpath(os.path.join(relative_root, name))
+                if not copy_only(relative):
+                    rendered_dirs.append(name)
+                    directories.append(env.from_string(relative))
+                    continue
+                # Copied verbatim: only the directory's own path is rendered
+                for copy_root, _, copy_files in os.walk(os.path.join(root, name)):
+                    watched.append(copy_root)
+                    inner = os.path.relpath(copy_root, os.path.join(root, name))
+                    for filename in copy_files:
+                        source = os.path.join(copy_root, filename)
+                        watched.append(source)
+                        raw = Path(source).read_bytes()
+                        mode = os.stat(source).st_mode & 0o7777
+                        suffix = "/" + os.path.normpath(os.path.join(inner, filename))
+                        digest.update(f"{relative}{suffix}:{mode}:".encode() + raw)
+                        files.append(_CompiledFile(
+                            path=path_template(relative),
+                            content=raw,
+                            mode=mode,
+                            newline="\n",
+                            suffix=suffix,
+                            source=source,
+                        ))
+            dirs[:] = rendered_dirs
+
+            for filename in sorted(filenames):
+                relative = os.path.normpath(os.path.join(relative_root, filename))
+                source = os.path.join(root, filename)
+                watched.append(source)
+                raw = Path(source).read_bytes()
+                mode = os.stat(source).st_mode & 0o7777
+                digest.update(f"{relative}:{mode}:".encode() + raw)
+                newline = _detect_newline(raw)
+                static_text = False
+                if copy_only(relative) or is_binary(source):
+                    content: Union[Template, bytes] = raw
+                elif is_static(raw, newline):
+                    content, static_text = raw, True
+                else:
+                    content = env.get_template(relative.replace(os.path.sep, "/"))
+                    uses_output_dir = uses_output_dir or b"_output_dir" in raw
+                files.append(_CompiledFile(
+                    path=path_template(relative),
+                    content=content,
+                    mode=mode,
+                    newline=newline,
+                    source=source if isinstance(content, bytes) else None,
+                    static_text=static_text,
+                ))
+
+        watched_paths = tuple(watched)
+        return _CompiledTemplate(
+            repo_dir=repo_dir,
+            config=config,
+            root=env.from_string(project_dirs[0]),
+            directories=directories,
+            files=files,
+            variables_env=variables_env,
+            watched=watched_paths,
+            mtimes=_mtimes(watched_paths),
+            version=None if uses_output_dir else digest.hexdigest(),
+        )
+
+
+# Global instance
+template_renderer = TemplateRenderer()
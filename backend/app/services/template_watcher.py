@@ -0,0 +1,147 @@
+"""
+Hot reload of templates.
+
+Without a watcher, the template catalog and the compiled templates of the native
+renderer are validated by ``stat``-ing their files on every use. With
+``TEMPLATE_HOT_RELOAD`` enabled, ``TemplateWatcher`` follows ``templates_dir``
+through inotify (``watchfiles``, installed with ``uvicorn[standard]``) and,
+for every template that was added, edited or removed, reloads its catalog entry
+and recompiles it. Everything else stays cached, and the per-use checks are
+turned off while the watcher runs.
+
+The watcher runs in a daemon thread of each API and worker process. If
+``watchfiles`` is unavailable or the watch fails, the per-use checks stay (or
+are turned back) on, so template changes are still picked up.
+"""
+import logging
+import threading
+from pathlib import Path
+from typing import Iterable, Optional, Set
+
+from app.services.template_engine import template_engine
+from app.services.template_renderer import UnsupportedTemplate, template_renderer
+
+logger = logging.getLogger(__name__)
+
+# Changes are batched for this long before templates are reloaded
+DEBOUNCE_MS = 500
+
+
+class TemplateWatcher:
+    """Reloads changed templates when files under ``templates_dir`` change."""
+
+    def __init__(self):
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> bool:
+        """
+        Start watching ``templates_dir`` in a background thread.
+
+        Returns:
+            Whether the watcher is running.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        try:
+            import watchfiles
+        except ImportError:
+            logger.warning("watchfiles is not installed; template changes are detected per use")
+            return False
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(watchfiles,), name="template-watcher", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop watching and go back to checking templates on every use."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def reload(self, names: Iterable[str]):
+        """
+        Reload the catalog entries and compiled templates of some templates.
+
+        Args:
+            names: Template directory names.
+        """
+        names = sorted(set(names))
+        template_engine.reload_templates(names)
+        for name in names:
+            template_path = template_engine.templates_dir / name
+            template_renderer.invalidate(template_path)
+            if not (template_path / "cookiecutter.json").is_file():
+                continue
+            try:
+                # Compile now rather than on the next render
+                template_renderer.version(template_path)
+            except UnsupportedTemplate:
+                pass
+            except Exception as e:
+                logger.error(f"Failed to compile template {name}: {e}")
+        logger.info(f"Reloaded templates: {', '.join(names)}")
+
+    def _run(self, watchfiles):
+        root = template_engine.templates_dir
+        watching = False
+        try:
+            # Compile everything up front rather than on the first renders
+            self.reload(self._templates())
+            # ``watch`` gives no signal when the watch is established: with
+            # ``yield_on_timeout`` it first yields on the first change or after
+            # ``rust_timeout`` without any. By then it is certainly watching, so
+            # per-use checks stay on until that first yield, which also reloads
+            # everything once more to catch changes made in between.
+            for changes in watchfiles.watch(
+                root,
+                debounce=DEBOUNCE_MS,
+                stop_event=self._stop,
+                yield_on_timeout=True,
+            ):
+                if not watching:
+                    watching = True
+                    self.reload(self._templates())
+                    template_engine.check_mtimes = False
+                    template_renderer.check_mtimes = False
+                    logger.info(f"Watching {root} for template changes")
+
+                names = self._changed(root, (path for _, path in changes))
+                if names is None:
+                    names = self._templates() | set(template_engine.catalog().templates)
+                if names:
+                    self.reload(names)
+        except Exception as e:
+            logger.error(f"Template watcher stopped: {e}")
+        finally:
+            template_engine.check_mtimes = True
+            template_renderer.check_mtimes = True
+
+    @staticmethod
+    def _changed(root: Path, paths: Iterable[str]) -> Optional[Set[str]]:
+        """Names of the templates containing ``paths``, None if ``root`` itself changed."""
+        names = set()
+        for path in paths:
+            try:
+                parts = Path(path).relative_to(root).parts
+            except ValueError:
+                continue
+            if not parts:
+                return None
+            names.add(parts[0])
+        return names
+
+    @staticmethod
+    def _templates() -> Set[str]:
+        root = template_engine.templates_dir
+        if not root.is_dir():
+            return set()
+        return {path.name for path in root.iterdir() if path.is_dir()}
+
+
+# Global instance
+template_watcher = TemplateWatcher()
@@ -0,0 +1,115 @@
+"""
+Persistence of workflow step completion, so failed workflows can resume.
+
+Steps with external side effects (repository creation, push, ArgoCD) are
+checkpointed with their JSON-serializable output as soon as they finish. When a
+failed project is retried, the workflow engine restores those outputs and only
+runs the steps that have not completed yet, plus whatever local steps (e.g.
+rendering) those need.
+
+Every step, checkpointed or not, is recorded with its start and end time; these
+rows make up the project's timeline (``GET /projects/{id}/timeline``).
+"""
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.core.database import SessionLocal
+from app.models.workflow_step import ProjectWorkflowStep
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore:
+    """Reads and writes step checkpoints for one project, each in a short session."""
+
+    def __init__(self, project_id: str):
+        self.project_id = project_id
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Load completed steps.
+
+        Returns:
+            Mapping of step name to its recorded output.
+        """
+        db = SessionLocal()
+        try:
+            rows = db.query(ProjectWorkflowStep).filter(
+                ProjectWorkflowStep.project_id == self.project_id,
+                ProjectWorkflowStep.status == "completed",
+            ).all()
+            return {row.step: json.loads(row.output) if row.output else None for row in rows}
+        finally:
+            db.close()
+
+    def record(
+        self,
+        step: str,
+        status: str,
+        started_at: datetime,
+        finished_at: datetime,
+        output: Optional[Any] = None,
+    ):
+        """
+        Record a finished step, replacing the record of an earlier attempt.
+
+        Args:
+            step: Step name.
+            status: ``completed`` or ``failed``.
+            started_at: When the step started.
+            finished_at: When the step finished.
+            output: JSON-serializable output of a checkpointed step.
+        """
+        db = SessionLocal()
+        try:
+            row = db.query(ProjectWorkflowStep).filter(
+                ProjectWorkflowStep.project_id == self.project_id,
+                ProjectWorkflowStep.step == step,
+            ).first()
+            if row is None:
+                row = ProjectWorkflowStep(project_id=self.project_id, step=step)
+                db.add(row)
+            row.status = status
+            row.output = json.dumps(output) if output is not None else None
+            row.started_at = started_at
+            row.completed_at = finished_at
+            db.commit()
+            logger.debug(f"Recorded step '{step}' ({status}) for project {self.project_id}")
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def mark(self, step: str, status: str):
+        """
+        Change the recorded status of a step, e.g. to ``compensated`` once undone.
+
+        Only ``completed`` steps are restored, so a marked step runs again on retry.
+
+        Args:
+            step: Step name.
+            status: New status.
+        """
+        db = SessionLocal()
+        try:
+            db.query(ProjectWorkflowStep).filter(
+                ProjectWorkflowStep.project_id == self.project_id,
+                ProjectWorkflowStep.step == step,
+            ).update({ProjectWorkflowStep.status: status}, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def clear(self):
+        """Forget all checkpoints of the project."""
+        db = SessionLocal()
+        try:
+            db.query(ProjectWorkflowStep).filter(
+                ProjectWorkflowStep.project_id == self.project_id
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
@@ -0,0 +1,315 @@
+"""
+Minimal step-graph (DAG) engine for project workflows.
+
+A workflow is a set of named steps. Each step declares the steps whose outputs
+it needs via ``requires`` and receives those outputs as keyword arguments::
+
+    graph = WorkflowGraph("create_project", [
+        Step("render", render),
+        Step("create_repo", create_repo),
+        Step("push", push, requires=("render", "create_repo")),
+    ])
+    outputs = await graph.run()
+
+Every step whose requirements are met is started immediately, so independent
+steps (render ∥ create_repo ∥ codegen) overlap instead of running back to back.
+If a step fails, no further steps are started; steps already running are allowed
+to finish so their side effects are recorded, then the first error is raised.
+
+A step may provide ``cleanup``, which is called with the step's output once every
+step that depends on it has finished (or when the workflow ends). Rendered
+staging directories are released this way on both success and failure.
+
+Steps marked ``checkpoint=True`` have their output persisted through a
+``CheckpointStore`` when they complete. A later run with the same store restores
+those outputs, skips the completed steps, and runs un-checkpointed (local) steps
+only if a step that still has to run depends on them. The same store records
+when every step started and finished, for ``GET /projects/{id}/timeline``, and
+each step's duration is observed in ``workflow_step_duration_seconds``.
+
+A run can be cancelled cooperatively through an ``asyncio.Event``. Cancellation
+takes effect at the next step boundary: no further steps are started, running
+steps finish, and then every completed step that provides ``compensate`` is
+undone, dependents first, before ``WorkflowCancelled`` is raised.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.metrics import workflow_step_duration
+
+if TYPE_CHECKING:
+    from app.services.workflow_checkpoints import CheckpointStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Step:
+    """A unit of work in a workflow graph."""
+
+    name: str
+    fn: Callable[..., Awaitable[Any]]
+    requires: Tuple[str, ...] = ()
+    cleanup: Optional[Callable[[Any], Awaitable[None]]] = None
+    checkpoint: bool = False  # Persist completion so a retry can skip this step
+    compensate: Optional[Callable[[Any], Awaitable[None]]] = None  # Undo the step when cancelled
+
+
+class WorkflowCancelled(Exception):
+    """Raised by ``WorkflowGraph.run`` once a cancelled run has been compensated."""
+
+    def __init__(self, compensated: List[str], failures: Dict[str, str]):
+        super().__init__("Workflow was cancelled")
+        self.compensated = compensated  # Steps that were undone
+        self.failures = failures  # Step name -> error of compensations that failed
+
+
+class WorkflowGraph:
+    """A validated, runnable set of steps."""
+
+    def __init__(self, name: str, steps: Iterable[Step]):
+        self.name = name
+        self.steps: Dict[str, Step] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Duplicate step '{step.name}' in workflow '{name}'")
+            self.steps[step.name] = step
+
+        for step in self.steps.values():
+            for dep in step.requires:
+                if dep not in self.steps:
+                    raise ValueError(f"Step '{step.name}' requires unknown step '{dep}'")
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        visiting, done = set(), set()
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Workflow '{self.name}' has a dependency cycle through '{name}'")
+            visiting.add(name)
+            for dep in self.steps[name].requires:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.steps:
+            visit(name)
+
+    def order(self) -> List[str]:
+        """Step names in dependency order (every step after the steps it requires)."""
+        ordered: List[str] = []
+
+        def visit(name: str):
+            if name in ordered:
+                return
+            for dep in self.steps[name].requires:
+                visit(dep)
+            ordered.append(name)
+
+        for name in self.steps:
+            visit(name)
+        return ordered
+
+    def dependents(self, name: str) -> Tuple[str, ...]:
+        """Names of steps that require ``name``."""
+        return tuple(s.name for s in self.steps.values() if name in s.requires)
+
+    def plan(self, completed: Iterable[str]) -> Set[str]:
+        """
+        Decide which steps must run given already checkpointed steps.
+
+        Args:
+            completed: Names of steps restored from checkpoints.
+
+        Returns:
+            Names of steps to execute.
+        """
+        done = {name for name in completed if self.steps[name].checkpoint}
+        stack = [
+            name for name, step in self.steps.items()
+            if name not in done and (step.checkpoint or not self.dependents(name))
+        ]
+        to_run: Set[str] = set()
+        while stack:
+            name = stack.pop()
+            if name in to_run:
+                continue
+            to_run.add(name)
+            stack.extend(dep for dep in self.steps[name].requires if dep not in done)
+        return to_run
+
+    async def run(
+        self,
+        checkpoints: Optional["CheckpointStore"] = None,
+        template_type: str = "unknown",
+        cancel: Optional[asyncio.Event] = None,
+    ) -> Dict[str, Any]:
+        """
+        Execute the graph.
+
+        Args:
+            checkpoints: Store to restore completed steps from and record
+                step timings and checkpointed outputs to. Without one, every step runs.
+            template_type: Template label for step duration metrics.
+            cancel: Event that, once set, cancels the run at the next step boundary.
+
+        Returns:
+            Mapping of step name to step output.
+
+        Raises:
+            WorkflowCancelled: If ``cancel`` was set before all steps completed.
+            Exception: The first exception raised by any step.
+        """
+        restored: Dict[str, Any] = {}
+        if checkpoints is not None:
+            loaded = await asyncio.to_thread(checkpoints.load)
+            restored = {
+                name: output for name, output in loaded.items()
+                if name in self.steps and self.steps[name].checkpoint
+            }
+        to_run = self.plan(restored)
+        if restored:
+            logger.info(f"[{self.name}] resuming; skipping completed steps {sorted(restored)}")
+
+        outputs: Dict[str, Any] = dict(restored)
+        remaining_dependents = {
+            name: {dep for dep in self.dependents(name) if dep in to_run} for name in self.steps
+        }
+        cleaned = set(restored)
+        pending = {name: self.steps[name] for name in to_run}
+        running: Dict[asyncio.Task, str] = {}
+        timings: Dict[str, Tuple[datetime, datetime]] = {}
+
+        def start_ready():
+            for name, step in list(pending.items()):
+                if all(dep in outputs for dep in step.requires):
+                    del pending[name]
+                    kwargs = {dep: outputs[dep] for dep in step.requires}
+                    task = asyncio.create_task(self._run_step(step, kwargs, template_type, timings))
+                    running[task] = name
+
+        async def record(name: str, status: str, output: Any = None):
+            if checkpoints is None:
+                return
+            started_at, finished_at = timings[name]
+            try:
+                await asyncio.to_thread(
+                    checkpoints.record, name, status, started_at, finished_at, output
+                )
+            except Exception:
+                if status == "completed" and self.steps[name].checkpoint:
+                    raise
+                logger.warning(f"Failed to record timing of step '{name}' of '{self.name}'", exc_info=True)
+
+        async def release(name: str):
+            step = self.steps[name]
+            if step.cleanup is None or name in cleaned or name not in outputs:
+                return
+            cleaned.add(name)
+            try:
+                await step.cleanup(outputs[name])
+            except Exception as e:
+                logger.warning(f"Cleanup for step '{name}' of '{self.name}' failed: {e}")
+
+        def cancelled() -> bool:
+            return cancel is not None and cancel.is_set()
+
+        error: Optional[BaseException] = None
+        try:
+            if not cancelled():
+                start_ready()
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        await record(name, "failed")
+                        continue
+                    outputs[name] = task.result()
+                    await record(
+                        name, "completed", outputs[name] if self.steps[name].checkpoint else None
+                    )
+
+                    if not remaining_dependents[name]:
+                        await release(name)
+                    for dep in self.steps[name].requires:
+                        remaining_dependents[dep].discard(name)
+                        if not remaining_dependents[dep]:
+                            await release(dep)
+                # After a failure or cancellation, let in-flight steps finish (their side
+                # effects, e.g. a created repository, must be recorded) but start nothing new
+                if error is None and not cancelled():
+                    start_ready()
+            if error is not None:
+                raise error
+            if pending and cancelled():
+                logger.info(f"[{self.name}] cancelled; skipping steps {sorted(pending)}")
+                raise await self._compensate(outputs, checkpoints)
+            return outputs
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            for name in list(outputs):
+                await release(name)
+
+    async def _compensate(
+        self,
+        outputs: Dict[str, Any],
+        checkpoints: Optional["CheckpointStore"],
+    ) -> WorkflowCancelled:
+        """Undo completed steps, dependents first, and describe the outcome."""
+        compensated: List[str] = []
+        failures: Dict[str, str] = {}
+        for name in reversed(self.order()):
+            step = self.steps[name]
+            if name not in outputs or step.compensate is None:
+                continue
+            try:
+                await step.compensate(outputs[name])
+            except Exception as e:
+                logger.error(f"[{self.name}] compensating step '{name}' failed: {e}")
+                failures[name] = str(e)
+                continue
+            compensated.append(name)
+            if checkpoints is not None:
+                try:
+                    await asyncio.to_thread(checkpoints.mark, name, "compensated")
+                except Exception:
+                    logger.warning(f"Failed to record compensation of step '{name}'", exc_info=True)
+        return WorkflowCancelled(compensated, failures)
+
+    async def _run_step(
+        self,
+        step: Step,
+        kwargs: Dict[str, Any],
+        template_type: str,
+        timings: Dict[str, Tuple[datetime, datetime]],
+    ) -> Any:
+        started_at = datetime.utcnow()
+        start = time.monotonic()
+        outcome = "error"
+        logger.debug(f"[{self.name}] step '{step.name}' started")
+        try:
+            result = await step.fn(**kwargs)
+            outcome = "success"
+            return result
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            duration = time.monotonic() - start
+            timings[step.name] = (started_at, datetime.utcnow())
+            workflow_step_duration.labels(
+                step=step.name, template_type=template_type, outcome=outcome
+            ).observe(duration)
+            logger.debug(f"[{self.name}] step '{step.name}' finished in {duration:.3f}s")
@@ -0,0 +1,284 @@
+"""
+idp-worker: executes queued project workflows outside the API process.
+
+Run one or more workers next to the API pods::
+
+    python -m app.worker
+
+Each worker claims up to ``worker_concurrency`` jobs from the ``project_jobs``
+table at a time and heartbeats them while they run. Jobs held by a worker that
+dies are reclaimed by another worker once their lease expires, so a redeploy no
+longer strands projects in ``pending``/``creating_repo``. ``worker_interactive_slots``
+of a worker's slots are kept free of bulk jobs, so interactive creations start
+promptly even while a batch keeps every worker busy. With ``REPO_POOL_ENABLED``
+workers also keep the pool of pre-provisioned GitHub repositories filled. Every
+worker periodically sweeps expired and orphaned render staging directories.
+
+Standalone workers serve their Prometheus metrics (executor pools, step
+durations, caches, staging usage, ...) on ``worker_metrics_port``; the embedded
+worker's metrics are part of the API's ``/metrics``.
+
+The API process runs an embedded worker as well unless
+``EMBEDDED_WORKER_ENABLED=false``, which keeps single-container deployments working.
+"""
+import asyncio
+import logging
+import os
+import signal
+import socket
+from typing import Dict, Optional, Set
+
+from prometheus_client import start_http_server
+
+from app.core.config import settings
+from app.core.database import SessionLocal, init_db
+from app.core.executors import run_blocking, shutdown_executors
+from app.core.logging import setup_logging
+from app.models.job import ProjectJob
+from app.models.project import Project
+from app.services.job_queue import job_queue
+from app.services.project_workflows import WORKFLOWS
+from app.services.repo_pool import repo_pool
+from app.services.staging import staging_area
+from app.services.template_watcher import template_watcher
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """Polls the job queue and runs claimed workflows concurrently."""
+
+    def __init__(self, concurrency: Optional[int] = None, worker_id: Optional[str] = None):
+        self.concurrency = concurrency or settings.worker_concurrency
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._bulk: Set[str] = set()  # Running jobs of the bulk priority class
+        self._cancel_events: Dict[str, asyncio.Event] = {}
+        self._stopping = asyncio.Event()
+
+    async def run(self):
+        """Claim and execute jobs until ``stop()`` is called."""
+        logger.info(f"Worker {self.worker_id} started with concurrency {self.concurrency}")
+        heartbeat = asyncio.create_task(self._heartbeat_loop())
+        cancel_watch = asyncio.create_task(self._cancel_loop())
+        pool_filler = asyncio.create_task(self._pool_loop()) if settings.repo_pool_enabled else None
+        janitor = asyncio.create_task(self._janitor_loop())
+        metrics = asyncio.create_task(self._metrics_loop())
+
+        try:
+            while not self._stopping.is_set():
+                claimed = False
+                if len(self._tasks) < self.concurrency:
+                    job = await asyncio.to_thread(self._claim, self._bulk_allowed())
+                    if job is not None:
+                        claimed = True
+                        task = asyncio.create_task(self._execute(job))
+                        self._tasks[job.id] = task
+                        if job.priority == "bulk":
+                            self._bulk.add(job.id)
+                        task.add_done_callback(lambda _t, job_id=job.id: self._release(job_id))
+
+                # Keep draining while there is work and free capacity; otherwise back off
+                if not claimed:
+                    try:
+                        await asyncio.wait_for(
+                            self._stopping.wait(), timeout=settings.worker_poll_interval_seconds
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            heartbeat.cancel()
+            if pool_filler is not None:
+                pool_filler.cancel()
+            janitor.cancel()
+            metrics.cancel()
+            await self._drain()
+            cancel_watch.cancel()
+            logger.info(f"Worker {self.worker_id} stopped")
+
+    def stop(self):
+        """Stop claiming new jobs; in-flight jobs are allowed to finish."""
+        self._stopping.set()
+
+    async def _drain(self, grace_seconds: float = 30.0):
+        """Wait for in-flight jobs, cancelling (and re-queuing) any that overrun the grace period."""
+        if not self._tasks:
+            return
+        logger.info(f"Waiting for {len(self._tasks)} in-flight jobs to finish")
+        _, pending = await asyncio.wait(list(self._tasks.values()), timeout=grace_seconds)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+    def _bulk_allowed(self) -> bool:
+        """Whether a free slot may go to a bulk job (at least one always may)."""
+        return len(self._bulk) < max(self.concurrency - settings.worker_interactive_slots, 1)
+
+    def _release(self, job_id: str):
+        self._tasks.pop(job_id, None)
+        self._bulk.discard(job_id)
+
+    def _claim(self, allow_bulk: bool = True) -> Optional[ProjectJob]:
+        db = SessionLocal()
+        try:
+            return job_queue.claim(db, self.worker_id, allow_bulk=allow_bulk)
+        except Exception as e:
+            logger.error(f"Failed to claim job: {e}")
+            db.rollback()
+            return None
+        finally:
+            db.close()
+
+    async def _heartbeat_loop(self):
+        interval = max(settings.job_lease_seconds / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            db = SessionLocal()
+            try:
+                job_queue.heartbeat(db, self.worker_id, list(self._tasks))
+            except Exception as e:
+                logger.error(f"Job heartbeat failed: {e}")
+            finally:
+                db.close()
+
+    async def _cancel_loop(self):
+        """Signal running workflows whose cancellation was requested through the API."""
+        while True:
+            await asyncio.sleep(settings.worker_cancel_poll_seconds)
+            waiting = [job_id for job_id, event in self._cancel_events.items() if not event.is_set()]
+            if not waiting:
+                continue
+            db = SessionLocal()
+            try:
+                for job_id in job_queue.cancel_requested(db, waiting):
+                    logger.info(f"Cancellation requested for job {job_id}")
+                    self._cancel_events[job_id].set()
+            except Exception as e:
+                logger.error(f"Checking for cancelled jobs failed: {e}")
+            finally:
+                db.close()
+
+    async def _pool_loop(self):
+        """Keep the pool of pre-provisioned GitHub repositories at its target size."""
+        while True:
+            try:
+                await run_blocking("github", repo_pool.fill)
+            except Exception as e:
+                logger.error(f"Filling the repository pool failed: {e}")
+            await asyncio.sleep(settings.repo_pool_fill_interval_seconds)
+
+    async def _janitor_loop(self):
+        """Remove staging directories left behind by failed or killed workflows."""
+        while True:
+            try:
+                await asyncio.to_thread(staging_area.sweep)
+            except Exception as e:
+                logger.error(f"Sweeping the staging area failed: {e}")
+            await asyncio.sleep(settings.staging_janitor_interval_seconds)
+
+    async def _metrics_loop(self):
+        """Keep the queue depth and running jobs gauges current, including once the queue drains."""
+        while True:
+            try:
+                await asyncio.to_thread(self._refresh_metrics)
+            except Exception as e:
+                logger.error(f"Refreshing queue metrics failed: {e}")
+            await asyncio.sleep(settings.worker_metrics_interval_seconds)
+
+    def _refresh_metrics(self):
+        db = SessionLocal()
+        try:
+            job_queue.refresh_metrics(db)
+        finally:
+            db.close()
+
+    async def _execute(self, job: ProjectJob):
+        """Run the workflow for a claimed job and record the outcome."""
+        try:
+            workflow = WORKFLOWS.get(job.kind)
+            if not await asyncio.to_thread(self._prepare, job, workflow):
+                return
+
+            logger.info(f"Worker {self.worker_id} running job {job.id} ({job.kind}, attempt {job.attempts})")
+            cancel = self._cancel_events.setdefault(job.id, asyncio.Event())
+            if job.cancel_requested_at is not None:
+                cancel.set()
+
+            # Workflows open their own short-lived sessions; none is held while they run
+            await workflow(project_id=job.project_id, cancel=cancel, **job_queue.payload(job))
+            await asyncio.to_thread(self._finish, job, None)
+
+        except asyncio.CancelledError:
+            # Shutting down: hand the job straight back instead of waiting for the lease to expire
+            await asyncio.shield(asyncio.to_thread(self._finish, job, "Worker shut down before the job finished"))
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            await asyncio.to_thread(self._finish, job, str(e))
+        finally:
+            self._cancel_events.pop(job.id, None)
+
+    def _prepare(self, job: ProjectJob, workflow) -> bool:
+        """Check a claimed job is still runnable, failing it otherwise."""
+        db = SessionLocal()
+        try:
+            project = db.query(Project).filter(Project.id == job.project_id).first()
+
+            if workflow is None or project is None:
+                reason = f"Unknown job kind '{job.kind}'" if workflow is None else "Project no longer exists"
+                logger.warning(f"Discarding job {job.id}: {reason}")
+                job.attempts = settings.job_max_attempts
+                job_queue.fail(db, job, reason)
+                return False
+
+            if job.attempts > settings.job_max_attempts:
+                logger.error(f"Job {job.id} exceeded {settings.job_max_attempts} attempts")
+                # Also fails the project
+                job_queue.fail(db, job, "Project workflow was interrupted too many times")
+                return False
+
+            return True
+        finally:
+            db.close()
+
+    def _finish(self, job: ProjectJob, error: Optional[str]):
+        """Record a job's outcome in a fresh session."""
+        db = SessionLocal()
+        try:
+            if error is None:
+                job_queue.complete(db, job.id)
+            else:
+                job_queue.fail(db, job, error)
+        except Exception as e:
+            logger.error(f"Failed to record outcome of job {job.id}: {e}")
+        finally:
+            db.close()
+
+
+async def _serve():
+    worker = Worker()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+    await worker.run()
+
+
+def main():
+    """Entry point for the idp-worker process."""
+    setup_logging(debug=settings.debug)
+    init_db()
+    if settings.worker_metrics_port:
+        start_http_server(settings.worker_metrics_port)
+        logger.info(f"Serving worker metrics on port {settings.worker_metrics_port}")
+    if settings.template_hot_reload:
+        template_watcher.start()
+    try:
+        asyncio.run(_serve())
+    finally:
+        template_watcher.stop()
+        shutdown_executors()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Performance benchmarks for the IDP backend.
+
+Benchmarks run against the real application code with external services
+(GitHub, ArgoCD) replaced by in-process fakes, and print JSON results meant to
+be compared between runs. See ``benchmarks/README.md``.
+"""
@@ -0,0 +1,146 @@
+"""
+In-process stand-ins for the GitHub and ArgoCD services with configurable latency.
+
+The fakes are installed by replacing methods on the global ``github_service`` and
+``argocd_service`` instances, so every module that imported those instances
+(the API, the workflows) uses them without further patching. GitHub fakes block
+like PyGithub and git do, so they exercise the ``github`` thread pool; ArgoCD
+fakes sleep asynchronously like httpx.
+"""
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+
+
+@dataclass
+class FakeLatency:
+    """Simulated latency of external calls, in seconds."""
+
+    github_api: float = 0.2  # Repository lookups, creation and deletion
+    git_push: float = 1.0
+    argocd: float = 0.3
+    jitter: float = 0.2  # Each delay is scaled by a random factor in [1 - jitter, 1 + jitter]
+    failure_rate: float = 0.0  # Fraction of calls that raise
+
+    def delay(self, base: float) -> float:
+        """Jittered delay for a call."""
+        return max(0.0, base * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def maybe_fail(self, operation: str):
+        """Raise for a ``failure_rate`` fraction of calls."""
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise Exception(f"Simulated failure in {operation}")
+
+
+class FakeGitHubService:
+    """Records repositories in memory instead of calling GitHub."""
+
+    def __init__(self, latency: FakeLatency):
+        self.latency = latency
+        self.repositories: Set[str] = set()
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _call(self, operation: str, base: float):
+        with self._lock:
+            self.calls[operation] = self.calls.get(operation, 0) + 1
+        time.sleep(self.latency.delay(base))
+        self.latency.maybe_fail(operation)
+
+    def repository_exists(self, repo_name: str) -> bool:
+        self._call("repository_exists", self.latency.github_api)
+        return repo_name in self.repositories
+
+    def existing_repositories(self, repo_names: Iterable[str]) -> Set[str]:
+        self._call("list_repositories", self.latency.github_api)
+        return {name for name in repo_names if name in self.repositories}
+
+    def create_repository(self, repo_name: str, description: str = "", private: bool = False) -> tuple[str, str]:
+        self._call("create_repository", self.latency.github_api)
+        with self._lock:
+            self.repositories.add(repo_name)
+        return f"https://github.example/bench/{repo_name}", f"https://github.example/bench/{repo_name}.git"
+
+    def rename_repository(
+        self, repo_name: str, new_name: str, description: str = "", private: bool = False
+    ) -> tuple[str, str]:
+        self._call("rename_repository", self.latency.github_api)
+        with self._lock:
+            if repo_name not in self.repositories:
+                raise Exception(f"Repository {repo_name} not found")
+            self.repositories.discard(repo_name)
+            self.repositories.add(new_name)
+        return f"https://github.example/bench/{new_name}", f"https://github.example/bench/{new_name}.git"
+
+    def push_files(self, repo_name: str, project_path: Path, branch: str = "main"):
+        if not Path(project_path).is_dir():
+            raise Exception(f"Rendered project {project_path} does not exist")
+        self._call("push_files", self.latency.git_push)
+
+    def delete_repository(self, repo_name: str, missing_ok: bool = False):
+        self._call("delete_repository", self.latency.github_api)
+        with self._lock:
+            self.repositories.discard(repo_name)
+
+
+class FakeArgoCDService:
+    """Records applications in memory instead of calling ArgoCD."""
+
+    def __init__(self, latency: FakeLatency):
+        self.latency = latency
+        self.applications: Dict[str, Dict] = {}
+        self.calls: Dict[str, int] = {}
+
+    async def _call(self, operation: str):
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+        await asyncio.sleep(self.latency.delay(self.latency.argocd))
+        self.latency.maybe_fail(operation)
+
+    async def create_application(
+        self,
+        app_name: str,
+        repo_url: str,
+        path: str = "helm",
+        namespace: Optional[str] = None,
+        auto_sync: bool = True
+    ) -> Dict:
+        await self._call("create_application")
+        self.applications[app_name] = {"metadata": {"name": app_name}, "spec": {"source": {"repoURL": repo_url}}}
+        return self.applications[app_name]
+
+    async def get_application(self, app_name: str) -> Optional[Dict]:
+        await self._call("get_application")
+        return self.applications.get(app_name)
+
+    async def delete_application(self, app_name: str):
+        await self._call("delete_application")
+        self.applications.pop(app_name, None)
+
+    async def sync_application(self, app_name: str):
+        await self._call("sync_application")
+
+
+def install_fakes(latency: FakeLatency) -> tuple[FakeGitHubService, FakeArgoCDService]:
+    """
+    Replace the global GitHub and ArgoCD services' methods with fakes.
+
+    Args:
+        latency: Simulated latency of the fakes.
+
+    Returns:
+        The installed fakes, for inspecting call counts.
+    """
+    from app.services.argocd_service import argocd_service
+    from app.services.github_service import github_service
+
+    github, argocd = FakeGitHubService(latency), FakeArgoCDService(latency)
+    for name in ("repository_exists", "existing_repositories", "create_repository",
+                 "rename_repository", "push_files", "delete_repository"):
+        setattr(github_service, name, getattr(github, name))
+    for name in ("create_application", "get_application", "delete_application", "sync_application"):
+        setattr(argocd_service, name, getattr(argocd, name))
+    return github, argocd
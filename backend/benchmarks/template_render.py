@@ -0,0 +1,228 @@
+"""
+Template render benchmark.
+
+Renders every bundled template (or ``--templates``) with
+``TemplateEngine.render_template`` ``--iterations`` times, first one at a time
+and then ``--concurrency`` at a time on a thread pool like the ``render``
+executor, and reports latency percentiles (in milliseconds), throughput, and
+the files and bytes written per render as JSON.
+
+With the native renderer the serial pass also times the phases of a render
+separately: creating the staging directory, rendering in memory, writing the
+files (one ``mkdir`` per directory and ``open``/``write``/``chmod`` per file) and
+removing the directory again.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.template_render --iterations 200 --concurrency 8
+    python -m benchmarks.template_render --renderer cookiecutter --output results/cookiecutter.json
+    python -m benchmarks.template_render --baseline benchmarks/baselines/template_render.json \\
+        --max-regression 25
+
+``--baseline`` adds the ratio of every latency percentile and of the throughput
+to a previous run's results; with ``--max-regression`` the run exits with
+status 1 if any template's p50 got slower by more than that many percent.
+Every project gets its own name, so the render cache is bypassed unless
+``--render-cache`` is given, which renders a single name to measure cache hits.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.workflow_throughput import BACKEND_DIR, percentiles
+
+TEMPLATES = ("python-microservice", "nodejs-api", "openapi-microservice", "camel-yaml-api")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--templates", nargs="+", default=list(TEMPLATES), help="Templates to render")
+    parser.add_argument("--iterations", type=int, default=100, help="Renders per template and pass")
+    parser.add_argument("--concurrency", type=int, default=4, help="Threads rendering at once in the concurrent pass")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed renders per template first")
+    parser.add_argument("--renderer", choices=("native", "cookiecutter"), default="native")
+    parser.add_argument("--render-cache", action="store_true", help="Enable the render cache and render one name")
+    parser.add_argument("--baseline", help="Results of a previous run to compare against")
+    parser.add_argument("--max-regression", type=float, help="Fail if a p50 regressed by more than this percent")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args: argparse.Namespace, workdir: Path):
+    """Point settings at throwaway resources; must run before any ``app`` import."""
+    os.environ["TEMP_DIR"] = str(workdir / "staging")
+    os.environ["TEMPLATES_DIR"] = str(BACKEND_DIR / "app" / "templates")
+    os.environ["TEMPLATE_RENDERER"] = args.renderer
+    os.environ["RENDER_CACHE_ENABLED"] = "true" if args.render_cache else "false"
+    os.environ["RENDER_CACHE_DIR"] = str(workdir / "render-cache")
+    os.environ["TEMPLATE_HOT_RELOAD"] = "false"
+
+
+def tree_size(path: Path) -> Dict[str, int]:
+    """Directories, files and bytes of a rendered project."""
+    directories = files = size = 0
+    for root, dirnames, filenames in os.walk(path):
+        directories += len(dirnames)
+        for name in filenames:
+            files += 1
+            size += os.lstat(os.path.join(root, name)).st_size
+    return {"directories": directories + 1, "files": files, "bytes": size}
+
+
+def render_once(template: str, name: str) -> float:
+    """Render and clean up one project, returning the render latency in milliseconds."""
+    from app.services.template_engine import template_engine
+
+    start = time.perf_counter()
+    path = template_engine.render_template(template, name, {})
+    elapsed = (time.perf_counter() - start) * 1000
+    template_engine.cleanup_rendered_template(path)
+    return elapsed
+
+
+def measure_phases(template: str, names: List[str]) -> Dict:
+    """Time the phases of native renders (the steps of ``render_template``), in milliseconds."""
+    from app.core.config import settings
+    from app.services.staging import staging_area
+    from app.services.template_engine import template_engine
+    from app.services.template_renderer import template_renderer
+
+    template_path = template_engine.templates_dir / template
+    phases: Dict[str, List[float]] = {"staging": [], "render": [], "write": [], "cleanup": []}
+    for name in names:
+        context = {"project_name": name, "github_org": settings.github_org}
+        start = time.perf_counter()
+        output_dir = staging_area.create(name)
+        staged = time.perf_counter()
+        rendered = template_renderer.render(template_path, context, output_dir)
+        rendered_at = time.perf_counter()
+        rendered.write(output_dir)
+        written = time.perf_counter()
+        staging_area.remove(output_dir)
+        removed = time.perf_counter()
+
+        phases["staging"].append((staged - start) * 1000)
+        phases["render"].append((rendered_at - staged) * 1000)
+        phases["write"].append((written - rendered_at) * 1000)
+        phases["cleanup"].append((removed - written) * 1000)
+    return {phase: percentiles(values) for phase, values in phases.items()}
+
+
+def benchmark_template(args: argparse.Namespace, template: str) -> Dict:
+    from app.services.template_engine import template_engine
+
+    def name(prefix: str, i: int) -> str:
+        return "bench-cached" if args.render_cache else f"bench-{prefix}-{i}"
+
+    for i in range(args.warmup):
+        render_once(template, name("warmup", i))
+
+    path = template_engine.render_template(template, name("size", 0), {})
+    written = tree_size(path)
+    template_engine.cleanup_rendered_template(path)
+
+    serial = [render_once(template, name("serial", i)) for i in range(args.iterations)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        concurrent = list(pool.map(
+            lambda i: render_once(template, name("concurrent", i)), range(args.iterations)
+        ))
+    wall = time.perf_counter() - start
+
+    result = {
+        **written,
+        "serial_ms": percentiles(serial),
+        "serial_renders_per_second": round(len(serial) / sum(serial) * 1000, 1) if sum(serial) else None,
+        "concurrent_ms": percentiles(concurrent),
+        "concurrent_renders_per_second": round(len(concurrent) / wall, 1) if wall else None,
+    }
+    if args.renderer == "native" and not args.render_cache:
+        result["phases_ms"] = measure_phases(
+            template, [name("phases", i) for i in range(args.iterations)]
+        )
+    return result
+
+
+def compare(results: Dict, baseline: Dict) -> Dict:
+    """Ratios of current to baseline latencies (above 1 is slower) and throughput (above 1 is faster)."""
+    comparison = {}
+    for template, current in results["templates"].items():
+        previous = baseline.get("templates", {}).get(template)
+        if not previous:
+            continue
+        entry = {}
+        for section in ("serial_ms", "concurrent_ms"):
+            for key in ("p50", "p95", "p99"):
+                old, new = previous.get(section, {}).get(key), current[section].get(key)
+                if old and new is not None:
+                    entry[f"{section}.{key}"] = round(new / old, 3)
+        for key in ("serial_renders_per_second", "concurrent_renders_per_second"):
+            if previous.get(key) and current.get(key):
+                entry[key] = round(current[key] / previous[key], 3)
+        comparison[template] = entry
+    return comparison
+
+
+def regressions(comparison: Dict, max_regression: float) -> List[str]:
+    """Templates whose p50 latency grew by more than ``max_regression`` percent."""
+    limit = 1 + max_regression / 100
+    return [
+        f"{template} {key} x{ratio}"
+        for template, entry in comparison.items()
+        for key, ratio in entry.items()
+        if key.endswith(".p50") and ratio > limit
+    ]
+
+
+def benchmark(args: argparse.Namespace) -> Dict:
+    templates = {template: benchmark_template(args, template) for template in args.templates}
+    return {
+        "benchmark": "template_render",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": {"platform": platform.platform(), "cpus": os.cpu_count()},
+        "config": {
+            key: value for key, value in vars(args).items()
+            if key not in ("output", "baseline", "max_regression")
+        },
+        "templates": templates,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="idp-bench-") as workdir:
+        configure_environment(args, Path(workdir))
+        sys.path.insert(0, str(BACKEND_DIR))
+        results = benchmark(args)
+
+    failed: List[str] = []
+    if args.baseline:
+        results["comparison"] = compare(results, json.loads(Path(args.baseline).read_text()))
+        if args.max_regression is not None:
+            failed = regressions(results["comparison"], args.max_regression)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+    if failed:
+        print(f"Render latency regressed: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,470 @@
+"""
+Project creation throughput benchmark.
+
+Drives the real project workflows against fake GitHub/ArgoCD services (see
+``benchmarks.fakes``) and reports throughput, per-step latency percentiles,
+peak RSS (of the benchmark process and of its children, such as the ``cpu``
+process pool) and database connection usage as JSON.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.workflow_throughput --projects 200 --concurrency 20
+    python -m benchmarks.workflow_throughput --mode api --kind create_openapi_project \\
+        --git-push-latency 2.0 --output results/openapi.json
+
+Modes:
+
+- ``workflow`` calls the ``create_*_workflow`` functions directly, with at most
+  ``--concurrency`` running at once.
+- ``api`` posts to the create endpoints in-process and runs a ``Worker`` with
+  ``--concurrency`` slots, covering admission, the job queue and the worker.
+
+A throwaway SQLite database, staging directory and render/codegen caches are
+used, so every run renders cold, unless ``--database-url`` is given for the
+database. Use PostgreSQL to measure production-like
+connection usage; SQLite serializes writers.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = BACKEND_DIR / "tests" / "fixtures"
+
+CAMEL_ROUTES = """- route:
+    id: bench-route
+    from:
+      uri: timer:bench
+      steps:
+        - log: "benchmark"
+"""
+
+TEMPLATE_FOR_KIND = {
+    "create_openapi_project": "openapi-microservice",
+    "create_camel_yaml_project": "camel-yaml-api",
+}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", choices=("workflow", "api"), default="workflow")
+    parser.add_argument("--kind", default="create_project",
+                        choices=("create_project", "create_openapi_project", "create_camel_yaml_project"))
+    parser.add_argument("--template", default="python-microservice", help="Template for create_project")
+    parser.add_argument("--projects", type=int, default=50, help="Number of projects to create")
+    parser.add_argument("--concurrency", type=int, default=10, help="Workflows running at once")
+    parser.add_argument("--github-latency", type=float, default=0.2, help="Seconds per GitHub API call")
+    parser.add_argument("--git-push-latency", type=float, default=1.0, help="Seconds per git push")
+    parser.add_argument("--argocd-latency", type=float, default=0.3, help="Seconds per ArgoCD call")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Relative latency jitter")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of fake calls that fail")
+    parser.add_argument("--database-url", help="Database to use instead of a throwaway SQLite file")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args: argparse.Namespace, workdir: Path):
+    """Point settings at throwaway resources; must run before any ``app`` import."""
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir / 'benchmark.db'}"
+    os.environ["TEMP_DIR"] = str(workdir / "staging")
+    os.environ["TEMPLATES_DIR"] = str(BACKEND_DIR / "app" / "templates")
+    # Per-run caches: entries left by an earlier run would turn renders and codegen into hits
+    os.environ["RENDER_CACHE_DIR"] = str(workdir / "render-cache")
+    os.environ["CODEGEN_CACHE_DIR"] = str(workdir / "codegen-cache")
+    os.environ["EMBEDDED_WORKER_ENABLED"] = "false"
+    os.environ["WORKER_CONCURRENCY"] = str(args.concurrency)
+    os.environ["WORKER_POLL_INTERVAL_SECONDS"] = "0.05"
+    os.environ["WORKFLOW_MAX_RUNNING"] = str(args.concurrency)
+    os.environ["WORKFLOW_MAX_RUNNING_PER_USER"] = str(args.concurrency)
+    os.environ["ADMISSION_MAX_QUEUED_JOBS"] = str(max(args.projects, 1000))
+    os.environ["ADMISSION_MAX_QUEUED_PER_USER"] = str(max(args.projects, 1000))
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """Nearest-rank p50/p95/p99, mean and max of a list of durations."""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 4),
+        "p50": round(rank(50), 4),
+        "p95": round(rank(95), 4),
+        "p99": round(rank(99), 4),
+        "max": round(ordered[-1], 4),
+    }
+
+
+class PoolMonitor:
+    """Tracks checked-out connections of the SQLAlchemy engine."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.engine = engine
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.checkouts = 0
+        self.connects = 0
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "connect", self._on_connect)
+
+    def _on_checkout(self, *_):
+        self.checkouts += 1
+        self.checked_out += 1
+        self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def _on_checkin(self, *_):
+        self.checked_out -= 1
+
+    def _on_connect(self, *_):
+        self.connects += 1
+
+    def report(self) -> Dict:
+        pool = self.engine.pool
+        return {
+            "dialect": self.engine.dialect.name,
+            "pool_class": type(pool).__name__,
+            "pool_size": pool.size() if hasattr(pool, "size") else None,
+            "peak_checked_out": self.peak_checked_out,
+            "checkouts": self.checkouts,
+            "connections_opened": self.connects,
+        }
+
+
+def _rss_kb(pid: int) -> int:
+    """Current resident memory of a process in KiB, 0 if it is gone."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def _descendants(pid: int) -> List[int]:
+    """Ids of all processes below ``pid`` (process pool workers, the forkserver, git)."""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat:
+                # The command name may contain spaces; fields after it are fixed
+                ppid = int(stat.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    found, pending = [], [pid]
+    while pending:
+        for child in children.get(pending.pop(), []):
+            found.append(child)
+            pending.append(child)
+    return found
+
+
+class MemoryMonitor:
+    """
+    Samples the resident memory of the benchmark process and its children.
+
+    ``getrusage`` cannot cover the ``cpu`` pool: ``RUSAGE_SELF`` excludes child
+    processes, and ``RUSAGE_CHILDREN`` only counts children that have exited
+    and been waited for, while pool workers are children of the still running
+    forkserver. Needs ``/proc`` (Linux); elsewhere only the process's own peak
+    is reported.
+    """
+
+    def __init__(self, interval: float = 0.2):
+        self.interval = interval
+        self.peak_children_kb = 0
+        self.peak_total_kb = 0
+        self.available = os.path.isdir("/proc")
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="memory-monitor", daemon=True)
+
+    def start(self):
+        if self.available:
+            self._thread.start()
+
+    def stop(self):
+        """Take a last sample and stop sampling."""
+        if self.available:
+            self._stop.set()
+            self._thread.join()
+
+    def _sample(self):
+        own = _rss_kb(os.getpid())
+        children = sum(_rss_kb(child) for child in _descendants(os.getpid()))
+        self.peak_children_kb = max(self.peak_children_kb, children)
+        self.peak_total_kb = max(self.peak_total_kb, own + children)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+        self._sample()
+
+    def report(self) -> Dict:
+        own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        exited = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        return {
+            "peak_rss_mb": round(own / 1024, 1),
+            "peak_children_rss_mb": round(max(self.peak_children_kb, exited) / 1024, 1),
+            "peak_total_rss_mb": round(max(self.peak_total_kb, own) / 1024, 1) if self.available else None,
+        }
+
+
+def _payload(args: argparse.Namespace, name: str) -> Dict:
+    if args.kind == "create_openapi_project":
+        return {
+            "project_name": name,
+            "description": "benchmark",
+            "spec_content": (FIXTURES_DIR / "petstore.yaml").read_text(),
+            "file_format": "yaml",
+            "port": "8000",
+        }
+    if args.kind == "create_camel_yaml_project":
+        return {"project_name": name, "description": "benchmark", "routes_content": CAMEL_ROUTES, "port": "8080"}
+    return {"project_name": name, "template_type": args.template, "description": "benchmark", "variables": {}}
+
+
+async def run_workflows(args: argparse.Namespace, user, names: List[str]) -> Dict:
+    """Create projects by calling the workflow functions directly."""
+    from app.core.database import SessionLocal
+    from app.models.project import Project
+    from app.services.project_workflows import WORKFLOWS
+
+    db = SessionLocal()
+    try:
+        projects = [
+            Project(
+                name=name,
+                description="benchmark",
+                template_type=TEMPLATE_FOR_KIND.get(args.kind, args.template),
+                status="pending",
+                user_id=user.id,
+            )
+            for name in names
+        ]
+        db.add_all(projects)
+        db.commit()
+        project_ids = [project.id for project in projects]
+    finally:
+        db.close()
+
+    workflow = WORKFLOWS[args.kind]
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def create(project_id: str, name: str):
+        async with semaphore:
+            await workflow(project_id=project_id, **_payload(args, name))
+
+    await asyncio.gather(*(create(project_id, name) for project_id, name in zip(project_ids, names)))
+    return {}
+
+
+async def run_api(args: argparse.Namespace, user, names: List[str]) -> Dict:
+    """Create projects through the HTTP endpoints and an in-process worker."""
+    import httpx
+
+    from app.core.database import SessionLocal
+    from app.core.security import create_access_token
+    from app.main import app
+    from app.models.project import Project
+    from app.worker import Worker
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.id})}"}
+    request_latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+
+    async def post(client: httpx.AsyncClient, name: str):
+        payload = _payload(args, name)
+        start = time.perf_counter()
+        if args.kind == "create_openapi_project":
+            response = await client.post(
+                "/api/v1/projects/from-openapi",
+                files={"openapi_file": ("spec.yaml", payload["spec_content"].encode())},
+                data={"name": name, "description": payload["description"], "port": payload["port"]},
+                headers=headers,
+            )
+        elif args.kind == "create_camel_yaml_project":
+            response = await client.post(
+                "/api/v1/projects/from-camel-yaml",
+                files={"camel_yaml_file": ("routes.yaml", payload["routes_content"].encode())},
+                data={"name": name, "description": payload["description"], "port": payload["port"]},
+                headers=headers,
+            )
+        else:
+            response = await client.post(
+                "/api/v1/projects",
+                json={"name": name, "template_type": args.template, "description": payload["description"]},
+                headers=headers,
+            )
+        request_latencies.append(time.perf_counter() - start)
+        statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+    worker = Worker(concurrency=args.concurrency, worker_id="benchmark")
+    worker_task = asyncio.create_task(worker.run())
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def limited(name: str):
+                async with semaphore:
+                    await post(client, name)
+
+            await asyncio.gather(*(limited(name) for name in names))
+
+        def unfinished() -> int:
+            db = SessionLocal()
+            try:
+                return db.query(Project).filter(
+                    Project.name.in_(names),
+                    Project.status.notin_(("active", "failed")),
+                ).count()
+            finally:
+                db.close()
+
+        while await asyncio.to_thread(unfinished):
+            await asyncio.sleep(0.1)
+    finally:
+        worker.stop()
+        await worker_task
+
+    return {"create_request_seconds": percentiles(request_latencies), "create_responses": statuses}
+
+
+def collect_results(names: List[str]) -> Dict:
+    """Per-step and end-to-end durations of the benchmark's projects."""
+    from app.core.database import SessionLocal
+    from app.models.project import Project
+    from app.models.workflow_step import ProjectWorkflowStep
+
+    db = SessionLocal()
+    try:
+        projects = db.query(Project).filter(Project.name.in_(names)).all()
+        steps = db.query(ProjectWorkflowStep).filter(
+            ProjectWorkflowStep.project_id.in_([project.id for project in projects])
+        ).all()
+    finally:
+        db.close()
+
+    by_step: Dict[str, List[float]] = {}
+    finished_at: Dict[str, datetime] = {}
+    for row in steps:
+        if row.started_at and row.completed_at and row.status == "completed":
+            by_step.setdefault(row.step, []).append((row.completed_at - row.started_at).total_seconds())
+        if row.completed_at:
+            finished_at[row.project_id] = max(finished_at.get(row.project_id, row.completed_at), row.completed_at)
+
+    statuses: Dict[str, int] = {}
+    for project in projects:
+        statuses[project.status] = statuses.get(project.status, 0) + 1
+
+    end_to_end = [
+        (finished_at[project.id] - project.created_at).total_seconds()
+        for project in projects if project.status == "active" and project.id in finished_at
+    ]
+    return {
+        "project_statuses": statuses,
+        "end_to_end_seconds": percentiles(end_to_end),
+        "steps": {step: percentiles(values) for step, values in sorted(by_step.items())},
+    }
+
+
+async def benchmark(args: argparse.Namespace) -> Dict:
+    from app.core.database import SessionLocal, engine, init_db
+    from app.core.executors import shutdown_executors
+    from app.models.user import User
+    from benchmarks.fakes import FakeLatency, install_fakes
+
+    if args.mode == "api":
+        import app.main  # noqa: F401  (configures logging on import)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    init_db()
+    pool = PoolMonitor(engine)
+    github, argocd = install_fakes(FakeLatency(
+        github_api=args.github_latency,
+        git_push=args.git_push_latency,
+        argocd=args.argocd_latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+    ))
+
+    run_id = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    db = SessionLocal()
+    try:
+        user = User(email=f"bench-{run_id}@example.com", username=f"bench-{run_id}", hashed_password="!")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        db.expunge(user)
+    finally:
+        db.close()
+    names = [f"bench-{run_id}-{i}" for i in range(args.projects)]
+
+    memory = MemoryMonitor()
+    memory.start()
+    start = time.perf_counter()
+    runner = run_api if args.mode == "api" else run_workflows
+    extra = await runner(args, user, names)
+    wall = time.perf_counter() - start
+    memory.stop()
+    shutdown_executors(wait=True)
+
+    results = collect_results(names)
+    succeeded = results["project_statuses"].get("active", 0)
+    return {
+        "benchmark": "workflow_throughput",
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            key: value for key, value in vars(args).items() if key not in ("output", "database_url")
+        },
+        "wall_seconds": round(wall, 3),
+        "projects_per_minute": round(succeeded / wall * 60, 2) if wall else None,
+        **results,
+        **extra,
+        **memory.report(),
+        "db": pool.report(),
+        "fake_calls": {"github": github.calls, "argocd": argocd.calls},
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="idp-bench-") as workdir:
+        configure_environment(args, Path(workdir))
+        sys.path.insert(0, str(BACKEND_DIR))
+        results = asyncio.run(benchmark(args))
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,19 @@ export default function ProjectList({ refreshTrigger }: ProjectListProps) {
     loadProjects();
   }, [refreshTrigger]);
 
+  useEffect(() => {
+    // Follow status changes pushed by the server; deleted projects leave the list
+    return projectsApi.subscribeToEvents(({ project_id, status, error_message }) => {
+      if (status === 'deleted') {
+        setProjects((current) => current.filter(p => p.id !== project_id));
+        return;
+      }
+      setProjects((current) =>
+        current.map(p => (p.id === project_id ? { ...p, status, error_message } : p))
+      );
+    });
+  }, []);
+
   const loadProjects = async () => {
     try {
       setLoading(true);
@@ -38,10 +51,10 @@ export default function ProjectList({ refreshTrigger }: ProjectListProps) {
 
     try {
       setDeletingId(project.id);
-      await projectsApi.deleteProject(project.id);
+      const deleting = await projectsApi.deleteProject(project.id);
 
-      // Remove from local state
-      setProjects(projects.filter(p => p.id !== project.id));
+      // Deletion runs in the background; the event stream removes the row once it is done
+      setProjects((current) => current.map(p => (p.id === deleting.id ? deleting : p)));
       setError(null);
     } catch (err: any) {
       setError('Failed to delete project: ' + (err.response?.data?.detail || err.message));
@@ -50,6 +63,9 @@ export default function ProjectList({ refreshTrigger }: ProjectListProps) {
     }
   };
 
+  const isDeleting = (project: Project) =>
+    deletingId === project.id || project.status === 'deleting';
+
   const getStatusBadge = (status: string) => {
     const colors: Record<string, string> = {
       pending: 'bg-status-pending text-govuk-text',
@@ -58,6 +74,8 @@ export default function ProjectList({ refreshTrigger }: ProjectListProps) {
       deploying: 'bg-status-deploying text-white',
       active: 'bg-status-active text-white',
       failed: 'bg-status-failed text-white',
+      cancelled: 'bg-status-cancelled text-white',
+      deleting: 'bg-status-deleting text-white',
     };
 
     return (
@@ -145,16 +163,16 @@ export default function ProjectList({ refreshTrigger }: ProjectListProps) {
                 {getStatusBadge(project.status)}
                 <button
                   onClick={() => handleDelete(project)}
-                  disabled={deletingId === project.id}
+                  disabled={isDeleting(project)}
                   className={`px-2 py-1 rounded-none text-xs font-bold transition-colors ${
-                    deletingId === project.id
+                    isDeleting(project)
                       ? 'bg-govuk-border text-govuk-secondary-text cursor-not-allowed'
                       : 'bg-govuk-error text-white hover:bg-[#942514]'
                   }`}
                   title="Delete project"
                   aria-label={`Delete ${project.name}`}
                 >
-                  {deletingId === project.id ? 'DELETING...' : 'DELETE'}
+                  {isDeleting(project) ? 'DELETING...' : 'DELETE'}
                 </button>
               </div>
             </div>
@@ -1,10 +1,13 @@
 import React, { useEffect, useState } from 'react'
 import { useNavigate } from 'react-router-dom'
-import { analyticsApi } from '../services/api'
+import { analyticsApi, projectsApi } from '../services/api'
 import { DashboardStats } from '../types/analytics'
 import StatsCard from '../components/StatsCard'
 import { Project } from '../types/project'
 
+// Events arriving within this window trigger a single reload
+const EVENT_RELOAD_DELAY_MS = 500
+
 export default function Dashboard() {
   const navigate = useNavigate()
   const [stats, setStats] = useState<DashboardStats | null>(null)
@@ -13,11 +16,24 @@ export default function Dashboard() {
 
   useEffect(() => {
     fetchDashboard()
+    // Refresh the counts and recent projects (once per burst of events)
+    // whenever one of the user's projects changes status
+    let reload: ReturnType<typeof setTimeout> | undefined
+    const unsubscribe = projectsApi.subscribeToEvents(() => {
+      clearTimeout(reload)
+      reload = setTimeout(() => fetchDashboard(false), EVENT_RELOAD_DELAY_MS)
+    })
+    return () => {
+      clearTimeout(reload)
+      unsubscribe()
+    }
   }, [])
 
-  const fetchDashboard = async () => {
+  const fetchDashboard = async (showLoading: boolean = true) => {
     try {
-      setLoading(true)
+      if (showLoading) {
+        setLoading(true)
+      }
       const data = await analyticsApi.getDashboard()
       setStats(data)
     } catch (err: any) {
@@ -3,6 +3,9 @@ import { useParams, useNavigate } from 'react-router-dom'
 import { projectsApi } from '../services/api'
 import { Project } from '../types/project'
 
+// Events arriving within this window trigger a single reload
+const EVENT_RELOAD_DELAY_MS = 500
+
 export default function ProjectDetail() {
   const { id } = useParams<{ id: string }>()
   const navigate = useNavigate()
@@ -11,14 +14,33 @@ export default function ProjectDetail() {
   const [error, setError] = useState<string | null>(null)
 
   useEffect(() => {
-    if (id) {
-      fetchProject(id)
+    if (!id) {
+      return
+    }
+    fetchProject(id)
+    // Status transitions are pushed by the server; reload the project (once per
+    // burst of events) to pick up the fields that change with them
+    let reload: ReturnType<typeof setTimeout> | undefined
+    const unsubscribe = projectsApi.subscribeToProjectEvents(id, (event) => {
+      if (event.status === 'deleted') {
+        navigate('/dashboard')
+        return
+      }
+      setProject((current) => current && { ...current, status: event.status, error_message: event.error_message })
+      clearTimeout(reload)
+      reload = setTimeout(() => fetchProject(id, false), EVENT_RELOAD_DELAY_MS)
+    })
+    return () => {
+      clearTimeout(reload)
+      unsubscribe()
     }
   }, [id])
 
-  const fetchProject = async (projectId: string) => {
+  const fetchProject = async (projectId: string, showLoading: boolean = true) => {
     try {
-      setLoading(true)
+      if (showLoading) {
+        setLoading(true)
+      }
       const data = await projectsApi.getProject(projectId)
       setProject(data)
     } catch (err: any) {
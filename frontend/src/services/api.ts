@@ -1,9 +1,13 @@
 import axios from 'axios';
-import { Project, CreateProjectRequest, Template, ProjectListResponse } from '../types/project';
+import { Project, CreateProjectRequest, Template, ProjectListResponse, ProjectStatusEvent } from '../types/project';
 import { DashboardStats, PlatformOverview, ProjectsOverTime, TemplateUsage } from '../types/analytics';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || '';
 
+// Creations started from the UI run in the interactive priority lane, ahead of
+// batch and automated requests
+const INTERACTIVE = { 'X-IDP-Priority': 'interactive' };
+
 const api = axios.create({
   baseURL: API_BASE_URL,
   headers: {
@@ -41,7 +45,9 @@ api.interceptors.response.use(
 
 export const projectsApi = {
   async createProject(data: CreateProjectRequest): Promise<Project> {
-    const response = await api.post<Project>('/api/v1/projects', data);
+    const response = await api.post<Project>('/api/v1/projects', data, {
+      headers: INTERACTIVE,
+    });
     return response.data;
   },
 
@@ -59,6 +65,7 @@ export const projectsApi = {
 
     const response = await api.post<Project>('/api/v1/projects/from-openapi', formData, {
       headers: {
+        ...INTERACTIVE,
         'Content-Type': 'multipart/form-data',
       },
     });
@@ -79,6 +86,7 @@ export const projectsApi = {
 
     const response = await api.post<Project>('/api/v1/projects/from-camel-yaml', formData, {
       headers: {
+        ...INTERACTIVE,
         'Content-Type': 'multipart/form-data',
       },
     });
@@ -103,11 +111,101 @@ export const projectsApi = {
     return response.data;
   },
 
-  async deleteProject(id: string): Promise<void> {
-    await api.delete(`/api/v1/projects/${id}`);
+  async deleteProject(id: string): Promise<Project> {
+    // Deletion runs in the background; the project is returned in 'deleting' status
+    const response = await api.delete<Project>(`/api/v1/projects/${id}`, {
+      headers: INTERACTIVE,
+    });
+    return response.data;
+  },
+
+  // Status transitions of all of the user's projects; returns a function that closes the stream
+  subscribeToEvents(onEvent: (event: ProjectStatusEvent) => void): () => void {
+    return streamEvents('/api/v1/projects/events', onEvent);
+  },
+
+  // Status transitions of one project, starting with its past ones
+  subscribeToProjectEvents(id: string, onEvent: (event: ProjectStatusEvent) => void): () => void {
+    return streamEvents(`/api/v1/projects/${id}/events`, onEvent);
   },
 };
 
+// Delay before reconnecting a dropped event stream
+const STREAM_RETRY_MS = 3000;
+
+/*
+ * Reads a Server-Sent Events stream with fetch rather than EventSource, which
+ * cannot send the Authorization header. Dropped connections are reopened with
+ * Last-Event-ID, so no transition is missed.
+ */
+function streamEvents(path: string, onEvent: (event: ProjectStatusEvent) => void): () => void {
+  const controller = new AbortController();
+  let lastEventId: string | null = null;
+
+  const dispatch = (frame: string) => {
+    let id: string | null = null;
+    const data: string[] = [];
+    for (const line of frame.split('\n')) {
+      if (line.startsWith('id:')) {
+        id = line.slice(3).trim();
+      } else if (line.startsWith('data:')) {
+        data.push(line.slice(5).trimStart());
+      }
+    }
+    if (id !== null) {
+      lastEventId = id;
+    }
+    if (data.length > 0) {
+      onEvent(JSON.parse(data.join('\n')) as ProjectStatusEvent);
+    }
+  };
+
+  const connect = async () => {
+    while (!controller.signal.aborted) {
+      try {
+        const headers: Record<string, string> = { Accept: 'text/event-stream' };
+        const token = localStorage.getItem('access_token');
+        if (token) {
+          headers.Authorization = `Bearer ${token}`;
+        }
+        if (lastEventId !== null) {
+          headers['Last-Event-ID'] = lastEventId;
+        }
+
+        const response = await fetch(`${API_BASE_URL}${path}`, { headers, signal: controller.signal });
+        if (response.status === 401 || response.status === 403 || response.status === 404) {
+          return;
+        }
+        if (response.ok && response.body) {
+          const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+          let buffer = '';
+          for (;;) {
+            const { value, done } = await reader.read();
+            if (done) {
+              break;
+            }
+            buffer += value.replace(/\r\n?/g, '\n');
+            let end: number;
+            while ((end = buffer.indexOf('\n\n')) !== -1) {
+              dispatch(buffer.slice(0, end));
+              buffer = buffer.slice(end + 2);
+            }
+          }
+        }
+      } catch {
+        // Network error or closed by the caller; reconnect unless closed
+        if (controller.signal.aborted) {
+          return;
+        }
+      }
+      await new Promise((resolve) => setTimeout(resolve, STREAM_RETRY_MS));
+    }
+  };
+
+  connect();
+  return () => controller.abort();
+}
+
 export const templatesApi = {
   async listTemplates(): Promise<Template[]> {
     const response = await api.get<Template[]>('/api/v1/templates');
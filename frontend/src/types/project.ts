@@ -6,12 +6,22 @@ export interface Project {
   github_repo_url: string | null;
   github_repo_name: string | null;
   argocd_app_name: string | null;
-  status: 'pending' | 'creating_repo' | 'building' | 'deploying' | 'active' | 'failed';
+  status: 'pending' | 'creating_repo' | 'building' | 'deploying' | 'active' | 'failed' | 'cancelled' | 'deleting';
   error_message: string | null;
   created_at: string;
   updated_at: string;
 }
 
+// Status transition delivered by the project event streams (Server-Sent Events);
+// 'deleted' is the last event of a project, sent once its records are gone
+export interface ProjectStatusEvent {
+  id: number;
+  project_id: string;
+  status: Project['status'] | 'deleted';
+  error_message: string | null;
+  created_at: string;
+}
+
 export interface CreateProjectRequest {
   name: string;
   description?: string;
@@ -34,6 +34,8 @@ export default {
           'deploying': '#4c2c92',      // Purple
           'active': '#00703c',         // Green
           'failed': '#d4351c',         // Red
+          'cancelled': '#505a5f',      // Dark grey
+          'deleting': '#f47738',       // Orange
         }
       },
       fontFamily: {